@@ -27,7 +27,7 @@ if sys.version_info < (3,):
     print("OctaDist supports only for Python 3.\n")
     print("Please upgrade your Python to version 3.")
 
-module = ["numpy", "scipy", "matplotlib", "rmsd", "pymatgen", "plotly"]
+module = ["numpy", "scipy", "matplotlib", "rmsd", "plotly"]
 
 missing = False
 
@@ -0,0 +1,474 @@
+#!/usr/bin/env python
+
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+"""
+Performance benchmarks for OctaDist.
+
+Times the distortion parameters, neighbour search, face finding and file parsers
+on synthetic structures and files, and stores the timings as JSON so that two runs
+(e.g. two versions) can be compared.
+
+Usage::
+
+    python benchmark.py -o bench-3.1.0.json
+    python benchmark.py --quick -o new.json --compare bench-3.1.0.json
+    python benchmark.py --file-size 1e3 1e6 1e8 1e9
+
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+import octadist as oc
+
+# Regular octahedron used as the template of every synthetic complex
+OCTAHEDRON = np.array(
+    [
+        [0.0, 0.0, 0.0],
+        [2.0, 0.0, 0.0],
+        [-2.0, 0.0, 0.0],
+        [0.0, 2.0, 0.0],
+        [0.0, -2.0, 0.0],
+        [0.0, 0.0, 2.0],
+        [0.0, 0.0, -2.0],
+    ]
+)
+LABELS = ["Fe", "N", "N", "N", "N", "N", "N"]
+NUMBERS = {"Fe": 26, "N": 7}
+
+
+def make_octahedra(n, seed=0):
+    """
+    Make a stack of randomly distorted octahedra.
+
+    Parameters
+    ----------
+    n : int
+        Number of octahedra.
+    seed : int, optional
+        Seed of random number generator.
+
+    Returns
+    -------
+    coord : ndarray
+        Coordinates of shape (n, 7, 3).
+
+    """
+    rng = np.random.default_rng(seed)
+    return OCTAHEDRON + rng.normal(scale=0.15, size=(n, 7, 3))
+
+
+def make_structure(n_atom, seed=0):
+    """
+    Make a structure of isolated FeN6 complexes on a cubic grid.
+
+    Parameters
+    ----------
+    n_atom : int
+        Approximate number of atoms. Rounded down to a multiple of 7.
+    seed : int, optional
+        Seed of random number generator.
+
+    Returns
+    -------
+    atom : list
+        Atomic labels.
+    coord : ndarray
+        Atomic coordinates.
+
+    """
+    n = max(n_atom // 7, 1)
+    side = int(np.ceil(n ** (1 / 3)))
+    grid = np.stack(np.unravel_index(np.arange(n), (side,) * 3), axis=1) * 6.0
+    coord = make_octahedra(n, seed) + grid[:, None, :]
+    return LABELS * n, coord.reshape(-1, 3)
+
+
+def _xyz_frame(atom, coord, comment="OctaDist benchmark"):
+    lines = [f"{len(atom)}\n", f"{comment}\n"]
+    lines += [f"{a} {x:.6f} {y:.6f} {z:.6f}\n" for a, (x, y, z) in zip(atom, coord)]
+    return "".join(lines)
+
+
+def _gaussian_frame(atom, coord):
+    lines = [" Standard orientation:\n", " " + "-" * 69 + "\n"]
+    lines += [" Center     Atomic      Atomic             Coordinates (Angstroms)\n"]
+    lines += [" Number     Number       Type             X           Y           Z\n"]
+    lines += [" " + "-" * 69 + "\n"]
+    for i, (a, (x, y, z)) in enumerate(zip(atom, coord)):
+        lines.append(
+            f" {i + 1:6d} {NUMBERS[a]:10d} {0:11d} {x:15.6f} {y:11.6f} {z:11.6f}\n"
+        )
+    lines += [" " + "-" * 69 + "\n", " SCF Done:  E(RB3LYP) =  -1000.0\n"]
+    return "".join(lines)
+
+
+def _nwchem_frame(atom, coord, converged=False):
+    lines = ["\n"]
+    if converged:
+        lines += ["      ----------------------\n", "      Optimization converged\n"]
+        lines += ["      ----------------------\n"] + ["\n"] * 12
+    lines += [
+        " Output coordinates in angstroms (scale by  1.889725989 to convert to a.u.)\n"
+    ]
+    lines += [
+        "\n",
+        "  No.       Tag          Charge          X              Y              Z\n",
+    ]
+    lines += [
+        " ---- ---------------- ---------- -------------- -------------- --------------\n"
+    ]
+    for i, (a, (x, y, z)) in enumerate(zip(atom, coord)):
+        lines.append(
+            f" {i + 1:4d} {a:16s} {NUMBERS[a]:10.4f} {x:14.8f} {y:14.8f} {z:14.8f}\n"
+        )
+    return "".join(lines + ["\n"])
+
+
+def _orca_frame(atom, coord):
+    lines = ["---------------------------------\n"]
+    lines += [
+        "CARTESIAN COORDINATES (ANGSTROEM)\n",
+        "---------------------------------\n",
+    ]
+    lines += [
+        f"  {a:2s} {x:14.6f} {y:14.6f} {z:14.6f}\n" for a, (x, y, z) in zip(atom, coord)
+    ]
+    lines += ["\n", "----------------------------\n", "CARTESIAN COORDINATES (A.U.)\n"]
+    return "".join(lines)
+
+
+def _qchem_frame(atom, coord, converged=False):
+    if converged:
+        lines = [" ******************************\n"]
+        lines += [
+            " **  OPTIMIZATION CONVERGED  **\n",
+            " ******************************\n",
+        ]
+        lines += ["\n", "                           Coordinates (Angstroms)\n"]
+        lines += ["     ATOM                X               Y               Z\n"]
+    else:
+        lines = ["             Standard Nuclear Orientation (Angstroms)\n"]
+        lines += ["    I     Atom           X                Y                Z\n"]
+        lines += [" " + "-" * 64 + "\n"]
+    for i, (a, (x, y, z)) in enumerate(zip(atom, coord)):
+        lines.append(f"  {i + 1:5d}  {a:2s} {x:15.10f} {y:15.10f} {z:15.10f}\n")
+    if converged:
+        lines += ["\n", "Z-matrix Print:\n"]
+    else:
+        lines += [" " + "-" * 64 + "\n"]
+    return "".join(lines)
+
+
+# Header, optimization step and trailer of each synthetic output file
+FORMATS = {
+    "xyz": (".xyz", "", _xyz_frame, None),
+    "gaussian": (
+        ".log",
+        " Entering Gaussian System, Link 0=g16\n",
+        _gaussian_frame,
+        None,
+    ),
+    "nwchem": (
+        ".out",
+        "          Northwest Computational Chemistry Package (NWChem) 7.0.2\n"
+        "          No. of atoms     :     %d\n",
+        _nwchem_frame,
+        lambda atom, coord: _nwchem_frame(atom, coord, converged=True),
+    ),
+    "orca": (".out", "                  * O   R   C   A *\n", _orca_frame, None),
+    "qchem": (
+        ".out",
+        "                  Welcome to Q-Chem\n",
+        _qchem_frame,
+        lambda atom, coord: _qchem_frame(atom, coord, converged=True),
+    ),
+}
+
+PARSERS = {
+    "xyz": oc.get_coord_xyz,
+    "gaussian": oc.get_coord_gaussian,
+    "nwchem": oc.get_coord_nwchem,
+    "orca": oc.get_coord_orca,
+    "qchem": oc.get_coord_qchem,
+}
+
+
+def write_output(path, fmt, size, n_atom=70):
+    """
+    Write a synthetic output file that repeats optimization steps up to a size.
+
+    Parameters
+    ----------
+    path : str
+        Output filename.
+    fmt : str
+        One of the keys of ``FORMATS``.
+    size : int
+        Target file size in bytes. At least one step is always written.
+    n_atom : int, optional
+        Number of atoms in each step.
+
+    """
+    ext, header, frame, final = FORMATS[fmt]
+    atom, coord = make_structure(n_atom)
+    step = frame(atom, coord)
+    if "%d" in header:
+        header = header % len(atom)
+    tail = final(atom, coord) if final else ""
+    if fmt == "xyz":
+        # get_coord_xyz reads the first frame, the rest is trajectory
+        header, tail = step, ""
+    n_step = max((int(size) - len(header) - len(tail)) // len(step), 1)
+
+    with open(path, "w") as f:
+        f.write(header)
+        # Write in chunks to keep memory flat for GB-sized files
+        chunk = max(n_step // 100, 1)
+        for i in range(0, n_step, chunk):
+            f.write(step * min(chunk, n_step - i))
+        f.write(tail)
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """
+    Time a function with timeit.
+
+    Parameters
+    ----------
+    func : callable
+        Function without arguments.
+    repeat : int, optional
+        Number of timing repeats.
+    min_time : float, optional
+        Minimum duration of one repeat in seconds, used to choose the loop count.
+
+    Returns
+    -------
+    timing : dict
+        Best, median, mean and standard deviation of time per call in seconds.
+
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def bench_distortion(sizes):
+    coord = make_octahedra(1)[0]
+
+    def single():
+        dist = oc.CalcDistortion(coord)
+        return dist.zeta, dist.delta, dist.sigma, dist.theta, dist.oct_vol
+
+    yield "CalcDistortion", {"n_octa": 1}, single
+
+    for n in sizes:
+        stack = make_octahedra(n)
+
+        def loop(stack=stack):
+            for c in stack:
+                dist = oc.CalcDistortion(c)
+                dist.zeta, dist.delta, dist.sigma, dist.theta, dist.oct_vol
+
+        def batch(stack=stack):
+            dist = oc.CalcDistortionBatch(stack)
+            return dist.zeta, dist.delta, dist.sigma, dist.theta, dist.oct_vol
+
+        if n <= 1000:
+            yield "CalcDistortion.loop", {"n_octa": n}, loop
+        yield "CalcDistortionBatch", {"n_octa": n}, batch
+
+
+def bench_neighbours(sizes):
+    for n in sizes:
+        atom, coord = make_structure(n)
+        yield "find_bonds", {
+            "n_atom": len(atom)
+        }, lambda a=atom, c=coord: oc.find_bonds(a, c)
+        yield "extract_octa", {
+            "n_atom": len(atom)
+        }, lambda a=atom, c=coord: oc.extract_octa(a, c)
+        yield "extract_all_octa", {
+            "n_atom": len(atom)
+        }, lambda a=atom, c=coord: oc.extract_all_octa(a, c)
+
+
+def bench_faces(sizes):
+    coord = make_octahedra(1)[0]
+    yield "find_faces_octa", {"n_octa": 1}, lambda: oc.find_faces_octa(coord)
+
+    for n in sizes:
+        stack = make_octahedra(n)
+        yield "find_faces_octa_batch", {"n_octa": n}, lambda s=stack: (
+            oc.find_faces_octa_batch(s)
+        )
+
+
+def bench_parsers(file_sizes, workdir):
+    for fmt, parser in PARSERS.items():
+        for size in file_sizes:
+            path = os.path.join(workdir, f"{fmt}-{int(size)}{FORMATS[fmt][0]}")
+            write_output(path, fmt, size)
+            actual = os.path.getsize(path)
+            yield f"get_coord_{fmt}", {"bytes": actual}, lambda p=path, f=parser: f(p)
+            os.remove(path)
+
+
+def run(args):
+    benches = []
+    benches += bench_distortion(args.n_octa)
+    benches += bench_neighbours(args.n_atom)
+    benches += bench_faces(args.n_octa)
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        parsers = bench_parsers(args.file_size, workdir)
+        for name, params, func in itertools.chain(benches, parsers):
+            timing = measure(func, repeat=args.repeat, min_time=args.min_time)
+            results.append({"name": name, "params": params, **timing})
+            label = ", ".join(f"{k}={v}" for k, v in params.items())
+            print(f"{name:24s} {label:24s} {timing['median'] * 1e3:12.4f} ms")
+
+    return {
+        "octadist": oc.__version__,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare two benchmark runs and report the slowdowns.
+
+    Parameters
+    ----------
+    current : dict
+        Results of this run.
+    baseline : dict
+        Results loaded from a previous JSON file.
+    threshold : float
+        Relative slowdown of median time reported as regression.
+
+    Returns
+    -------
+    regressed : list
+        Names and parameters of benchmarks slower than the threshold.
+
+    """
+    base = {_key(r): r for r in baseline["results"]}
+    regressed = []
+    print(f"\nComparison with OctaDist {baseline.get('octadist', '?')}")
+    for r in current["results"]:
+        old = base.get(_key(r))
+        if old is None:
+            continue
+        ratio = r["median"] / old["median"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- regression"
+            regressed.append(_key(r))
+        print(f"{r['name']:24s} {_key(r)[1]:30s} {ratio:8.2f}x{flag}")
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run OctaDist performance benchmarks")
+    parser.add_argument("-o", "--output", help="write results to JSON file")
+    parser.add_argument("--compare", metavar="JSON", help="compare with a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown treated as regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="use small sizes for a fast smoke run"
+    )
+    parser.add_argument(
+        "--n-octa", type=int, nargs="+", help="batch sizes of octahedra"
+    )
+    parser.add_argument(
+        "--n-atom", type=int, nargs="+", help="atom counts of structures"
+    )
+    parser.add_argument(
+        "--file-size", type=float, nargs="+", help="sizes of synthetic files in bytes"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="minimum seconds per repeat"
+    )
+    args = parser.parse_args()
+
+    if args.quick:
+        defaults = ([10, 100], [700, 7000], [1e3, 1e5], 3, 0.05)
+    else:
+        defaults = ([10, 100, 1000, 10000], [700, 7000, 70000], [1e3, 1e6, 1e8], 5, 0.2)
+    args.n_octa = args.n_octa or defaults[0]
+    args.n_atom = args.n_atom or defaults[1]
+    args.file_size = args.file_size or defaults[2]
+    if args.quick:
+        args.repeat, args.min_time = defaults[3], defaults[4]
+
+    result = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
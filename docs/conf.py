@@ -41,7 +41,6 @@ autodoc_member_order = "bysource"
 autodoc_mock_imports = [
     # "octadist",
     "TkAgg",
-    "pymatgen",
 ]
 
 # -- General configuration ---------------------------------------------------
@@ -48,35 +48,52 @@ __ref__ = "Dalton Trans., 2021,50, 1086-1096"
 __doi__ = "https://doi.org/10.1039/D0DT03988H"
 
 __all__ = [
+    "cache",
     "calc",
     "draw",
     "elements",
+    "export",
     "linear",
     "io",
+    "molecule",
     "plane",
     "plot",
     "popup",
     "projection",
     "structure",
+    "table",
     "tools",
+    "trajectory",
     "util",
     # -----------------------
+    "ResultCache",
+    "calc_octa_cached",
+    "calc_params_cached",
     "CalcDistortion",
+    "CalcDistortionBatch",
     "DrawComplex_Matplotlib",
     "DrawComplex_Plotly",
     "DrawProjection",
     "DrawTwistingPlane",
-    "check_atom",
-    "check_radii",
-    "check_color",
+    "number_to_symbol",
+    "number_to_radii",
+    "number_to_color",
+    "symbols_to_numbers",
+    "numbers_to_symbols",
+    "numbers_to_radii",
+    "numbers_to_colors",
+    "metal_numbers",
+    "ResultWriter",
     "angle_sign",
     "angle_btw_vectors",
     "angle_btw_planes",
     "triangle_area",
     "count_line",
     "extract_coord",
+    "detect_format",
     "find_metal",
     "extract_octa",
+    "extract_all_octa",
     "is_cif",
     "is_xyz",
     "is_gaussian",
@@ -85,12 +102,16 @@ __all__ = [
     "is_qchem",
     "get_coord_cif",
     "get_coord_xyz",
+    "iter_coord_xyz",
     "get_coord_gaussian",
     "get_coord_nwchem",
     "get_coord_orca",
     "get_coord_qchem",
     "find_eq_of_plane",
     "find_fit_plane",
+    "fit_plane",
+    "Structure",
+    "Octahedron",
     "Plot",
     "project_atom_onto_line",
     "project_atom_onto_plane",
@@ -101,78 +122,119 @@ __all__ = [
     "CalcRMSD",
     "find_bonds",
     "find_faces_octa",
+    "find_faces_octa_batch",
+    "RunningStats",
+    "DistortionTrajectory",
 ]
 
 
-# Bring sub-modules to top-level directory
+# Sub-modules and functions are loaded on first access (PEP 562), so that
+# "import octadist" does not pull in tkinter, matplotlib, plotly or rmsd
+# unless the GUI, drawing or tools modules are actually used.
 
-from octadist import logo
-from .logo import Icon_Base64
-
-from octadist import src
+import importlib
 
 from .src import __src__
 
-from .src import calc
-from .src import draw
-from .src import elements
-from .src import linear
-from .src import io
-from .src import plane
-from .src import plot
-from .src import popup
-from .src import projection
-from .src import structure
-from .src import tools
-from .src import util
-
-# Bring function and method to top-level directory
-
-from .src.calc import CalcDistortion
-
-from .src.draw import DrawComplex_Matplotlib
-from .src.draw import DrawComplex_Plotly
-from .src.draw import DrawProjection
-from .src.draw import DrawTwistingPlane
-
-from .src.elements import number_to_symbol
-from .src.elements import number_to_radii
-from .src.elements import number_to_color
-
-from .src.linear import angle_sign
-from .src.linear import angle_btw_vectors
-from .src.linear import angle_btw_planes
-from .src.linear import triangle_area
-
-from .src.io import count_line
-from .src.io import extract_coord
-from .src.io import find_metal
-from .src.io import extract_octa
-from .src.io import is_xyz
-from .src.io import is_gaussian
-from .src.io import is_nwchem
-from .src.io import is_orca
-from .src.io import is_qchem
-from .src.io import get_coord_xyz
-from .src.io import get_coord_gaussian
-from .src.io import get_coord_nwchem
-from .src.io import get_coord_orca
-from .src.io import get_coord_qchem
-
-from .src.plane import find_eq_of_plane
-from .src.plane import find_fit_plane
-
-from .src.plot import Plot
-
-from .src.projection import project_atom_onto_line
-from .src.projection import project_atom_onto_plane
-
-from .src.structure import DataComplex
-from .src.structure import StructParam
-from .src.structure import SurfaceArea
-
-from .src.tools import CalcJahnTeller
-from .src.tools import CalcRMSD
-
-from .src.util import find_bonds
-from .src.util import find_faces_octa
+_SUBMODULES = {
+    "logo": "octadist.logo",
+    "Icon_Base64": "octadist.logo.Icon_Base64",
+    "src": "octadist.src",
+    "cache": "octadist.src.cache",
+    "calc": "octadist.src.calc",
+    "draw": "octadist.src.draw",
+    "elements": "octadist.src.elements",
+    "export": "octadist.src.export",
+    "linear": "octadist.src.linear",
+    "io": "octadist.src.io",
+    "molecule": "octadist.src.molecule",
+    "plane": "octadist.src.plane",
+    "plot": "octadist.src.plot",
+    "popup": "octadist.src.popup",
+    "projection": "octadist.src.projection",
+    "structure": "octadist.src.structure",
+    "table": "octadist.src.table",
+    "tools": "octadist.src.tools",
+    "trajectory": "octadist.src.trajectory",
+    "util": "octadist.src.util",
+}
+
+# Function and class name -> sub-module that defines it
+_ATTRIBUTES = {
+    "Icon_Base64": "logo",
+    "ResultCache": "cache",
+    "calc_octa_cached": "cache",
+    "calc_params_cached": "cache",
+    "CalcDistortion": "calc",
+    "CalcDistortionBatch": "calc",
+    "DrawComplex_Matplotlib": "draw",
+    "DrawComplex_Plotly": "draw",
+    "DrawProjection": "draw",
+    "DrawTwistingPlane": "draw",
+    "number_to_symbol": "elements",
+    "number_to_radii": "elements",
+    "number_to_color": "elements",
+    "symbols_to_numbers": "elements",
+    "numbers_to_symbols": "elements",
+    "numbers_to_radii": "elements",
+    "numbers_to_colors": "elements",
+    "metal_numbers": "elements",
+    "ResultWriter": "export",
+    "angle_sign": "linear",
+    "angle_btw_vectors": "linear",
+    "angle_btw_planes": "linear",
+    "triangle_area": "linear",
+    "count_line": "io",
+    "extract_coord": "io",
+    "detect_format": "io",
+    "find_metal": "io",
+    "extract_octa": "io",
+    "extract_all_octa": "io",
+    "is_cif": "io",
+    "is_xyz": "io",
+    "is_gaussian": "io",
+    "is_nwchem": "io",
+    "is_orca": "io",
+    "is_qchem": "io",
+    "get_coord_cif": "io",
+    "get_coord_xyz": "io",
+    "iter_coord_xyz": "io",
+    "get_coord_gaussian": "io",
+    "get_coord_nwchem": "io",
+    "get_coord_orca": "io",
+    "get_coord_qchem": "io",
+    "find_eq_of_plane": "plane",
+    "find_fit_plane": "plane",
+    "fit_plane": "plane",
+    "Structure": "molecule",
+    "Octahedron": "molecule",
+    "Plot": "plot",
+    "project_atom_onto_line": "projection",
+    "project_atom_onto_plane": "projection",
+    "DataComplex": "structure",
+    "StructParam": "structure",
+    "SurfaceArea": "structure",
+    "CalcJahnTeller": "tools",
+    "CalcRMSD": "tools",
+    "RunningStats": "trajectory",
+    "DistortionTrajectory": "trajectory",
+    "find_bonds": "util",
+    "find_faces_octa": "util",
+    "find_faces_octa_batch": "util",
+}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        value = importlib.import_module(_SUBMODULES[name])
+    elif name in _ATTRIBUTES:
+        value = getattr(__getattr__(_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_ATTRIBUTES))
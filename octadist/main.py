@@ -17,7 +17,10 @@
 import base64
 import os
 import platform
+import queue
 import subprocess
+import threading
+import time
 import tkinter as tk
 import tkinter.scrolledtext as tkscrolled
 import webbrowser
@@ -32,7 +35,184 @@ import numpy as np
 
 import octadist
 from octadist.logo import Icon_Base64
-from octadist.src import io, calc, draw, plot, popup, scripting, structure, tools
+from octadist.src import io, cache, draw, export, molecule, plot, popup
+from octadist.src import scripting, structure, table, tools
+
+# Interval of polling the worker queue, in milliseconds
+POLL_INTERVAL = 50
+
+# Longest time spent on handling worker results per poll, in seconds,
+# so that the window keeps responding while results arrive
+POLL_BUDGET = 0.05
+
+# Columns of the result table: name, heading, width and format of values
+RESULT_COLUMNS = [
+    ("no", "No.", 45, None),
+    ("file", "File", 150, None),
+    ("metal", "Metal", 50, None),
+    ("d_mean", "D_mean", 75, "{:.4f}"),
+    ("zeta", "Zeta", 75, "{:.6f}"),
+    ("delta", "Delta", 75, "{:.6f}"),
+    ("sigma", "Sigma", 75, "{:.4f}"),
+    ("theta", "Theta", 75, "{:.4f}"),
+    ("oct_vol", "Volume", 75, "{:.4f}"),
+]
+
+# Parameters shown in the result table
+RESULT_PARAMS = [c[0] for c in RESULT_COLUMNS[3:]]
+
+
+def _search_files(work_queue, cancel, file_list, cutoff_metal_ligand):
+    """
+    Read input files and extract their octahedra, in a worker thread.
+
+    Nothing of the GUI is touched here: structures, octahedra, warnings and
+    progress are put on work_queue as messages for :meth:`OctaDist.handle_message`.
+    Files that cannot be used, including files that fail to be read, are reported
+    as one-line warnings and skipped. The warnings are shown together when the task
+    ends instead of one dialog per file.
+
+    Parameters
+    ----------
+    work_queue : queue.Queue
+        Queue of messages to the main thread.
+    cancel : threading.Event
+        Stop after the current file when set.
+    file_list : list of str
+        Input files.
+    cutoff_metal_ligand : float
+        Cutoff distance for screening bond distance between metal and ligand atoms.
+
+    """
+    for i, file in enumerate(file_list):
+        if cancel.is_set():
+            return
+
+        # File number and file name
+        file_name = file.split("/")[-1]
+        prefix = f"File no. {i + 1} {file_name}"
+
+        ########################################
+        # Extract atomic coordinates from file #
+        ########################################
+
+        # io.extract_coord shows these popups itself, which must be done
+        # by the main thread, so files it would reject are skipped here
+        if file.endswith(".cif") and not io.is_cif(file):
+            error = "invalid input file format"
+        elif file.endswith(".xyz") and not io.is_xyz(file):
+            error = "invalid input file format"
+        elif not file.endswith((".cif", ".xyz", ".out", ".log")):
+            error = "file format not supported"
+        else:
+            error = None
+
+        if error is None:
+            try:
+                mol = molecule.Structure.from_file(file)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+        if error is not None:
+            work_queue.put(("warning", f"{prefix}: {error}"))
+            mol = molecule.Structure([], np.empty((0, 3)), name=file)
+        work_queue.put(("structure", mol))
+
+        # If either lists is empty, then continue to next file
+        if len(mol) == 0:
+            work_queue.put(("progress", i + 1))
+            continue
+
+        atom_full, coord_full = mol
+
+        #################################################
+        # Extract octahedral structure from the complex #
+        #################################################
+
+        try:
+            atom_metal, coord_metal, index_metal = io.find_metal(atom_full, coord_full)
+
+            # Extract octahedra around all metal atoms in one pass
+            # Octahedra in crystals are searched across the cell faces
+            index_octa, coord_octa_all = io.extract_all_octa(
+                atom_full,
+                coord_full,
+                index_metal,
+                cutoff_metal_ligand,
+                lattice=mol.lattice,
+            )
+        except Exception as e:
+            work_queue.put(("warning", f"{prefix}: {type(e).__name__}: {e}"))
+            work_queue.put(("progress", i + 1))
+            continue
+
+        if len(atom_metal) == 0:
+            work_queue.put(("warning", f"{prefix}: transition metal not found"))
+
+        # loop over the number of metal atoms found in the complex
+        for j in range(len(atom_metal)):
+            coord_octa = coord_octa_all[j]
+
+            # If no atomic coordinates inside, raise error
+            if np.any(coord_octa) == 0:
+                work_queue.put(("warning", f"{prefix}: atomic coordinates not found"))
+                continue
+
+            if np.any(index_octa[j] < 0):
+                work_queue.put(
+                    (
+                        "warning",
+                        f"{prefix}: metal {atom_metal[j]} has less than six ligand atoms",
+                    )
+                )
+                continue
+
+            # Octahedron refers to its atoms in the complex, without a copy
+            octa = molecule.Octahedron.from_coord(mol, index_octa[j], coord_octa)
+
+            work_queue.put(("octa", [i + 1, file_name], octa, int(index_metal[j])))
+
+        work_queue.put(("progress", i + 1))
+
+
+def _compute_octahedra(work_queue, cancel, octahedra, cache_file):
+    """
+    Calculate distortion parameters of octahedra, in a worker thread.
+
+    The parameters of each octahedron are put on work_queue as soon as
+    they are computed, see :meth:`OctaDist.handle_message`.
+
+    Parameters
+    ----------
+    work_queue : queue.Queue
+        Queue of messages to the main thread.
+    cancel : threading.Event
+        Stop after the current octahedron when set.
+    octahedra : list of octadist.src.molecule.Octahedron
+        Octahedral structures.
+    cache_file : tuple or None
+        Path and size limit of the result cache, or None if the cache is disabled.
+        The worker opens its own connection, as SQLite connections cannot be
+        shared between threads.
+
+    """
+    result_cache = None
+    if cache_file is not None:
+        result_cache = cache.ResultCache(*cache_file)
+
+    try:
+        for i, octa in enumerate(octahedra):
+            if cancel.is_set():
+                return
+
+            # Calculate distortion parameters, or reuse them from the result cache
+            params = cache.calc_params_cached(octa.coord, result_cache)
+
+            work_queue.put(("params", params))
+            work_queue.put(("progress", i + 1))
+    finally:
+        if result_cache is not None:
+            result_cache.close()
 
 
 class OctaDist:
@@ -70,17 +250,35 @@ class OctaDist:
         self.file_list = []  # Full path of input files.
         self.file_name = []  # File name.
         self.octa_index = []  # Octahedral structure index.
-        self.atom_coord_full = []  # Coordinates of metal complex.
-        self.atom_coord_octa = []  # Coordinates of octahedral structures.
+        self.metal_index = []  # Index of metal center atom in complex.
+        self.atom_coord_full = []  # Metal complexes, as molecule.Structure.
+        self.atom_coord_octa = []  # Octahedral structures, as molecule.Octahedron.
         self.all_zeta = []  # Zeta of all octahedral structures.
         self.all_delta = []  # Delta of all octahedral structures.
         self.all_sigma = []  # Sigma of all octahedral structures.
         self.all_theta = []  # Theta of all octahedral structures.
         self.all_vol = []  # Volumes of all octahedral structures.
         self.comp_result = []  # Distortion parameters.
+        self.all_params = []  # All distortion parameters of each octahedron.
 
         self.octadist_icon = None
 
+        # Input files are read and parameters are computed in a worker thread,
+        # which hands its results to the main loop through work_queue
+        self.worker = None
+        self.work_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.task_name = ""
+        self.task_total = 0
+        self.task_done = None
+        self.task_messages = []
+
+        # Path and size limit of the result cache, enabled by setting OCTADIST_CACHE
+        # to the cache file. The cache is opened by the worker that uses it.
+        self.cache_file = None
+        if os.environ.get("OCTADIST_CACHE"):
+            self.cache_file = (cache.default_cache_path(), cache.DEFAULT_MAX_SIZE)
+
         # Default cutoff values
         self.cutoff_metal_ligand = 2.8
         self.cutoff_global = 2.0
@@ -322,13 +520,15 @@ class OctaDist:
         frame2 = tk.LabelFrame(self.master, text="Program Console")
         frame2.grid(padx=5, pady=5, ipadx=2, ipady=2, sticky=tk.N, row=1, column=0)
 
-        btn = ttk.Button(frame2, text="Browse file", command=self.open_file)
-        btn.config(width=14)
-        btn.grid(padx="10", pady="5", row=0)
+        self.btn_browse = ttk.Button(frame2, text="Browse file", command=self.open_file)
+        self.btn_browse.config(width=14)
+        self.btn_browse.grid(padx="10", pady="5", row=0)
 
-        btn = ttk.Button(frame2, text="Compute", command=self.calc_distortion)
-        btn.config(width=14)
-        btn.grid(padx="10", pady="5", row=1)
+        self.btn_compute = ttk.Button(
+            frame2, text="Compute", command=self.calc_distortion
+        )
+        self.btn_compute.config(width=14)
+        self.btn_compute.grid(padx="10", pady="5", row=1)
 
         btn = ttk.Button(frame2, text="Clear cache", command=self.clear_cache)
         btn.config(width=14)
@@ -415,9 +615,30 @@ class OctaDist:
         frame4 = tk.Frame(self.master)
         frame4.grid(padx=5, pady=10, row=2, column=0, columnspan=2)
 
+        # One row per octahedron, only the current page is rendered
+        self.table = table.ResultTable(
+            frame4, RESULT_COLUMNS, height=10, on_select=self.show_coord
+        )
+        self.table.grid(sticky=tk.EW, row=0)
+
         self.box_result = tkscrolled.ScrolledText(frame4)
-        self.box_result.configure(height="19", width="70", wrap="word", undo="True")
-        self.box_result.grid(row=0)
+        self.box_result.configure(height="9", width="70", wrap="word", undo="True")
+        self.box_result.grid(sticky=tk.EW, row=1)
+
+        # Progress of reading files and computing parameters
+        frame5 = tk.Frame(frame4)
+        frame5.grid(pady="5", sticky=tk.EW, row=2)
+        frame5.columnconfigure(1, weight=1)
+
+        self.progress = ttk.Progressbar(frame5, orient=tk.HORIZONTAL, length=200)
+        self.progress.grid(padx="5", row=0, column=0)
+
+        self.lbl_progress = tk.Label(frame5, text="", anchor=tk.W)
+        self.lbl_progress.grid(padx="5", sticky=tk.EW, row=0, column=1)
+
+        self.btn_cancel = ttk.Button(frame5, text="Cancel", command=self.cancel_task)
+        self.btn_cancel.config(width=10, state=tk.DISABLED)
+        self.btn_cancel.grid(padx="5", row=0, column=2)
 
     def show_text(self, text):
         """
@@ -486,6 +707,10 @@ class OctaDist:
         """
         Search and extract atomic symbols and coordinates from input file.
 
+        Files are read in a worker thread, so the window keeps responding.
+        Octahedra are added to the result table as soon as they are found,
+        see :meth:`start_task`.
+
         See Also
         --------
         octadist.src.io.extract_coord :
@@ -499,105 +724,146 @@ class OctaDist:
         except IndexError:
             return 1
 
-        for i in range(len(self.file_list)):
-
-            ########################################
-            # Extract atomic coordinates from file #
-            ########################################
-
-            atom_full, coord_full = io.extract_coord(self.file_list[i])
-            self.atom_coord_full.append([atom_full, coord_full])
-
-            # If either lists is empty, then continue to next file
-            if len(list(atom_full)) == 0 or len(coord_full) == 0:
-                continue
+        if self.is_busy():
+            return 1
 
-            #################################################
-            # Extract octahedral structure from the complex #
-            #################################################
+        self.start_task(
+            "Reading files",
+            _search_files,
+            (list(self.file_list), self.cutoff_metal_ligand),
+            len(self.file_list),
+        )
 
-            atom_metal, coord_metal, index_metal = io.find_metal(atom_full, coord_full)
+    def format_coord(self, i):
+        """
+        Format atomic coordinates of an octahedral structure.
 
-            if len(atom_metal) == 0:
-                popup.warn_no_metal(i + 1)
+        Parameters
+        ----------
+        i : int
+            Index of the octahedron.
 
-            # loop over the number of metal atoms found in the complex
-            for j in range(len(atom_metal)):
-                atom_octa, coord_octa = io.extract_octa(
-                    atom_full, coord_full, index_metal[j], self.cutoff_metal_ligand
+        Returns
+        -------
+        lines : list of str
+            Lines of text, as shown in result box and written to the report.
+
+        """
+        lines = [
+            f"File {self.file_name[i][0]}: {self.file_name[i][1]}",
+            f"Metal center atom: {self.octa_index[i]}",
+            "Atom\t\tCartesian coordinate",
+        ]
+
+        # loop over atoms in octahedron
+        atom_octa, coord_octa = self.atom_coord_octa[i]
+        for k in range(7):
+            lines.append(
+                " {0:>2}      {1:14.9f}  {2:14.9f}  {3:14.9f}".format(
+                    atom_octa[k],
+                    coord_octa[k][0],
+                    coord_octa[k][1],
+                    coord_octa[k][2],
                 )
+            )
 
-                # If no atomic coordinates inside, raise error
-                if np.any(coord_octa) == 0:
-                    popup.err_no_coord(i + 1)
-                    continue
-
-                if len(coord_octa) < 7:
-                    self.clear_result_box()
-                    popup.err_less_ligands(i + 1)
-                    continue
-
-                # File number and file name
-                file_name = self.file_list[i].split("/")[-1]
-                self.file_name.append([i + 1, file_name])
-
-                # Metal center atom
-                self.octa_index.append(atom_octa[0])
+        return lines
 
-                # Atomic labels and atomic coordinates
-                # Example:
-                #
-                # atom = ['Fe', 'O', 'O', 'N', 'N', 'N', 'N']
-                # coord = [[2.298354, 5.161785, 7.971898],
-                #          [1.885657, 4.804777, 6.183726],
-                #          [1.747515, 6.960963, 7.932784],
-                #          [4.094380, 5.807257, 7.588689],
-                #          [0.539005, 4.482809, 8.460004],
-                #          [2.812425, 3.266553, 8.131637],
-                #          [2.886404, 5.392925, 9.848966]]
+    def show_coord(self, i):
+        """
+        Show coordinates of the octahedron selected in result table in result box.
 
-                self.atom_coord_octa.append([atom_octa, coord_octa])
+        Parameters
+        ----------
+        i : int
+            Index of the octahedron.
 
-        self.show_coord()
+        """
+        self.box_result.delete(1.0, tk.END)
+        self.show_text("XYZ coordinates of extracted octahedral structure")
+        self.show_text("\n".join(self.format_coord(i)))
 
-    def show_coord(self):
+    def results_text(self):
         """
-        Show coordinates in box.
+        Format coordinates of all octahedral structures and their computed
+        distortion parameters as text, for the report written by :meth:`save_results`.
+
+        Returns
+        -------
+        text : str
+            Report body.
 
         """
-        # loop over complex
+        lines = []
         for i in range(len(self.atom_coord_octa)):
             if i == 0:
-                self.show_text("XYZ coordinates of extracted octahedral structure")
-
-            self.show_text(f"File {self.file_name[i][0]}: {self.file_name[i][1]}")
-            self.show_text(f"Metal center atom: {self.octa_index[i]}")
-            self.show_text("Atom\t\tCartesian coordinate")
-
-            # loop over atoms in octahedron
-            for k in range(7):
-                self.show_text(
-                    " {0:>2}      {1:14.9f}  {2:14.9f}  {3:14.9f}".format(
-                        self.atom_coord_octa[i][0][k],
-                        self.atom_coord_octa[i][1][k][0],
-                        self.atom_coord_octa[i][1][k][1],
-                        self.atom_coord_octa[i][1][k][2],
+                lines.append("XYZ coordinates of extracted octahedral structure")
+            lines += self.format_coord(i) + [""]
+
+        if self.comp_result:
+            lines.append(
+                "Computed octahedral distortion parameters for all complexes\n"
+            )
+            lines.append("No. - Metal\t\tD_mean\tZeta\tDelta\tSigma\tTheta\tVolume")
+            lines.append("*" * 71)
+            for i in range(len(self.comp_result)):
+                lines.append(
+                    "{0:2d}  -  {1}\t\t{2:9.4f}\t{3:9.6f}\t{4:9.6f}\t{5:9.4f}\t{6:9.4f}\t{7:9.4f}".format(
+                        i + 1, self.octa_index[i], *self.comp_result[i]
                     )
                 )
-            self.show_text("")
+
+        return "\n".join(lines)
 
     def save_results(self):
         """
         Save results as output file. Default file extension is .txt.
 
+        Choosing a .parquet, .arrow, .h5, .npz, .csv, or .jsonl file instead writes
+        one row per octahedron with all parameters and coordinates,
+        see :class:`octadist.src.export.ResultWriter`.
+
         """
-        f = filedialog.asksaveasfile(
-            mode="w",
+        file = filedialog.asksaveasfilename(
             defaultextension=".txt",
             title="Save results",
-            filetypes=(("TXT File", "*.txt"), ("All Files", "*.*")),
+            filetypes=(
+                ("TXT File", "*.txt"),
+                ("Parquet File", "*.parquet"),
+                ("Arrow File", "*.arrow"),
+                ("HDF5 File", "*.h5"),
+                ("NumPy File", "*.npz"),
+                ("CSV File", "*.csv"),
+                ("JSONL File", "*.jsonl"),
+                ("All Files", "*.*"),
+            ),
         )
+        if not file:
+            return 1
+
+        if os.path.splitext(file)[1].lower() in export.FORMATS:
+            if len(self.all_params) == 0:
+                popup.err_no_calc()
+                return 1
+
+            try:
+                with export.ResultWriter(file) as writer:
+                    for i, params in enumerate(self.all_params):
+                        writer.write(
+                            self.file_name[i][1],
+                            self.metal_index[i],
+                            self.octa_index[i],
+                            params,
+                            self.atom_coord_octa[i].coord,
+                        )
+            except ImportError as e:
+                messagebox.showerror("Error", str(e))
+                return 1
+
+            popup.info_save_results(file)
+            return 0
 
+        f = open(file, "w")
         f.write(f"{octadist.__copyright__}\n")
         f.write("=" * 60 + "\n")
         f.write("\n")
@@ -609,8 +875,7 @@ class OctaDist:
         f.write("\n")
         f.write("=" * 60 + "\n")
         f.write("\n")
-        get_result = self.box_result.get("1.0", tk.END + "-1c")
-        f.write(get_result)
+        f.write(self.results_text())
         f.write("\n")
         f.write("=" * 60 + "\n")
         f.close()
@@ -700,37 +965,73 @@ class OctaDist:
             popup.err_no_file()
             return 1
 
+        if self.is_busy():
+            return 1
+
         # if comp_result is not empty, clean it to avoid over loop.
         if self.comp_result:
             self.comp_result = []
+            self.all_params = []
+            self.all_zeta = []
+            self.all_delta = []
+            self.all_sigma = []
+            self.all_theta = []
+            self.all_vol = []
+            for i in range(len(self.atom_coord_octa)):
+                self.table.update(i, **dict.fromkeys(RESULT_PARAMS))
+            self.table.refresh()
+
+        self.start_task(
+            "Computing",
+            _compute_octahedra,
+            (list(self.atom_coord_octa), self.cache_file),
+            len(self.atom_coord_octa),
+            done=self.show_param,
+        )
 
-        # loop over number of metal complexes
-        for i in range(len(self.atom_coord_octa)):
-            atom_octa, coord_octa = self.atom_coord_octa[i]
-
-            # Calculate distortion parameters
-            calc_dist = calc.CalcDistortion(coord_octa)
-
-            d_mean = calc_dist.d_mean
-            zeta = calc_dist.zeta
-            delta = calc_dist.delta
-            sigma = calc_dist.sigma
-            theta = calc_dist.theta
-            non_octa = calc_dist.non_octa
-            vol = calc_dist.oct_vol
-
-            if non_octa:
-                popup.warn_not_octa()
+    def collect_params(self, params):
+        """
+        Collect distortion parameters of the next octahedron and show them in result table.
 
-            # Collect results
-            self.all_zeta.append(zeta)
-            self.all_delta.append(delta)
-            self.all_sigma.append(sigma)
-            self.all_theta.append(theta)
+        Parameters
+        ----------
+        params : dict
+            All parameters listed in :data:`octadist.src.cache.PARAMETERS`.
+
+        """
+        d_mean = params["d_mean"]
+        zeta = params["zeta"]
+        delta = params["delta"]
+        sigma = params["sigma"]
+        theta = params["theta"]
+        non_octa = params["non_octa"]
+        vol = params["oct_vol"]
+
+        # Collect results
+        self.all_zeta.append(zeta)
+        self.all_delta.append(delta)
+        self.all_sigma.append(sigma)
+        self.all_theta.append(theta)
+        self.all_vol.append(vol)
+
+        self.comp_result.append([d_mean, zeta, delta, sigma, theta, vol])
+        self.all_params.append(params)
+
+        i = len(self.comp_result) - 1
+        self.table.update(i, **{k: params[k] for k in RESULT_PARAMS})
+
+        if non_octa:
+            self.task_messages.append(
+                f"Octahedron {i + 1}: non-octahedral structure detected"
+            )
 
-            self.comp_result.append([d_mean, zeta, delta, sigma, theta, vol])
+    def show_param(self):
+        """
+        Print results to each unique box.
 
-        # Print results to each unique box.
+        """
+        if len(self.comp_result) == 0:
+            return
 
         if len(self.atom_coord_octa) == 1:
             d_mean, zeta, delta, sigma, theta, vol = self.comp_result[0]
@@ -749,24 +1050,191 @@ class OctaDist:
             self.box_theta_mean.insert(tk.INSERT, "See below")
             self.box_vol.insert(tk.INSERT, "See below")
 
-        # Print results to result box
-        self.show_text("Computed octahedral distortion parameters for all complexes\n")
-        self.show_text("No. - Metal\t\tD_mean\tZeta\tDelta\tSigma\tTheta\tVolume")
-        self.show_text("*" * 71)
-        for i in range(len(self.comp_result)):
-            self.show_text(
-                "{0:2d}  -  {1}\t\t{2:9.4f}\t{3:9.6f}\t{4:9.6f}\t{5:9.4f}\t{6:9.4f}\t{7:9.4f}".format(
-                    i + 1,
-                    self.octa_index[i],
-                    self.comp_result[i][0],
-                    self.comp_result[i][1],
-                    self.comp_result[i][2],
-                    self.comp_result[i][3],
-                    self.comp_result[i][4],
-                    self.comp_result[i][5],
-                )
+    ###################
+    # Background work #
+    ###################
+
+    def is_busy(self):
+        """
+        Check if a worker thread is running.
+
+        Returns
+        -------
+        busy : bool
+            True if files are being read or parameters are being computed.
+
+        """
+        return self.worker is not None
+
+    def start_task(self, name, target, args, total, done=None):
+        """
+        Run a task in a worker thread and poll its results with ``after()``.
+
+        The worker puts messages on a queue instead of touching the widgets,
+        which may only be used by the main thread. Every task gets its own queue
+        and cancel event, so a cancelled worker that is still finishing its
+        current item cannot mix its results into the next task.
+
+        Parameters
+        ----------
+        name : str
+            Name of the task shown next to the progress bar.
+        target : callable
+            Worker function, called as ``target(work_queue, cancel, *args)``.
+        args : tuple
+            Arguments of the worker function.
+        total : int
+            Number of items to process, the maximum of the progress bar.
+        done : callable, optional
+            Called in the main thread when the task has finished or was cancelled.
+            Default is None.
+
+        """
+        self.work_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.task_name = name
+        self.task_total = total
+        self.task_done = done
+        self.task_messages = []
+
+        self.progress.configure(maximum=max(total, 1), value=0)
+        self.lbl_progress.configure(text=f"{name}: 0/{total}")
+        self.btn_browse.config(state=tk.DISABLED)
+        self.btn_compute.config(state=tk.DISABLED)
+        self.btn_cancel.config(state=tk.NORMAL)
+
+        self.worker = threading.Thread(
+            target=self.run_task,
+            args=(target, self.work_queue, self.cancel_event, args),
+            daemon=True,
+        )
+        self.worker.start()
+        self.master.after(POLL_INTERVAL, self.poll_queue, self.work_queue)
+
+    @staticmethod
+    def run_task(target, work_queue, cancel, args):
+        """
+        Body of the worker thread: run the task and always report its end,
+        so that the main thread stops polling even if the task fails.
+
+        """
+        try:
+            target(work_queue, cancel, *args)
+        except Exception as e:
+            work_queue.put(("error", f"{type(e).__name__}: {e}"))
+        finally:
+            work_queue.put(("done", cancel.is_set()))
+
+    def poll_queue(self, work_queue):
+        """
+        Handle the messages of the worker and poll again later.
+
+        Parameters
+        ----------
+        work_queue : queue.Queue
+            Queue of the task being polled. Polling stops when it is not
+            the queue of the current task anymore.
+
+        """
+        deadline = time.perf_counter() + POLL_BUDGET
+        while work_queue is self.work_queue and time.perf_counter() < deadline:
+            try:
+                message = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.handle_message(*message)
+
+        # Results of this poll are rendered at once, one page at most
+        self.table.refresh()
+
+        if work_queue is self.work_queue and self.is_busy():
+            self.master.after(POLL_INTERVAL, self.poll_queue, work_queue)
+
+    def handle_message(self, kind, *args):
+        """
+        Apply one message of the worker to the program state and the widgets.
+
+        Parameters
+        ----------
+        kind : str
+            Message type: structure, octa, params, warning, progress, error or done.
+        args
+            Message content.
+
+        """
+        if kind == "structure":
+            self.atom_coord_full.append(args[0])
+
+        elif kind == "octa":
+            file_name, octa, metal_index = args
+            self.file_name.append(file_name)
+            self.octa_index.append(octa.metal)
+            self.metal_index.append(metal_index)
+            self.atom_coord_octa.append(octa)
+            self.table.append(
+                no=len(self.atom_coord_octa), file=file_name[1], metal=octa.metal
+            )
+
+        elif kind == "params":
+            self.collect_params(args[0])
+
+        elif kind == "warning":
+            self.task_messages.append(args[0])
+
+        elif kind == "progress":
+            self.progress.configure(value=args[0])
+            self.lbl_progress.configure(
+                text=f"{self.task_name}: {args[0]}/{self.task_total}"
             )
 
+        elif kind == "error":
+            messagebox.showerror("Error", args[0])
+
+        elif kind == "done":
+            cancelled = args[0]
+            if cancelled:
+                self.lbl_progress.configure(
+                    text=f"{self.task_name}: cancelled at "
+                    f"{int(self.progress['value'])}/{self.task_total}"
+                )
+            self.end_task()
+            if self.task_done is not None:
+                self.task_done()
+            self.show_task_messages()
+
+    def show_task_messages(self):
+        """
+        Show the warnings of the finished task at once: all of them in result box
+        and a summary in one popup, rather than one popup per file or octahedron.
+
+        """
+        if not self.task_messages:
+            return
+
+        self.show_text(f"{self.task_name}: {len(self.task_messages)} warning(s)")
+        self.show_text("\n".join(self.task_messages) + "\n")
+        popup.warn_task_messages(self.task_name, self.task_messages)
+
+    def cancel_task(self):
+        """
+        Stop the worker after its current file or octahedron.
+        Results received so far are kept.
+
+        """
+        if self.is_busy():
+            self.cancel_event.set()
+            self.lbl_progress.configure(text=f"{self.task_name}: cancelling...")
+
+    def end_task(self):
+        """
+        Restore the widgets after the worker has finished.
+
+        """
+        self.worker = None
+        self.btn_browse.config(state=tk.NORMAL)
+        self.btn_compute.config(state=tk.NORMAL)
+        self.btn_cancel.config(state=tk.DISABLED)
+
     ###################
     # Program Setting #
     ###################
@@ -1770,9 +2238,17 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
             if not name.startswith("_"):
                 del locals()[name]
 
+        # Stop the running worker and drop its pending results
+        self.cancel_task()
+        self.work_queue = queue.Queue()
+        self.end_task()
+        self.progress.configure(value=0)
+        self.lbl_progress.configure(text="")
+
         self.file_list = []
         self.file_name = []
         self.octa_index = []
+        self.metal_index = []
         self.atom_coord_full = []
         self.atom_coord_octa = []
         self.all_zeta = []
@@ -1781,7 +2257,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
         self.all_theta = []
         self.all_vol = []
         self.comp_result = []
+        self.all_params = []
 
+        self.table.clear()
         self.clear_param_box()
         self.clear_result_box()
 
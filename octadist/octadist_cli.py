@@ -15,13 +15,19 @@
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import argparse
+import csv
+import glob
+import json
+import multiprocessing
 import os
 import sys
 
 import octadist
-from .octadist_gui import run_gui
 from octadist.src.io import is_xyz, get_coord_xyz, extract_octa
 
+# Result cache of each worker process, opened on first use
+_worker_cache = {}
+
 
 def check_file(file):
     """
@@ -47,6 +53,37 @@ def check_file(file):
         sys.exit(1)
 
 
+def load_coord(file):
+    """
+    Read atomic symbols and atomic coordinates of structure.
+
+    Parameters
+    ----------
+    file : str
+        Input file name.
+
+    Returns
+    -------
+    atom : list
+        Atomic symbols.
+    coord : list
+        Atomic coordinates.
+
+    Raises
+    ------
+    ValueError
+        If the file type of input file is not supported.
+
+    """
+    if not (file.endswith(".xyz") and is_xyz(file)):
+        raise ValueError(f"File type of input file is not supported: {file}")
+
+    atom, coord = get_coord_xyz(file)
+    atom = list(filter(None, atom))
+
+    return atom, coord
+
+
 def find_coord(file):
     """
     Find atomic symbols and atomic coordinates of structure.
@@ -64,22 +101,16 @@ def find_coord(file):
         Atomic coordinates.
 
     """
-    if file.endswith(".xyz"):
-        if is_xyz(file):
-            atom, coord = get_coord_xyz(file)
-        else:
-            print(f"File type of input file is not supported: {file}")
-            sys.exit(1)
-    else:
-        print(f"File type of input file is not supported: {file}")
+    try:
+        atom, coord = load_coord(file)
+    except ValueError as e:
+        print(e)
         sys.exit(1)
 
-    atom = list(filter(None, atom))
-
     return atom, coord
 
 
-def calc_param(coord):
+def calc_param(coord, params=None):
     """
     Calculate octahedral distortion parameters.
 
@@ -87,24 +118,269 @@ def calc_param(coord):
     ----------
     coord : array_like
         Atomic coordinates of octahedral structure.
+    params : list of str, optional
+        Parameters to compute. Only these parameters and their dependencies are evaluated.
+        Default is None, which means zeta, delta, sigma, and theta.
 
     Returns
     -------
     computed : dict
-        Computed parameters: zeta, delta, sigma, theta.
+        Computed parameters.
 
     """
+    if params is None:
+        params = ["zeta", "delta", "sigma", "theta"]
+
     dist = octadist.CalcDistortion(coord)
-    computed = {
-        "zeta": dist.zeta,
-        "delta": dist.delta,
-        "sigma": dist.sigma,
-        "theta": dist.theta,
-    }
+    computed = {p: getattr(dist, p) for p in params}
 
     return computed
 
 
+def collect_files(paths=None, file_list=None):
+    """
+    Collect input files for batch mode.
+
+    Parameters
+    ----------
+    paths : list of str, optional
+        Input files, directories, or glob patterns. Directories are searched
+        recursively for .xyz files. Default is None.
+    file_list : str, optional
+        Text file listing one input file per line. Default is None.
+
+    Returns
+    -------
+    files : list of str
+        Input files in the given order, without duplicates.
+
+    """
+    files = []
+
+    for path in paths or []:
+        if os.path.isdir(path):
+            found = glob.glob(os.path.join(path, "**", "*.xyz"), recursive=True)
+        else:
+            found = glob.glob(path, recursive=True) or [path]
+        files.extend(sorted(found))
+
+    if file_list is not None:
+        with open(file_list) as f:
+            files.extend(line.strip() for line in f if line.strip())
+
+    return list(dict.fromkeys(files))
+
+
+def process_file(file, ref_index=0, cutoff=2.8, params=None, cache=None, full=False):
+    """
+    Compute distortion parameters of the octahedron in one input file.
+
+    Parameters
+    ----------
+    file : str
+        Input file name.
+    ref_index : int, optional
+        Index of the reference center atom. Default is 0.
+    cutoff : float, optional
+        Cutoff distance for determining octahedron. Default is 2.8.
+    params : list of str, optional
+        Parameters to compute, see :func:`calc_param`. Default is None.
+    cache : octadist.src.cache.ResultCache, optional
+        Result cache. If given, unchanged inputs are not recomputed. Default is None.
+    full : bool, optional
+        If True, the row also contains the index and symbol of the metal center atom,
+        the non-octahedral flag, and the coordinates of the octahedron, as needed by
+        :class:`octadist.src.export.ResultWriter`. Default is False.
+
+    Returns
+    -------
+    row : dict
+        File name followed by computed parameters.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be read or the extracted octahedron is incomplete.
+
+    """
+    if not os.path.isfile(file):
+        raise ValueError(f"File not found: {file}")
+
+    atom, coord = load_coord(file)
+
+    if params is None:
+        params = ["zeta", "delta", "sigma", "theta"]
+
+    if cache is not None:
+        from octadist.src.cache import calc_octa_cached
+
+        atom, coord, computed = calc_octa_cached(atom, coord, ref_index, cutoff, cache)
+        if not computed:
+            raise ValueError(f"Extracted octahedron is incomplete: {file}")
+        computed = {p: computed[p] for p in params + ["non_octa"] * full}
+    else:
+        atom, coord = extract_octa(atom, coord, ref_index, cutoff)
+        if len(atom) < 7:
+            raise ValueError(f"Extracted octahedron is incomplete: {file}")
+        computed = calc_param(coord, params + ["non_octa"] * full)
+
+    row = {"file": file}
+    for k in params:
+        row[k] = float(computed[k])
+
+    if full:
+        row["metal_index"] = ref_index
+        row["metal"] = atom[0]
+        row["non_octa"] = bool(computed["non_octa"])
+        row["coord"] = coord
+
+    return row
+
+
+def _open_cache(path, max_size):
+    """
+    Open the result cache of the current process, reusing it across tasks.
+
+    """
+    if path not in _worker_cache:
+        from octadist.src.cache import ResultCache
+
+        _worker_cache[path] = ResultCache(path, max_size)
+
+    return _worker_cache[path]
+
+
+def _process_task(task):
+    """
+    Run :func:`process_file` in a worker and turn errors into a result.
+
+    """
+    file, ref_index, cutoff, params, cache_path, cache_size, full = task
+    try:
+        cache = None if cache_path is None else _open_cache(cache_path, cache_size)
+        return process_file(file, ref_index, cutoff, params, cache, full), None
+    except Exception as e:
+        return {"file": file}, f"{type(e).__name__}: {e}"
+
+
+def run_batch(
+    files,
+    ref_index=0,
+    cutoff=2.8,
+    params=None,
+    output=None,
+    jobs=None,
+    chunksize=16,
+    cache=None,
+    cache_size=None,
+):
+    """
+    Compute distortion parameters for many input files in parallel.
+
+    Files are distributed over a pool of worker processes and results are written
+    as soon as they complete, so the output order may differ from the input order.
+    Files that fail are reported on stderr and do not stop the run.
+
+    Parameters
+    ----------
+    files : list of str
+        Input files.
+    ref_index : int, optional
+        Index of the reference center atom. Default is 0.
+    cutoff : float, optional
+        Cutoff distance for determining octahedron. Default is 2.8.
+    params : list of str, optional
+        Parameters to compute, see :func:`calc_param`. Default is None.
+    output : str, optional
+        Output file. The format is chosen by extension: .csv or .jsonl for one row
+        of parameters per file, or any columnar format of
+        :class:`octadist.src.export.ResultWriter`, such as .parquet, .h5 or .npz,
+        which also store the metal center atom and the octahedron coordinates.
+        Files that failed are not written to columnar formats.
+        If None, CSV is written to stdout. Default is None.
+    jobs : int, optional
+        Number of worker processes. If None, use the number of CPUs.
+        If 1, run in the current process. Default is None.
+    chunksize : int, optional
+        Number of files sent to a worker at a time. Default is 16.
+    cache : str, optional
+        Result cache file shared by all workers, see
+        :class:`octadist.src.cache.ResultCache`. If None, no cache is used.
+        Default is None.
+    cache_size : int, optional
+        Maximum size of the result cache, in bytes. If None, use the default size.
+        Default is None.
+
+    Returns
+    -------
+    failed : list of tuple
+        File name and error message of each file that failed.
+
+    """
+    if params is None:
+        params = ["zeta", "delta", "sigma", "theta"]
+
+    fields = ["file"] + params + ["error"]
+    columnar = output is not None and not output.endswith((".csv", ".jsonl"))
+    if cache is not None and cache_size is None:
+        from octadist.src.cache import DEFAULT_MAX_SIZE as cache_size
+
+    tasks = [
+        (file, ref_index, cutoff, params, cache, cache_size, columnar) for file in files
+    ]
+    failed = []
+
+    if columnar:
+        from octadist.src.export import ResultWriter
+
+        # Rows are buffered and written in chunks by the writer
+        f = ResultWriter(output, params)
+
+        def write_row(row):
+            if "error" not in row:
+                f.write(
+                    row["file"], row["metal_index"], row["metal"], row, row["coord"]
+                )
+
+    else:
+        f = sys.stdout if output is None else open(output, "w", newline="")
+        if output is not None and output.endswith(".jsonl"):
+
+            def write_row(row):
+                f.write(json.dumps(row) + "\n")
+                f.flush()
+
+        else:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+
+            def write_row(row):
+                writer.writerow(row)
+                f.flush()
+
+    pool = None
+    try:
+        if jobs == 1:
+            results = map(_process_task, tasks)
+        else:
+            pool = multiprocessing.Pool(jobs)
+            results = pool.imap_unordered(_process_task, tasks, chunksize=chunksize)
+
+        for row, error in results:
+            if error is not None:
+                failed.append((row["file"], error))
+                print(f"Failed: {row['file']}: {error}", file=sys.stderr)
+                row["error"] = error
+            write_row(row)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if f is not sys.stdout:
+            f.close()
+
+    return failed
+
+
 def run_cli():
     """
     OctaDist command-line interface (CLI).
@@ -139,6 +415,62 @@ For more details, please visit https://octadist.github.io.
     parser.add_argument(
         "-f", "--format", action="store_true", help="Show formatted output summary"
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        type=str,
+        nargs="+",
+        metavar="PATH",
+        help="Run batch mode over input files, directories, or glob patterns",
+    )
+    parser.add_argument(
+        "--file-list",
+        type=str,
+        metavar="LIST",
+        dest="file_list",
+        help="Run batch mode over input files listed in text file, one per line",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        metavar="OUTPUT",
+        help="Write batch results to OUTPUT, either .csv or .jsonl, or .parquet, .arrow, "
+        ".h5, or .npz with octahedron coordinates. Default to CSV on stdout",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=None,
+        help="Number of worker processes in batch mode. Default to number of CPUs",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        metavar="N",
+        default=16,
+        help="Number of files sent to a worker at a time in batch mode. Default to 16",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Reuse results of unchanged inputs from cache file PATH. "
+        "Default to $OCTADIST_CACHE or ~/.cache/octadist/results.sqlite",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        metavar="MB",
+        dest="cache_size",
+        default=256,
+        help="Maximum size of the cache file in MB, least recently used results are evicted. "
+        "Default to 256",
+    )
     # octahedron parameters
     parser.add_argument(
         "-r",
@@ -218,9 +550,48 @@ For more details, please visit https://octadist.github.io.
 
     # in case GUI is requested
     if args.gui:
+        # Tkinter and the drawing backends are only needed for the GUI
+        from .octadist_gui import run_gui
+
         run_gui()
         sys.exit(1)
 
+    cache_path = None
+    cache_size = int(args.cache_size * 1024 * 1024)
+    if args.cache is not None:
+        from octadist.src.cache import default_cache_path
+
+        cache_path = args.cache or default_cache_path()
+
+    # batch mode
+    if args.batch or args.file_list:
+        files = collect_files(args.batch, args.file_list)
+        if not files:
+            print("No input file found")
+            sys.exit(1)
+
+        try:
+            failed = run_batch(
+                files,
+                args.ref_index,
+                args.cutoff,
+                args.par,
+                args.output,
+                args.jobs,
+                args.chunksize,
+                cache_path,
+                cache_size,
+            )
+        except (ImportError, OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+
+        print(f"Processed {len(files)} files, {len(failed)} failed", file=sys.stderr)
+        for file, error in failed:
+            print(f"  {file}: {error}", file=sys.stderr)
+
+        sys.exit(1 if failed else 0)
+
     atom_coord = {}
     computed = {}
 
@@ -231,7 +602,15 @@ For more details, please visit https://octadist.github.io.
     # check if file is correct
     file = check_file(args.inp)
     atom, coord = find_coord(file)
-    atom, coord = extract_octa(atom, coord, args.ref_index, args.cutoff)
+    if cache_path is not None:
+        from octadist.src.cache import ResultCache, calc_octa_cached
+
+        with ResultCache(cache_path, cache_size) as cache:
+            atom, coord, computed = calc_octa_cached(
+                atom, coord, args.ref_index, args.cutoff, cache
+            )
+    else:
+        atom, coord = extract_octa(atom, coord, args.ref_index, args.cutoff)
     if len(atom) < 7:
         print(
             "Extracted octahedron is incomplete. Please adjust cutoff distance, e.g., increase the value, to fix the issue."
@@ -239,7 +618,11 @@ For more details, please visit https://octadist.github.io.
         sys.exit(1)
 
     atom_coord = {"atom": atom, "coord": coord}
-    computed = calc_param(coord)
+    if cache_path is not None:
+        params = args.par or ["zeta", "delta", "sigma", "theta"]
+        computed = {p: computed[p] for p in params}
+    else:
+        computed = calc_param(coord, args.par)
 
     # get only basename of file from path
     basename = os.path.basename(args.inp)
@@ -0,0 +1,414 @@
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+import octadist
+from octadist.src import calc, io
+
+# Parameters stored for every cached octahedron, see calc.CalcDistortion
+PARAMETERS = [
+    "d_mean",
+    "zeta",
+    "delta",
+    "sigma",
+    "theta",
+    "theta_min",
+    "theta_max",
+    "oct_vol",
+    "non_octa",
+]
+
+# Default size limit of the cache file, in bytes
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    total INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+BEGIN
+    UPDATE meta SET total = total + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+BEGIN
+    UPDATE meta SET total = total - OLD.size;
+END;
+"""
+
+
+def default_cache_path():
+    """
+    Return the default location of the result cache.
+
+    The path is taken from the ``OCTADIST_CACHE`` environment variable if set,
+    otherwise it is ``octadist/results.sqlite`` in ``$XDG_CACHE_HOME`` or ``~/.cache``.
+
+    Returns
+    -------
+    path : str
+        Path of the cache file.
+
+    """
+    path = os.environ.get("OCTADIST_CACHE")
+    if path:
+        return path
+
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(root, "octadist", "results.sqlite")
+
+
+def cache_key(atom, coord, ref_index=0, cutoff_ref_ligand=2.8):
+    """
+    Hash the input of one octahedron search into a cache key.
+
+    The key covers the atomic labels, the coordinates as float64, the index of
+    the center atom, the cutoff distance and the OctaDist version, so that results
+    of an older version are never returned.
+
+    Parameters
+    ----------
+    atom : list
+        Full atomic labels of complex.
+    coord : array_like
+        Full atomic coordinates of complex.
+    ref_index : int, optional
+        Index of the reference center atom. Default is 0.
+    cutoff_ref_ligand : float, optional
+        Cutoff distance for screening bond distance between reference and ligand atoms.
+        Default is 2.8.
+
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-256 digest.
+
+    """
+    coord = np.ascontiguousarray(coord, dtype=np.float64)
+
+    h = hashlib.sha256()
+    h.update(octadist.__version__.encode())
+    h.update(b"\0" + "\0".join(map(str, atom)).encode())
+    h.update(b"\0" + str(coord.shape).encode())
+    h.update(coord.tobytes())
+    h.update(f"\0{int(ref_index)}\0{float(cutoff_ref_ligand)!r}".encode())
+
+    return h.hexdigest()
+
+
+def octa_key(coord_octa):
+    """
+    Hash the coordinates of an extracted octahedron into a cache key.
+
+    Distortion parameters depend on the seven coordinates only, so this key is
+    used for octahedra that have already been extracted from their complex.
+
+    Parameters
+    ----------
+    coord_octa : array_like
+        Atomic coordinates of octahedral structure, shape (7, 3).
+
+    Returns
+    -------
+    key : str
+        Hexadecimal SHA-256 digest.
+
+    """
+    coord_octa = np.ascontiguousarray(coord_octa, dtype=np.float64)
+
+    h = hashlib.sha256()
+    h.update(octadist.__version__.encode())
+    h.update(b"\0octahedron\0" + str(coord_octa.shape).encode())
+    h.update(coord_octa.tobytes())
+
+    return h.hexdigest()
+
+
+def _calc_params(coord_octa):
+    """
+    Compute all parameters listed in :data:`PARAMETERS` as plain Python values.
+
+    """
+    dist = calc.CalcDistortion(coord_octa)
+    params = {k: float(getattr(dist, k)) for k in PARAMETERS}
+    params["non_octa"] = bool(dist.non_octa)
+
+    return params
+
+
+class ResultCache:
+    """
+    Persistent cache of extracted octahedra and their distortion parameters.
+
+    Entries are stored as JSON in an SQLite database keyed by :func:`cache_key`.
+    When the total size of the entries exceeds ``max_size``, the least recently
+    used entries are evicted. The database can be shared by several processes.
+
+    Parameters
+    ----------
+    path : str, optional
+        Cache file. If None, use :func:`default_cache_path`. Default is None.
+    max_size : int, optional
+        Maximum total size of the cached entries, in bytes.
+        Default is 256 MB.
+
+    Examples
+    --------
+    >>> with ResultCache("results.sqlite") as cache:
+    ...     atom_octa, coord_octa, params = calc_octa_cached(atom, coord, cache=cache)
+    >>> params["zeta"]
+    0.22807256171728651
+
+    """
+
+    def __init__(self, path=None, max_size=DEFAULT_MAX_SIZE):
+        if path is None:
+            path = default_cache_path()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_size = max_size
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key):
+        row = self.conn.execute("SELECT 1 FROM results WHERE key = ?", (key,))
+        return row.fetchone() is not None
+
+    @property
+    def size(self):
+        """
+        Total size of the cached entries, in bytes.
+
+        """
+        return self.conn.execute("SELECT total FROM meta").fetchone()[0]
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+
+        Returns
+        -------
+        value : dict or None
+            Cached entry, or None if the key is not in the cache.
+
+        """
+        row = self.conn.execute(
+            "SELECT value FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        self.conn.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+        )
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        """
+        Store an entry, evicting least recently used entries if the cache is full.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+        value : dict
+            JSON serializable entry.
+
+        """
+        value = json.dumps(value, separators=(",", ":"))
+        size = len(key) + len(value)
+
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # Delete and insert separately so that the size triggers both fire
+            self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.conn.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_size.
+
+        """
+        excess = self.size - self.max_size
+        if excess <= 0:
+            return
+
+        stale = []
+        rows = self.conn.execute("SELECT key, size FROM results ORDER BY accessed")
+        for key, size in rows:
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.conn.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def clear(self):
+        """
+        Delete all entries.
+
+        """
+        self.conn.execute("DELETE FROM results")
+
+    def close(self):
+        """
+        Close the database connection.
+
+        """
+        self.conn.close()
+
+
+def calc_octa_cached(atom, coord, ref_index=0, cutoff_ref_ligand=2.8, cache=None):
+    """
+    Extract the octahedron around a center atom and compute all its parameters,
+    reusing the result of an earlier run with the same input if there is one.
+
+    Parameters
+    ----------
+    atom : list
+        Full atomic labels of complex.
+    coord : array_like
+        Full atomic coordinates of complex.
+    ref_index : int, optional
+        Index of the reference center atom. Default is 0.
+    cutoff_ref_ligand : float, optional
+        Cutoff distance for screening bond distance between reference and ligand atoms.
+        Default is 2.8.
+    cache : ResultCache, optional
+        Result cache. If None, the result is computed and not stored.
+        Default is None.
+
+    Returns
+    -------
+    atom_octa : list
+        Atomic labels of octahedral structure.
+    coord_octa : ndarray
+        Atomic coordinates of octahedral structure.
+    params : dict
+        All parameters listed in :data:`PARAMETERS`, or an empty dict if the
+        extracted octahedron is incomplete.
+
+    See Also
+    --------
+    octadist.src.io.extract_octa :
+        Extract octahedral structure from complex.
+    octadist.src.calc.CalcDistortion :
+        Calculate octahedral distortion parameters.
+
+    """
+    key = None
+    if cache is not None:
+        key = cache_key(atom, coord, ref_index, cutoff_ref_ligand)
+        value = cache.get(key)
+        if value is not None:
+            coord_octa = np.asarray(value["coord_octa"], dtype=np.float64)
+            return value["atom_octa"], coord_octa, value["params"]
+
+    atom_octa, coord_octa = io.extract_octa(atom, coord, ref_index, cutoff_ref_ligand)
+
+    params = {}
+    if len(atom_octa) == 7:
+        params = _calc_params(coord_octa)
+
+    if cache is not None:
+        value = {
+            "atom_octa": list(atom_octa),
+            "coord_octa": coord_octa.tolist(),
+            "params": params,
+        }
+        cache.put(key, value)
+
+    return atom_octa, coord_octa, params
+
+
+def calc_params_cached(coord_octa, cache=None):
+    """
+    Compute all parameters of an octahedron that has already been extracted,
+    reusing the result of an earlier run with the same coordinates if there is one.
+
+    Unlike :func:`calc_octa_cached`, the octahedron is not searched again in its
+    complex, and the key is :func:`octa_key` of its coordinates.
+
+    Parameters
+    ----------
+    coord_octa : array_like
+        Atomic coordinates of octahedral structure, shape (7, 3).
+    cache : ResultCache, optional
+        Result cache. If None, the parameters are computed and not stored.
+        Default is None.
+
+    Returns
+    -------
+    params : dict
+        All parameters listed in :data:`PARAMETERS`.
+
+    See Also
+    --------
+    octadist.src.calc.CalcDistortion :
+        Calculate octahedral distortion parameters.
+
+    """
+    if cache is None:
+        return _calc_params(coord_octa)
+
+    key = octa_key(coord_octa)
+    value = cache.get(key)
+    if value is not None:
+        return value["params"]
+
+    params = _calc_params(coord_octa)
+    cache.put(key, {"params": params})
+
+    return params
@@ -14,12 +14,230 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import itertools
+
 import numpy as np
-from scipy.spatial import distance
-from scipy.spatial import ConvexHull
 
 from octadist.src import linear, plane, projection
 
+# Ligand pairs (i, j) with i < j, in the order of the loop in CalcDistortion.calc_bond_angle
+_PAIR_FIRST, _PAIR_SECOND = np.triu_indices(6, k=1)
+
+# Vector pairs of the six individual theta angles, see CalcDistortion.calc_theta
+_THETA_FIRST = np.array([0, 3, 1, 4, 2, 5])
+_THETA_SECOND = np.array([3, 1, 4, 2, 5, 0])
+
+# Ligand permutations used to walk over the eight faces, see CalcDistortion.calc_theta
+_NEXT_FACE = np.array([0, 3, 1, 5, 4, 2])
+_OPPOSITE_FACE = np.array([4, 5, 3, 2, 0, 1])
+
+
+def _walk_faces():
+    """
+    Ligand order of the eight faces, in the order they are visited: the face
+    N1N2N3 is turned to N1N4N2, N1N6N4 and N1N3N6, then the same is done from
+    the opposite face. The first three ligands of each row form the face and
+    the last three form the opposite face.
+
+    """
+    order = np.arange(6)
+    faces = []
+    for r in range(8):
+        faces.append(order)
+        order = order[_NEXT_FACE]
+        if r == 3:
+            order = order[_OPPOSITE_FACE]
+
+    return np.array(faces)
+
+
+_FACE_ORDER = _walk_faces()
+
+# All 20 triangles of ligand atoms and, for each, the 3 ligands not in it
+_TRIANGLES = np.array(list(itertools.combinations(range(6), 3)))
+_TRIANGLE_OTHERS = np.array(
+    [[i for i in range(6) if i not in triangle] for triangle in _TRIANGLES]
+)
+
+
+class _LazyParameter:
+    """
+    Attribute computed on first access by calling the ``calc_*`` method that sets it.
+
+    The method stores the value in the instance ``__dict__``, which then shadows this
+    descriptor, so the value is computed once and later lookups are plain attribute
+    access. Calling the ``calc_*`` method again recomputes and overwrites the value.
+
+    """
+
+    def __init__(self, method):
+        self.method = method
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.__doc__ = f"Computed on first access by :meth:`{self.method}`."
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        getattr(obj, self.method)()
+
+        return obj.__dict__[self.name]
+
+
+def _eight_theta(coord_metal, coord_lig):
+    """
+    Sum of the six individual twisting angles of each of the eight faces,
+    see :meth:`CalcDistortion.calc_theta`.
+
+    All faces and all octahedra of a stack are handled in one pass.
+
+    Parameters
+    ----------
+    coord_metal : array_like
+        Coordinate of metal atom, shape (..., 3).
+    coord_lig : array_like
+        Coordinates of ligand atoms ordered by :meth:`CalcDistortion.determine_faces`,
+        shape (..., 6, 3).
+
+    Returns
+    -------
+    eight_theta : array_like
+        Theta of the eight faces, shape (..., 8).
+    eq_of_plane : array_like
+        Coefficients a, b, c and d of the plane of the eight faces, shape (..., 8, 4).
+
+    """
+    # (..., 8, 6, 3): the ligands reordered for each face
+    lig = coord_lig[..., _FACE_ORDER, :]
+    metal = np.broadcast_to(
+        coord_metal[..., np.newaxis, np.newaxis, :], lig.shape[:-2] + (1, 3)
+    )
+
+    # Plane of the face
+    a, b, c, d = plane.find_eq_of_plane(lig[..., 0, :], lig[..., 1, :], lig[..., 2, :])
+
+    # Project metal and the three ligands of the opposite face onto the plane
+    points = np.concatenate([metal, lig[..., 3:, :]], axis=-2)
+    projected = projection.project_atom_onto_plane(
+        points, *(x[..., np.newaxis] for x in (a, b, c, d))
+    )
+
+    projected_m = projected[..., :1, :]
+    vector_theta = np.concatenate(
+        [lig[..., :3, :] - projected_m, projected[..., 1:, :] - projected_m], axis=-2
+    )
+
+    # Check if the direction is CW or CCW
+    v0, v1, v2 = np.moveaxis(vector_theta[..., :3, :], -2, 0)
+    a12 = linear.angle_btw_vectors(v0, v1)
+    a13 = linear.angle_btw_vectors(v0, v2)
+    direction = np.where(
+        (a12 < a13)[..., np.newaxis], np.cross(v0, v1), np.cross(v2, v0)
+    )
+
+    # Six individual theta angles of each face
+    indi_theta = linear.angle_sign(
+        vector_theta[..., _THETA_FIRST, :],
+        vector_theta[..., _THETA_SECOND, :],
+        direction[..., np.newaxis, :],
+    )
+    eight_theta = np.sum(np.abs(indi_theta - 60), axis=-1)
+    eq_of_plane = np.stack([a, b, c, d], axis=-1)
+
+    return eight_theta, eq_of_plane
+
+
+def calc_octa_volume(coord, method="analytic"):
+    """
+    Calculate the volume of octahedra and return value in cubic Angstrom.
+
+    The volume is that of the convex hull of the six ligand atoms. With the analytic
+    method, a triangle of ligands is a face of the hull if the other three ligands lie
+    on one side of it. Each face is oriented outward and the volume is the sum of the
+    signed tetrahedra spanned by the metal atom and the faces, so it is exact even if
+    the metal atom is off-center. All octahedra of a stack are handled in one pass.
+
+    Parameters
+    ----------
+    coord : array_like
+        Atomic coordinates of octahedral structure, shape (7, 3),
+        or a stack of octahedral structures, shape (N, 7, 3).
+    method : {"analytic", "qhull"}, optional
+        If "qhull", build a :class:`scipy.spatial.ConvexHull` for each octahedron
+        instead, which is slower and only meant to validate the analytic result.
+        Default is "analytic".
+
+    Returns
+    -------
+    vol : float or array_like
+        Volume of the octahedron, or array of volumes of shape (N,) for a stack.
+        Degenerate (flat) octahedra have zero volume.
+
+    Examples
+    --------
+    >>> coord = [[2.298354000, 5.161785000, 7.971898000],
+                 [1.885657000, 4.804777000, 6.183726000],
+                 [1.747515000, 6.960963000, 7.932784000],
+                 [4.094380000, 5.807257000, 7.588689000],
+                 [0.539005000, 4.482809000, 8.460004000],
+                 [2.812425000, 3.266553000, 8.131637000],
+                 [2.886404000, 5.392925000, 9.848966000]]
+    >>> calc_octa_volume(coord)
+    9.538645375665253
+
+    """
+    coord = np.asarray(coord, dtype=np.float64)
+    single = coord.ndim == 2
+    if single:
+        coord = coord[np.newaxis]
+
+    if method == "qhull":
+        from scipy.spatial import ConvexHull, QhullError
+
+        vol = np.zeros(len(coord))
+        for i in range(len(coord)):
+            try:
+                vol[i] = ConvexHull(coord[i, 1:]).volume
+            except QhullError:
+                pass
+    elif method == "analytic":
+        coord_metal = coord[:, 0]
+        coord_lig = coord[:, 1:]
+
+        vert = coord_lig[:, _TRIANGLES]
+        normal = np.cross(vert[:, :, 1] - vert[:, :, 0], vert[:, :, 2] - vert[:, :, 0])
+        area = np.linalg.norm(normal, axis=2)
+
+        # Signed distance of the other three ligands from each triangle
+        others = coord_lig[:, _TRIANGLE_OTHERS] - vert[:, :, :1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            side = (
+                np.sum(normal[:, :, np.newaxis] * others, axis=3)
+                / area[:, :, np.newaxis]
+            )
+
+        coplanar = np.abs(side) <= 1e-6
+        is_face = np.all(side <= 1e-6, axis=2) | np.all(side >= -1e-6, axis=2)
+
+        # Outward orientation puts the other ligands behind the face.
+        # A planar quadrilateral face is covered twice by its four triangles.
+        orient = -np.sign(np.sum(np.where(coplanar, 0, side), axis=2))
+        weight = np.where(is_face, orient / (1 + np.sum(coplanar, axis=2)), 0)
+
+        tetra_vol = np.sum(
+            normal * (vert[:, :, 0] - coord_metal[:, np.newaxis]), axis=2
+        )
+        vol = np.abs(np.sum(weight * tetra_vol, axis=1)) / 6
+    else:
+        raise ValueError(f"unknown method for octahedron volume: {method}")
+
+    if single:
+        return vol[0]
+
+    return vol
+
 
 class CalcDistortion:
     """
@@ -41,6 +259,12 @@ class CalcDistortion:
     coord : array_like
         Atomic coordinates of octahedral structure.
 
+    Notes
+    -----
+    Parameters are computed lazily: each attribute is evaluated on first access
+    together with only the parameters it depends on, and is cached afterwards.
+    For example, accessing ``zeta`` never runs the Theta projection or the volume.
+
     Examples
     --------
     >>> coord = [[2.298354000, 5.161785000, 7.971898000],  # <- Metal atom
@@ -56,6 +280,22 @@ class CalcDistortion:
 
     """
 
+    bond_dist = _LazyParameter("calc_d_bond")
+    d_mean = _LazyParameter("calc_d_mean")
+    cis_angle = _LazyParameter("calc_bond_angle")
+    trans_angle = _LazyParameter("calc_bond_angle")
+    diff_dist = _LazyParameter("calc_zeta")
+    zeta = _LazyParameter("calc_zeta")
+    delta = _LazyParameter("calc_delta")
+    sigma = _LazyParameter("calc_sigma")
+    non_octa = _LazyParameter("determine_faces")
+    eight_theta = _LazyParameter("calc_theta")
+    eq_of_plane = _LazyParameter("calc_theta")
+    theta = _LazyParameter("calc_theta")
+    theta_min = _LazyParameter("calc_theta_min")
+    theta_max = _LazyParameter("calc_theta_max")
+    oct_vol = _LazyParameter("calc_vol")
+
     def __init__(self, coord):
         self.coord = coord
 
@@ -64,32 +304,13 @@ class CalcDistortion:
         else:
             self.coord = np.asarray(self.coord, dtype=np.float64)
 
-        self.bond_dist = []
-        self.d_mean = 0
-        self.diff_dist = []
-        self.zeta = 0
-        self.delta = 0
-        self.cis_angle = 0
-        self.trans_angle = 0
-        self.sigma = 0
-        self.eight_theta = []
-        self.theta = 0
-        self.theta_min = 0
-        self.theta_max = 0
-        self.eq_of_plane = []
-        self.non_octa = False
-        self.vol_octa = 0
-
-        self.calc_d_bond()
-        self.calc_d_mean()
-        self.calc_bond_angle()
-        self.calc_zeta()
-        self.calc_delta()
-        self.calc_sigma()
-        self.calc_theta()
-        self.calc_theta_min()
-        self.calc_theta_max()
-        self.calc_vol()
+    @property
+    def vol_octa(self):
+        """
+        Alias of :attr:`oct_vol`.
+
+        """
+        return self.oct_vol
 
     def calc_d_bond(self):
         """
@@ -101,10 +322,7 @@ class CalcDistortion:
             Calculate mean metal-ligand bond length.
 
         """
-        self.bond_dist = [
-            distance.euclidean(self.coord[0], self.coord[i]) for i in range(1, 7)
-        ]
-        self.bond_dist = np.asarray(self.bond_dist, dtype=np.float64)
+        self.bond_dist = np.linalg.norm(self.coord[1:] - self.coord[0], axis=1)
 
     def calc_d_mean(self):
         """
@@ -251,7 +469,7 @@ class CalcDistortion:
         """
         # Metal and ligand atoms
         coord_metal = self.coord[0]
-        ligands = self.coord[1:]
+        ligands = self.coord[1:].copy()
         coord_lig = np.array([self.coord[i] for i in range(1, 7)])
 
         # Find vector from metal to ligand atoms
@@ -260,6 +478,8 @@ class CalcDistortion:
         # Find maximum angle
         max_angle = self.trans_angle[0]
 
+        non_octa = False
+
         # Identify which N is in line with ligand 1
         def_change = 6
         for n in range(6):
@@ -277,7 +497,7 @@ class CalcDistortion:
 
         # Check if the structure is octahedron or not
         if def_change != new_change:
-            self.non_octa = True
+            non_octa = True
             def_change = new_change
 
         # Swap ligand
@@ -302,7 +522,7 @@ class CalcDistortion:
                 new_change = n
 
         if def_change != new_change:
-            self.non_octa = True
+            non_octa = True
             def_change = new_change
 
         # Swap ligand
@@ -325,7 +545,7 @@ class CalcDistortion:
                 new_change = n
 
         if def_change != new_change:
-            self.non_octa = True
+            non_octa = True
             def_change = new_change
 
         # Swap ligand
@@ -334,6 +554,8 @@ class CalcDistortion:
         # New atom order
         coord_lig = np.array([ligands[i] for i in range(6)])
 
+        self.non_octa = non_octa
+
         return coord_metal, coord_lig
 
     def calc_theta(self):
@@ -366,78 +588,10 @@ class CalcDistortion:
         # Get refined atomic coordinates
         coord_metal, coord_lig = self.determine_faces()
 
-        # loop over 8 faces
-        for r in range(8):
-            a, b, c, d = plane.find_eq_of_plane(
-                coord_lig[0], coord_lig[1], coord_lig[2]
-            )
-            self.eq_of_plane.append([a, b, c, d])
-
-            # Project metal and other three ligand atom onto the plane
-            projected_m = projection.project_atom_onto_plane(coord_metal, a, b, c, d)
-            projected_lig4 = projection.project_atom_onto_plane(
-                coord_lig[3], a, b, c, d
-            )
-            projected_lig5 = projection.project_atom_onto_plane(
-                coord_lig[4], a, b, c, d
-            )
-            projected_lig6 = projection.project_atom_onto_plane(
-                coord_lig[5], a, b, c, d
-            )
-
-            # Find the vectors between atoms that are on the same plane
-            # These vectors will be used to calculate Theta afterward.
-            vector_theta = np.array(
-                [
-                    coord_lig[0] - projected_m,
-                    coord_lig[1] - projected_m,
-                    coord_lig[2] - projected_m,
-                    projected_lig4 - projected_m,
-                    projected_lig5 - projected_m,
-                    projected_lig6 - projected_m,
-                ]
-            )
-
-            # Check if the direction is CW or CCW
-            a12 = linear.angle_btw_vectors(vector_theta[0], vector_theta[1])
-            a13 = linear.angle_btw_vectors(vector_theta[0], vector_theta[2])
-
-            # If angle of interest is smaller than its neighbor,
-            # define it as CW direction, if not, it will be CCW instead.
-            if a12 < a13:
-                direction = np.cross(vector_theta[0], vector_theta[1])
-            else:
-                direction = np.cross(vector_theta[2], vector_theta[0])
-
-            # Calculate individual theta angle
-            theta1 = linear.angle_sign(vector_theta[0], vector_theta[3], direction)
-            theta2 = linear.angle_sign(vector_theta[3], vector_theta[1], direction)
-            theta3 = linear.angle_sign(vector_theta[1], vector_theta[4], direction)
-            theta4 = linear.angle_sign(vector_theta[4], vector_theta[2], direction)
-            theta5 = linear.angle_sign(vector_theta[2], vector_theta[5], direction)
-            theta6 = linear.angle_sign(vector_theta[5], vector_theta[0], direction)
-
-            indi_theta = np.array([theta1, theta2, theta3, theta4, theta5, theta6])
-
-            self.eight_theta.append(sum(abs(indi_theta - 60)))
-
-            # Use deep copy so as to avoid pass by reference
-            tmp = coord_lig[1].copy()
-            coord_lig[1] = coord_lig[3].copy()
-            coord_lig[3] = coord_lig[5].copy()
-            coord_lig[5] = coord_lig[2].copy()
-            coord_lig[2] = tmp.copy()
-
-            # If 3rd round, permutation face will be switched
-            # from N1N2N3
-            # to N1N4N2,
-            # to N1N6N4,
-            # to N1N3N6, and then back to N1N2N3
-            if r == 3:
-                coord_lig[[0, 4]] = coord_lig[[4, 0]]
-                coord_lig[[1, 5]] = coord_lig[[5, 1]]
-                coord_lig[[2, 3]] = coord_lig[[3, 2]]
+        eight_theta, eq_of_plane = _eight_theta(coord_metal, coord_lig)
 
+        self.eight_theta = eight_theta.tolist()
+        self.eq_of_plane = eq_of_plane.tolist()
         self.theta = sum(self.eight_theta) / 2
 
     def calc_theta_min(self):
@@ -466,25 +620,276 @@ class CalcDistortion:
         sorted_theta = sorted(self.eight_theta)
         self.theta_max = sum(sorted_theta[i] for i in range(4, 8))
 
-    def calc_vol(self):
+    def calc_vol(self, method="analytic"):
         """
         Calculate the octahedron volume and return value in cubic Angstrom.
 
+        Parameters
+        ----------
+        method : {"analytic", "qhull"}, optional
+            Method used to compute the volume, see :func:`calc_octa_volume`.
+            Default is "analytic".
+
+        See Also
+        --------
+        calc_octa_volume :
+            Calculate the volume of octahedra.
+
+        """
+        vol = calc_octa_volume(self.coord, method)
+
+        self.oct_vol = round(float(vol), 2)
+
+
+class CalcDistortionBatch:
+    """
+    Calculate octahedral distortion parameters of many octahedra at once.
+
+    This is the array counterpart of :class:`CalcDistortion`. The octahedra are stacked
+    into one array and each parameter is computed for the whole stack with NumPy
+    broadcasting, so every attribute holds one value (or one row) per octahedron.
+    :class:`CalcDistortion` remains the reference implementation.
+
+    - Bond distance : :meth:`calc_d_bond`
+    - Mean bond distance : :meth:`calc_d_mean`
+    - Bond angle around metal center atom : :meth:`calc_bond_angle`
+    - zeta parameter : :meth:`calc_zeta`
+    - Delta parameter : :meth:`calc_delta`
+    - Sigma parameter : :meth:`calc_sigma`
+    - Minimum Tehta parameter : :meth:`calc_theta_min`
+    - Maximum Theta parameter : :meth:`calc_theta_max`
+    - Mean Theta parametes : :meth:`calc_theta`
+    - Volume : :meth:`calc_vol`
+
+    Parameters
+    ----------
+    coord : array_like
+        Atomic coordinates of octahedral structures, shape (N, 7, 3).
+        The first atom of each octahedron must be the metal center atom.
+        A single (7, 3) octahedron is treated as a stack of one.
+
+    Notes
+    -----
+    As with :class:`CalcDistortion`, parameters are computed lazily on first access.
+
+    See Also
+    --------
+    CalcDistortion :
+        Calculate distortion parameters of one octahedron.
+
+    Examples
+    --------
+    >>> coord = [[[2.298354000, 5.161785000, 7.971898000],  # <- Metal atom
+                  [1.885657000, 4.804777000, 6.183726000],
+                  [1.747515000, 6.960963000, 7.932784000],
+                  [4.094380000, 5.807257000, 7.588689000],
+                  [0.539005000, 4.482809000, 8.460004000],
+                  [2.812425000, 3.266553000, 8.131637000],
+                  [2.886404000, 5.392925000, 9.848966000]]]
+    >>> test = CalcDistortionBatch(coord)
+    >>> test.sigma
+    array([47.92652838])
+
+    """
+
+    bond_dist = _LazyParameter("calc_d_bond")
+    d_mean = _LazyParameter("calc_d_mean")
+    cis_angle = _LazyParameter("calc_bond_angle")
+    trans_angle = _LazyParameter("calc_bond_angle")
+    diff_dist = _LazyParameter("calc_zeta")
+    zeta = _LazyParameter("calc_zeta")
+    delta = _LazyParameter("calc_delta")
+    sigma = _LazyParameter("calc_sigma")
+    non_octa = _LazyParameter("determine_faces")
+    eight_theta = _LazyParameter("calc_theta")
+    eq_of_plane = _LazyParameter("calc_theta")
+    theta = _LazyParameter("calc_theta")
+    theta_min = _LazyParameter("calc_theta_min")
+    theta_max = _LazyParameter("calc_theta_max")
+    oct_vol = _LazyParameter("calc_vol")
+
+    def __init__(self, coord):
+        self.coord = np.asarray(coord, dtype=np.float64)
+
+        if self.coord.ndim == 2:
+            self.coord = self.coord[np.newaxis]
+
+        if self.coord.ndim != 3 or self.coord.shape[1:] != (7, 3):
+            raise ValueError(
+                "coordinates of octahedral structures must have shape (N, 7, 3)"
+            )
+
+    def calc_d_bond(self):
+        """
+        Calculate metal-ligand bond distances, shape (N, 6), in Angstrom.
+
+        """
+        metal_to_lig = self.coord[:, 1:] - self.coord[:, :1]
+        self.bond_dist = np.sqrt(np.sum(metal_to_lig * metal_to_lig, axis=2))
+
+    def calc_d_mean(self):
+        """
+        Calculate mean metal-ligand bond distances in Angstrom.
+
+        """
+        self.d_mean = np.mean(self.bond_dist, axis=1)
+
+    def calc_bond_angle(self):
+        """
+        Calculate 12 cis and 3 trans unique angles of each octahedron.
+
+        """
+        metal_to_lig = self.coord[:, 1:] - self.coord[:, :1]
+        all_angle = linear.angle_btw_vectors(
+            metal_to_lig[:, _PAIR_FIRST], metal_to_lig[:, _PAIR_SECOND]
+        )
+
+        # Sort the angle from the lowest to the highest
+        sorted_angle = np.sort(all_angle, axis=1)
+        self.cis_angle = sorted_angle[:, :12]
+        self.trans_angle = sorted_angle[:, 12:]
+
+    def calc_zeta(self):
+        """
+        Calculate zeta parameter in Angstrom.
+
+        See Also
+        --------
+        CalcDistortion.calc_zeta :
+            Reference implementation for one octahedron.
+
+        """
+        self.diff_dist = np.abs(self.bond_dist - self.d_mean[:, np.newaxis])
+        self.zeta = np.sum(self.diff_dist, axis=1)
+
+    def calc_delta(self):
         """
-        try:
-            points = np.array(
-                [
-                    self.coord[1],
-                    self.coord[2],
-                    self.coord[3],
-                    self.coord[4],
-                    self.coord[5],
-                    self.coord[6],
-                ]
+        Calculate Delta parameter.
+
+        See Also
+        --------
+        CalcDistortion.calc_delta :
+            Reference implementation for one octahedron.
+
+        """
+        rel_diff = (self.bond_dist - self.d_mean[:, np.newaxis]) / self.d_mean[
+            :, np.newaxis
+        ]
+        self.delta = np.sum(rel_diff * rel_diff, axis=1) / 6
+
+    def calc_sigma(self):
+        """
+        Calculate Sigma parameter in degree.
+
+        See Also
+        --------
+        CalcDistortion.calc_sigma :
+            Reference implementation for one octahedron.
+
+        """
+        self.sigma = np.sum(np.abs(90.0 - self.cis_angle), axis=1)
+
+    def determine_faces(self):
+        """
+        Refine the order of ligand atoms of all octahedra in the same way as
+        :meth:`CalcDistortion.determine_faces`: after refinement, the ligand pairs
+        (1, 5), (2, 6) and (3, 4) are trans to each other.
+
+        Returns
+        -------
+        coord_metal : array_like
+            Coordinates of metal atoms, shape (N, 3).
+        coord_lig : array_like
+            Coordinates of ligand atoms, shape (N, 6, 3).
+
+        """
+        n_octa = len(self.coord)
+        rows = np.arange(n_octa)
+
+        coord_metal = self.coord[:, 0]
+        ligands = self.coord[:, 1:].copy()
+
+        # Find maximum angle
+        max_angle = self.trans_angle[:, 0]
+
+        non_octa = np.zeros(n_octa, dtype=bool)
+        def_change = np.full(n_octa, 6)
+
+        # Identify which N is in line with ligand 1, 2 and 3, and swap it
+        # into position 5, 6 and 4 respectively
+        for ref, target in ((0, 4), (1, 5), (2, 3)):
+            metal_to_lig = ligands - coord_metal[:, np.newaxis]
+            test = linear.angle_btw_vectors(
+                metal_to_lig[:, ref : ref + 1], metal_to_lig
             )
-            vol = ConvexHull(points).volume
-            vol = round(vol, 2)
-        except:
-            vol = 0
 
-        self.oct_vol = vol
+            # Last ligand whose angle passes the threshold, as the reference loop does
+            above = test > (max_angle - 1)[:, np.newaxis]
+            last_above = 5 - np.argmax(above[:, ::-1], axis=1)
+            def_change = np.where(np.any(above, axis=1), last_above, def_change)
+
+            new_change = np.argmax(test, axis=1)
+
+            # Check if the structure is octahedron or not
+            non_octa |= def_change != new_change
+            def_change = new_change
+
+            # Swap ligand
+            swap = ligands[rows, def_change].copy()
+            ligands[rows, def_change] = ligands[rows, target]
+            ligands[rows, target] = swap
+
+        self.non_octa = non_octa
+
+        return coord_metal, ligands
+
+    def calc_theta(self):
+        """
+        Calculate Theta parameter in degree.
+
+        See Also
+        --------
+        CalcDistortion.calc_theta :
+            Reference implementation for one octahedron.
+
+        """
+        # Get refined atomic coordinates
+        coord_metal, coord_lig = self.determine_faces()
+
+        eight_theta, eq_of_plane = _eight_theta(coord_metal, coord_lig)
+
+        self.eight_theta = eight_theta
+        self.eq_of_plane = eq_of_plane
+        # Sum from left to right, as CalcDistortion.calc_theta does
+        self.theta = np.add.accumulate(eight_theta, axis=1)[:, -1] / 2
+
+    def calc_theta_min(self):
+        """
+        Calculate minimum Theta parameter in degree.
+
+        """
+        sorted_theta = np.sort(self.eight_theta, axis=1)
+        self.theta_min = np.sum(sorted_theta[:, :4], axis=1)
+
+    def calc_theta_max(self):
+        """
+        Calculate maximum Theta parameter in degree.
+
+        """
+        sorted_theta = np.sort(self.eight_theta, axis=1)
+        self.theta_max = np.sum(sorted_theta[:, 4:], axis=1)
+
+    def calc_vol(self, method="analytic"):
+        """
+        Calculate the octahedron volumes in cubic Angstrom.
+
+        Parameters
+        ----------
+        method : {"analytic", "qhull"}, optional
+            Method used to compute the volume, see :func:`calc_octa_volume`.
+            Default is "analytic".
+
+        """
+        vol = calc_octa_volume(self.coord, method)
+
+        self.oct_vol = np.round(vol, 2)
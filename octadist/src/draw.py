@@ -443,9 +443,9 @@ class DrawComplex_Plotly:
         Add all atoms to show in figure.
 
         """
-        n = [elements.number_to_symbol(i) for i in self.atom]
-        s = [elements.number_to_radii(i) * 100 for i in n]
-        c = [elements.number_to_color(i) for i in n]
+        n = elements.symbols_to_numbers(self.atom)
+        s = (elements.numbers_to_radii(n) * 100).tolist()
+        c = elements.numbers_to_colors(n).tolist()
 
         marker_data = go.Scatter3d(
             x=self.coord[:, 0],
@@ -918,8 +918,12 @@ class DrawTwistingPlane:
                 label="Metal center",
             )
 
+            # Project the three opposite ligand atoms onto the reference face
+            all_proj_lig = projection.project_atom_onto_plane(
+                self.c_oppo[i], a, b, c, d
+            )
+
             # Reference atoms
-            all_proj_lig = []
             for j in range(3):
                 ax.scatter(
                     self.c_ref[i][j][0],
@@ -933,13 +937,8 @@ class DrawTwistingPlane:
                     label="Reference atom",
                 )
 
-                # Project ligand atom onto the reference face
-                proj_lig = projection.project_atom_onto_plane(
-                    self.c_oppo[i][j], a, b, c, d
-                )
-                all_proj_lig.append(proj_lig)
-
                 # Projected opposite atoms
+                proj_lig = all_proj_lig[j]
                 ax.scatter(
                     proj_lig[0],
                     proj_lig[1],
@@ -952,7 +951,7 @@ class DrawTwistingPlane:
                     label="Projected ligand atom",
                 )
 
-            self.all_proj_ligs.append(all_proj_lig)
+            self.all_proj_ligs.append(list(all_proj_lig))
 
             # Draw plane
             get_vertices = self.c_ref[i].tolist()
@@ -32,7 +32,7 @@ def number_to_symbol(x):
         If x is atomic number, return symbol.
 
     atom.index(i) : int
-        If x is symbol, return atomic number.
+        If x is symbol, return atomic number, or None if x is not a symbol.
 
     Examples
     --------
@@ -42,125 +42,10 @@ def number_to_symbol(x):
     'He'
 
     """
-    atoms = [
-        "0",
-        "H",
-        "He",
-        "Li",
-        "Be",
-        "B",
-        "C",
-        "N",
-        "O",
-        "F",
-        "Ne",
-        "Na",
-        "Mg",
-        "Al",
-        "Si",
-        "P",
-        "S",
-        "Cl",
-        "Ar",
-        "K",
-        "Ca",
-        "Sc",
-        "Ti",
-        "V",
-        "Cr",
-        "Mn",
-        "Fe",
-        "Co",
-        "Ni",
-        "Cu",
-        "Zn",
-        "Ga",
-        "Ge",
-        "As",
-        "Se",
-        "Br",
-        "Kr",
-        "Rb",
-        "Sr",
-        "Y",
-        "Zr",
-        "Nb",
-        "Mo",
-        "Tc",
-        "Ru",
-        "Rh",
-        "Pd",
-        "Ag",
-        "Cd",
-        "In",
-        "Sn",
-        "Sb",
-        "Te",
-        "I",
-        "Xe",
-        "Cs",
-        "Ba",
-        "La",
-        "Ce",
-        "Pr",
-        "Nd",
-        "Pm",
-        "Sm",
-        "Eu",
-        "Gd",
-        "Tb",
-        "Dy",
-        "Ho",
-        "Er",
-        "Tm",
-        "Yb",
-        "Lu",
-        "Hf",
-        "Ta",
-        "W",
-        "Re",
-        "Os",
-        "Ir",
-        "Pt",
-        "Au",
-        "Hg",
-        "Tl",
-        "Pb",
-        "Bi",
-        "Po",
-        "At",
-        "Rn",
-        "Fr",
-        "Ra",
-        "Ac",
-        "Th",
-        "Pa",
-        "U",
-        "Np",
-        "Pu",
-        "Am",
-        "Cm",
-        "Bk",
-        "Cf",
-        "Es",
-        "Fm",
-        "Md",
-        "No",
-        "Lr",
-        "Rf",
-        "Db",
-        "Sg",
-        "Bh",
-        "Hs",
-        "Mt",
-    ]
-
-    if isinstance(x, int):
-        return atoms[x]
+    if isinstance(x, (int, np.integer)):
+        return ATOMS[x]
     else:
-        for i in atoms:
-            if x == i:
-                return atoms.index(i)
+        return SYMBOL_TO_NUMBER.get(x)
 
 
 def number_to_radii(x):
@@ -183,136 +68,7 @@ def number_to_radii(x):
     0.93
 
     """
-    atom_radii = (
-        np.array(
-            [
-                0,
-                230,
-                930,
-                680,
-                350,
-                830,
-                680,
-                680,
-                680,
-                640,
-                1120,
-                970,
-                1100,
-                1350,
-                1200,
-                750,
-                1020,
-                990,
-                1570,
-                1330,
-                990,
-                1440,
-                1470,
-                1330,
-                1350,
-                1350,
-                1340,
-                1330,
-                1500,
-                1520,
-                1450,
-                1220,
-                1170,
-                1210,
-                1220,
-                1210,
-                1910,
-                1470,
-                1120,
-                1780,
-                1560,
-                1480,
-                1470,
-                1350,
-                1400,
-                1450,
-                1500,
-                1590,
-                1690,
-                1630,
-                1460,
-                1460,
-                1470,
-                1400,
-                1980,
-                1670,
-                1340,
-                1870,
-                1830,
-                1820,
-                1810,
-                1800,
-                1800,
-                1990,
-                1790,
-                1760,
-                1750,
-                1740,
-                1730,
-                1720,
-                1940,
-                1720,
-                1570,
-                1430,
-                1370,
-                1350,
-                1370,
-                1320,
-                1500,
-                1500,
-                1700,
-                1550,
-                1540,
-                1540,
-                1680,
-                1700,
-                2400,
-                2000,
-                1900,
-                1880,
-                1790,
-                1610,
-                1580,
-                1550,
-                1530,
-                1510,
-                1500,
-                1500,
-                1500,
-                1500,
-                1500,
-                1500,
-                1500,
-                1500,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-                1600,
-            ],
-            dtype=np.float32,
-        )
-        / 1000.0
-    )
-
-    return atom_radii[x]
+    return RADII[x]
 
 
 def number_to_color(x):
@@ -339,117 +95,519 @@ def number_to_color(x):
     '#D9FFFF'
 
     """
-    atom_color = [
-        "0",
-        "#FFFFFF",
-        "#D9FFFF",
-        "#CC80FF",
-        "#C2FF00",
-        "#FFB5B5",
-        "#909090",
-        "#3050F8",
-        "#FF0D0D",
-        "#90E050",
-        "#B3E3F5",
-        "#AB5CF2",
-        "#8AFF00",
-        "#BFA6A6",
-        "#F0C8A0",
-        "#FF8000",
-        "#FFFF30",
-        "#1FF01F",
-        "#80D1E3",
-        "#8F40D4",
-        "#3DFF00",
-        "#E6E6E6",
-        "#BFC2C7",
-        "#A6A6AB",
-        "#8A99C7",
-        "#9C7AC7",
-        "#E06633",
-        "#F090A0",
-        "#50D050",
-        "#C88033",
-        "#7D80B0",
-        "#C28F8F",
-        "#668F8F",
-        "#BD80E3",
-        "#FFA100",
-        "#A62929",
-        "#5CB8D1",
-        "#702EB0",
-        "#00FF00",
-        "#94FFFF",
-        "#94E0E0",
-        "#73C2C9",
-        "#54B5B5",
-        "#3B9E9E",
-        "#248F8F",
-        "#0A7D8C",
-        "#006985",
-        "#C0C0C0",
-        "#FFD98F",
-        "#A67573",
-        "#668080",
-        "#9E63B5",
-        "#D47A00",
-        "#940094",
-        "#429EB0",
-        "#57178F",
-        "#00C900",
-        "#70D4FF",
-        "#FFFFC7",
-        "#D9FFC7",
-        "#C7FFC7",
-        "#A3FFC7",
-        "#8FFFC7",
-        "#61FFC7",
-        "#45FFC7",
-        "#30FFC7",
-        "#1FFFC7",
-        "#00FF9C",
-        "#00E675",
-        "#00D452",
-        "#00BF38",
-        "#00AB24",
-        "#4DC2FF",
-        "#4DA6FF",
-        "#2194D6",
-        "#267DAB",
-        "#266696",
-        "#175487",
-        "#D0D0E0",
-        "#FFD123",
-        "#B8B8D0",
-        "#A6544D",
-        "#575961",
-        "#9E4FB5",
-        "#AB5C00",
-        "#754F45",
-        "#428296",
-        "#420066",
-        "#007D00",
-        "#70ABFA",
-        "#00BAFF",
-        "#00A1FF",
-        "#008FFF",
-        "#0080FF",
-        "#006BFF",
-        "#545CF2",
-        "#785CE3",
-        "#8A4FE3",
-        "#A136D4",
-        "#B31FD4",
-        "#B31FBA",
-        "#B30DA6",
-        "#BD0D87",
-        "#C70066",
-        "#CC0059",
-        "#D1004F",
-        "#D90045",
-        "#E00038",
-        "#E6002E",
-        "#EB0026",
-    ]
-
-    return atom_color[x]
+    return COLORS[x]
+
+
+# Atomic symbols, indexed by atomic number: 1-109
+ATOMS = (
+    "0",
+    "H",
+    "He",
+    "Li",
+    "Be",
+    "B",
+    "C",
+    "N",
+    "O",
+    "F",
+    "Ne",
+    "Na",
+    "Mg",
+    "Al",
+    "Si",
+    "P",
+    "S",
+    "Cl",
+    "Ar",
+    "K",
+    "Ca",
+    "Sc",
+    "Ti",
+    "V",
+    "Cr",
+    "Mn",
+    "Fe",
+    "Co",
+    "Ni",
+    "Cu",
+    "Zn",
+    "Ga",
+    "Ge",
+    "As",
+    "Se",
+    "Br",
+    "Kr",
+    "Rb",
+    "Sr",
+    "Y",
+    "Zr",
+    "Nb",
+    "Mo",
+    "Tc",
+    "Ru",
+    "Rh",
+    "Pd",
+    "Ag",
+    "Cd",
+    "In",
+    "Sn",
+    "Sb",
+    "Te",
+    "I",
+    "Xe",
+    "Cs",
+    "Ba",
+    "La",
+    "Ce",
+    "Pr",
+    "Nd",
+    "Pm",
+    "Sm",
+    "Eu",
+    "Gd",
+    "Tb",
+    "Dy",
+    "Ho",
+    "Er",
+    "Tm",
+    "Yb",
+    "Lu",
+    "Hf",
+    "Ta",
+    "W",
+    "Re",
+    "Os",
+    "Ir",
+    "Pt",
+    "Au",
+    "Hg",
+    "Tl",
+    "Pb",
+    "Bi",
+    "Po",
+    "At",
+    "Rn",
+    "Fr",
+    "Ra",
+    "Ac",
+    "Th",
+    "Pa",
+    "U",
+    "Np",
+    "Pu",
+    "Am",
+    "Cm",
+    "Bk",
+    "Cf",
+    "Es",
+    "Fm",
+    "Md",
+    "No",
+    "Lr",
+    "Rf",
+    "Db",
+    "Sg",
+    "Bh",
+    "Hs",
+    "Mt",
+)
+
+# Atomic radii in pm, indexed by atomic number: 1-119
+_RADII_PM = [
+    0,
+    230,
+    930,
+    680,
+    350,
+    830,
+    680,
+    680,
+    680,
+    640,
+    1120,
+    970,
+    1100,
+    1350,
+    1200,
+    750,
+    1020,
+    990,
+    1570,
+    1330,
+    990,
+    1440,
+    1470,
+    1330,
+    1350,
+    1350,
+    1340,
+    1330,
+    1500,
+    1520,
+    1450,
+    1220,
+    1170,
+    1210,
+    1220,
+    1210,
+    1910,
+    1470,
+    1120,
+    1780,
+    1560,
+    1480,
+    1470,
+    1350,
+    1400,
+    1450,
+    1500,
+    1590,
+    1690,
+    1630,
+    1460,
+    1460,
+    1470,
+    1400,
+    1980,
+    1670,
+    1340,
+    1870,
+    1830,
+    1820,
+    1810,
+    1800,
+    1800,
+    1990,
+    1790,
+    1760,
+    1750,
+    1740,
+    1730,
+    1720,
+    1940,
+    1720,
+    1570,
+    1430,
+    1370,
+    1350,
+    1370,
+    1320,
+    1500,
+    1500,
+    1700,
+    1550,
+    1540,
+    1540,
+    1680,
+    1700,
+    2400,
+    2000,
+    1900,
+    1880,
+    1790,
+    1610,
+    1580,
+    1550,
+    1530,
+    1510,
+    1500,
+    1500,
+    1500,
+    1500,
+    1500,
+    1500,
+    1500,
+    1500,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+    1600,
+]
+
+# Atomic colors, indexed by atomic number: 1-109
+# http://jmol.sourceforge.net/jscolors/
+COLORS = (
+    "0",
+    "#FFFFFF",
+    "#D9FFFF",
+    "#CC80FF",
+    "#C2FF00",
+    "#FFB5B5",
+    "#909090",
+    "#3050F8",
+    "#FF0D0D",
+    "#90E050",
+    "#B3E3F5",
+    "#AB5CF2",
+    "#8AFF00",
+    "#BFA6A6",
+    "#F0C8A0",
+    "#FF8000",
+    "#FFFF30",
+    "#1FF01F",
+    "#80D1E3",
+    "#8F40D4",
+    "#3DFF00",
+    "#E6E6E6",
+    "#BFC2C7",
+    "#A6A6AB",
+    "#8A99C7",
+    "#9C7AC7",
+    "#E06633",
+    "#F090A0",
+    "#50D050",
+    "#C88033",
+    "#7D80B0",
+    "#C28F8F",
+    "#668F8F",
+    "#BD80E3",
+    "#FFA100",
+    "#A62929",
+    "#5CB8D1",
+    "#702EB0",
+    "#00FF00",
+    "#94FFFF",
+    "#94E0E0",
+    "#73C2C9",
+    "#54B5B5",
+    "#3B9E9E",
+    "#248F8F",
+    "#0A7D8C",
+    "#006985",
+    "#C0C0C0",
+    "#FFD98F",
+    "#A67573",
+    "#668080",
+    "#9E63B5",
+    "#D47A00",
+    "#940094",
+    "#429EB0",
+    "#57178F",
+    "#00C900",
+    "#70D4FF",
+    "#FFFFC7",
+    "#D9FFC7",
+    "#C7FFC7",
+    "#A3FFC7",
+    "#8FFFC7",
+    "#61FFC7",
+    "#45FFC7",
+    "#30FFC7",
+    "#1FFFC7",
+    "#00FF9C",
+    "#00E675",
+    "#00D452",
+    "#00BF38",
+    "#00AB24",
+    "#4DC2FF",
+    "#4DA6FF",
+    "#2194D6",
+    "#267DAB",
+    "#266696",
+    "#175487",
+    "#D0D0E0",
+    "#FFD123",
+    "#B8B8D0",
+    "#A6544D",
+    "#575961",
+    "#9E4FB5",
+    "#AB5C00",
+    "#754F45",
+    "#428296",
+    "#420066",
+    "#007D00",
+    "#70ABFA",
+    "#00BAFF",
+    "#00A1FF",
+    "#008FFF",
+    "#0080FF",
+    "#006BFF",
+    "#545CF2",
+    "#785CE3",
+    "#8A4FE3",
+    "#A136D4",
+    "#B31FD4",
+    "#B31FBA",
+    "#B30DA6",
+    "#BD0D87",
+    "#C70066",
+    "#CC0059",
+    "#D1004F",
+    "#D90045",
+    "#E00038",
+    "#E6002E",
+    "#EB0026",
+)
+
+# Lookup tables built once at import
+SYMBOL_TO_NUMBER = {symbol: number for number, symbol in enumerate(ATOMS)}
+RADII = np.array(_RADII_PM, dtype=np.float32) / 1000.0
+_SYMBOLS = np.array(ATOMS)
+_COLORS = np.array(COLORS)
+
+# Atomic numbers of metals that can be octahedral center atoms, by block
+METAL_GROUPS = {
+    "3d": tuple(range(21, 31)),
+    "4d": tuple(range(39, 49)),
+    "5d": (57,) + tuple(range(72, 81)),
+    "6d": (89,) + tuple(range(104, 110)),
+    "4f": tuple(range(58, 72)),
+    "5f": tuple(range(90, 104)),
+}
+METAL_GROUPS["transition"] = (
+    METAL_GROUPS["3d"] + METAL_GROUPS["4d"] + METAL_GROUPS["5d"] + METAL_GROUPS["6d"]
+)
+METAL_GROUPS["lanthanide"] = (57,) + METAL_GROUPS["4f"]
+METAL_GROUPS["actinide"] = (89,) + METAL_GROUPS["5f"]
+METAL_GROUPS["all"] = tuple(
+    sorted(set(METAL_GROUPS["transition"] + METAL_GROUPS["4f"] + METAL_GROUPS["5f"]))
+)
+
+
+def symbols_to_numbers(symbols):
+    """
+    Convert an array of atomic symbols to atomic numbers.
+
+    Each distinct symbol is looked up once, so the cost is dominated by
+    sorting the symbols rather than by the number of atoms.
+
+    Parameters
+    ----------
+    symbols : array_like of str
+        Atomic symbols.
+
+    Returns
+    -------
+    numbers : ndarray of int
+        Atomic numbers. Symbols that are not an element give 0.
+
+    Examples
+    --------
+    >>> symbols_to_numbers(['Fe', 'N', 'N', 'O'])
+    array([26,  7,  7,  8])
+
+    """
+    symbols = np.asarray(symbols, dtype=str)
+    unique, inverse = np.unique(symbols, return_inverse=True)
+    numbers = np.array([SYMBOL_TO_NUMBER.get(s, 0) for s in unique], dtype=np.intp)
+
+    return numbers[inverse].reshape(symbols.shape)
+
+
+def numbers_to_symbols(numbers):
+    """
+    Convert an array of atomic numbers to atomic symbols.
+
+    Parameters
+    ----------
+    numbers : array_like of int
+        Atomic numbers: 1-109.
+
+    Returns
+    -------
+    symbols : ndarray of str
+        Atomic symbols.
+
+    Examples
+    --------
+    >>> numbers_to_symbols([26, 7, 7, 8])
+    array(['Fe', 'N', 'N', 'O'], dtype='<U2')
+
+    """
+    return _SYMBOLS[np.asarray(numbers, dtype=np.intp)]
+
+
+def numbers_to_radii(numbers):
+    """
+    Convert an array of atomic numbers to atomic radii in Angstroms.
+
+    Parameters
+    ----------
+    numbers : array_like of int
+        Atomic numbers: 1-119.
+
+    Returns
+    -------
+    radii : ndarray of float32
+        Atomic radii.
+
+    """
+    return RADII[np.asarray(numbers, dtype=np.intp)]
+
+
+def numbers_to_colors(numbers):
+    """
+    Convert an array of atomic numbers to atomic colors.
+
+    Parameters
+    ----------
+    numbers : array_like of int
+        Atomic numbers: 1-109.
+
+    Returns
+    -------
+    colors : ndarray of str
+        Atomic colors.
+
+    """
+    return _COLORS[np.asarray(numbers, dtype=np.intp)]
+
+
+def metal_numbers(metals=None):
+    """
+    Convert a set of metals to atomic numbers.
+
+    Parameters
+    ----------
+    metals : str, int, or list of str and int, optional
+        Atomic symbols, atomic numbers, or names of groups in :data:`METAL_GROUPS`,
+        such as "3d", "4d", "transition", or "lanthanide".
+        If None, use all d- and f-block metals. Default is None.
+
+    Returns
+    -------
+    numbers : ndarray of int
+        Sorted atomic numbers of the metals.
+
+    Raises
+    ------
+    ValueError
+        If an item is neither an atomic symbol nor a group name.
+
+    Examples
+    --------
+    >>> metal_numbers("Fe")
+    array([26])
+    >>> metal_numbers(["3d", "Ru"])
+    array([21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 44])
+
+    """
+    if metals is None:
+        metals = "all"
+    if isinstance(metals, (str, int, np.integer)):
+        metals = [metals]
+
+    numbers = set()
+    for metal in metals:
+        if isinstance(metal, (int, np.integer)):
+            numbers.add(int(metal))
+        elif metal in METAL_GROUPS:
+            numbers.update(METAL_GROUPS[metal])
+        elif SYMBOL_TO_NUMBER.get(metal, 0) > 0:
+            numbers.add(SYMBOL_TO_NUMBER[metal])
+        else:
+            raise ValueError(f"Unknown metal or metal group: {metal}")
+
+    return np.array(sorted(numbers), dtype=np.intp)
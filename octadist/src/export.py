@@ -0,0 +1,389 @@
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import csv
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+# File extension -> output format
+FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".h5": "hdf5",
+    ".hdf5": "hdf5",
+    ".npz": "npz",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+}
+
+# Parameters written by default, see calc.CalcDistortion
+DEFAULT_PARAMS = [
+    "d_mean",
+    "zeta",
+    "delta",
+    "sigma",
+    "theta",
+    "theta_min",
+    "theta_max",
+    "oct_vol",
+]
+
+
+def _require(module, fmt):
+    """
+    Import an optional dependency needed by one of the output formats.
+
+    """
+    import importlib
+
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        name = module.split(".")[0]
+        raise ImportError(
+            f"{name} is required to write {fmt} files. Install it or use a different output format."
+        ) from e
+
+
+class _CSVBackend:
+    def __init__(self, path, params):
+        self.f = open(path, "w", newline="")
+        self.writer = csv.writer(self.f)
+        xyz = [f"{c}{i}" for i in range(7) for c in "xyz"]
+        self.writer.writerow(
+            ["file", "metal_index", "metal"] + params + ["non_octa"] + xyz
+        )
+        self.params = params
+
+    def write(self, columns):
+        coord = columns["coord"].reshape(len(columns["file"]), 21)
+        fields = [columns["file"], columns["metal_index"], columns["metal"]]
+        fields += [columns[p] for p in self.params] + [columns["non_octa"]]
+        for row, xyz in zip(zip(*fields), coord):
+            self.writer.writerow([*row, *xyz])
+
+    def close(self):
+        self.f.close()
+
+
+class _JSONLBackend:
+    def __init__(self, path, params):
+        self.f = open(path, "w")
+        self.params = params
+
+    def write(self, columns):
+        names = ["file", "metal_index", "metal"] + self.params + ["non_octa"]
+        fields = [columns[k].tolist() for k in names]
+        for row, coord in zip(zip(*fields), columns["coord"].tolist()):
+            record = dict(zip(names, row))
+            record["coord"] = coord
+            self.f.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.f.close()
+
+
+class _ArrowBackend:
+    def __init__(self, path, params, fmt):
+        self.pa = _require("pyarrow", fmt)
+        pa = self.pa
+        fields = [
+            ("file", pa.string()),
+            ("metal_index", pa.int64()),
+            ("metal", pa.string()),
+        ]
+        fields += [(p, pa.float64()) for p in params]
+        fields += [
+            ("non_octa", pa.bool_()),
+            ("coord", pa.list_(pa.list_(pa.float64(), 3), 7)),
+        ]
+        self.schema = pa.schema(fields)
+
+        if fmt == "parquet":
+            pq = _require("pyarrow.parquet", fmt)
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, columns):
+        pa = self.pa
+        arrays = []
+        for field in self.schema:
+            if field.name == "coord":
+                xyz = pa.array(columns["coord"].ravel())
+                atoms = pa.FixedSizeListArray.from_arrays(xyz, 3)
+                arrays.append(pa.FixedSizeListArray.from_arrays(atoms, 7))
+            else:
+                arrays.append(pa.array(columns[field.name], type=field.type))
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class _HDF5Backend:
+    def __init__(self, path, params, chunk_size):
+        h5py = _require("h5py", "HDF5")
+        self.f = h5py.File(path, "w")
+        string = h5py.string_dtype()
+        dtypes = {"file": string, "metal_index": np.int64, "metal": string}
+        dtypes.update({p: np.float64 for p in params})
+        dtypes["non_octa"] = np.bool_
+
+        for name, dtype in dtypes.items():
+            self.f.create_dataset(
+                name, (0,), dtype=dtype, maxshape=(None,), chunks=(chunk_size,)
+            )
+        self.f.create_dataset(
+            "coord",
+            (0, 7, 3),
+            dtype=np.float64,
+            maxshape=(None, 7, 3),
+            chunks=(chunk_size, 7, 3),
+        )
+
+    def write(self, columns):
+        for name, dataset in self.f.items():
+            data = columns[name]
+            n = dataset.shape[0]
+            dataset.resize(n + len(data), axis=0)
+            dataset[n:] = data.astype(object) if dataset.dtype.kind == "O" else data
+
+    def close(self):
+        self.f.close()
+
+
+class _NPZBackend:
+    # The length of an array is in the .npy header, so chunks are streamed to one
+    # temporary file per column and copied into the archive behind the header on
+    # close, one chunk at a time
+    def __init__(self, path, params):
+        self.path = path
+        self.files = {}
+        self.chunks = {}
+
+    def write(self, columns):
+        for name, data in columns.items():
+            if name not in self.files:
+                self.files[name] = tempfile.TemporaryFile()
+                self.chunks[name] = []
+            data = np.ascontiguousarray(data)
+            data.tofile(self.files[name])
+            self.chunks[name].append((data.dtype, data.shape))
+
+    def close(self):
+        # Written member by member as np.savez would, which reserves "file" as argument
+        try:
+            with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as zf:
+                for name, tmp in self.files.items():
+                    with zf.open(name + ".npy", "w", force_zip64=True) as f:
+                        self._copy(tmp, self.chunks[name], f)
+        finally:
+            for tmp in self.files.values():
+                tmp.close()
+
+    @staticmethod
+    def _copy(tmp, chunks, f):
+        # Strings of different chunks may differ in length, the widest is used
+        dtype = np.result_type(*[dtype for dtype, _ in chunks])
+        shape = (sum(shape[0] for _, shape in chunks),) + chunks[0][1][1:]
+        header = {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        }
+        np.lib.format.write_array_header_1_0(f, header)
+
+        tmp.seek(0)
+        for chunk_dtype, chunk_shape in chunks:
+            data = np.fromfile(tmp, dtype=chunk_dtype, count=int(np.prod(chunk_shape)))
+            f.write(data.astype(dtype).tobytes())
+
+
+class ResultWriter:
+    """
+    Write distortion parameters of many octahedra to a columnar file.
+
+    One row is written per octahedron with the file name, the index and symbol of
+    the metal center atom, the parameters, the non-octahedral flag and the 7x3
+    coordinates of the octahedron. Rows are collected in chunks of ``chunk_size``
+    and each chunk is written as soon as it is full, so the memory use does not grow
+    with the number of rows. NPZ columns are streamed to temporary files and
+    copied into the archive on close, which needs as much free disk space.
+
+    The format is chosen by the extension of the output file:
+
+    - ``.parquet`` : Apache Parquet, requires pyarrow
+    - ``.arrow``, ``.feather`` : Arrow IPC file, requires pyarrow
+    - ``.h5``, ``.hdf5`` : HDF5 with one dataset per column, requires h5py
+    - ``.npz`` : NumPy archive with one array per column
+    - ``.csv`` : CSV with coordinates in columns x0, y0, z0, ..., z6
+    - ``.jsonl`` : one JSON object per line
+
+    Parameters
+    ----------
+    path : str
+        Output file.
+    params : list of str, optional
+        Parameters to write. Default is all parameters in :data:`DEFAULT_PARAMS`.
+    chunk_size : int, optional
+        Number of rows written at a time. Default is 10000.
+
+    Raises
+    ------
+    ValueError
+        If the file extension is not supported.
+    ImportError
+        If the optional package needed by the format is not installed.
+
+    Examples
+    --------
+    >>> with ResultWriter("results.parquet") as writer:
+    ...     writer.write("complex.xyz", 0, "Fe", params, coord_octa)
+
+    """
+
+    def __init__(self, path, params=None, chunk_size=10000):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in FORMATS:
+            raise ValueError(
+                f"Output file must have one of {', '.join(FORMATS)} extensions: {path}"
+            )
+
+        self.path = path
+        self.format = FORMATS[ext]
+        self.params = list(DEFAULT_PARAMS if params is None else params)
+        self.chunk_size = chunk_size
+        self.rows = []
+
+        if self.format == "csv":
+            self.backend = _CSVBackend(path, self.params)
+        elif self.format == "jsonl":
+            self.backend = _JSONLBackend(path, self.params)
+        elif self.format in ("parquet", "arrow"):
+            self.backend = _ArrowBackend(path, self.params, self.format)
+        elif self.format == "hdf5":
+            self.backend = _HDF5Backend(path, self.params, chunk_size)
+        else:
+            self.backend = _NPZBackend(path, self.params)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, file, metal_index, metal, params, coord_octa):
+        """
+        Add the result of one octahedron.
+
+        Parameters
+        ----------
+        file : str
+            Input file name.
+        metal_index : int
+            Index of the metal center atom in the complex.
+        metal : str
+            Atomic symbol of the metal center atom.
+        params : dict
+            Computed parameters. Missing parameters are written as NaN and
+            ``non_octa`` as False.
+        coord_octa : array_like
+            Atomic coordinates of octahedral structure, shape (7, 3).
+
+        """
+        self.rows.append((file, metal_index, metal, params, coord_octa))
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def write_batch(self, file, metal_index, metal, params, coord_octa):
+        """
+        Add the results of many octahedra at once.
+
+        Parameters
+        ----------
+        file : str or array_like of str
+            Input file name of each octahedron.
+        metal_index : int or array_like of int
+            Index of the metal center atom of each octahedron.
+        metal : str or array_like of str
+            Atomic symbol of the metal center atom of each octahedron.
+        params : dict
+            Array of each computed parameter, for example the attributes of
+            :class:`octadist.src.calc.CalcDistortionBatch`.
+        coord_octa : array_like
+            Atomic coordinates of octahedral structures, shape (N, 7, 3).
+
+        """
+        self.flush()
+
+        coord_octa = np.asarray(coord_octa, dtype=np.float64).reshape(-1, 7, 3)
+        n = len(coord_octa)
+        columns = {
+            "file": np.broadcast_to(np.asarray(file, dtype=str), n),
+            "metal_index": np.broadcast_to(np.asarray(metal_index, dtype=np.int64), n),
+            "metal": np.broadcast_to(np.asarray(metal, dtype=str), n),
+        }
+        for p in self.params:
+            columns[p] = np.broadcast_to(
+                np.asarray(params.get(p, np.nan), dtype=np.float64), n
+            )
+        columns["non_octa"] = np.broadcast_to(
+            np.asarray(params.get("non_octa", False), dtype=np.bool_), n
+        )
+        columns["coord"] = coord_octa
+
+        for start in range(0, n, self.chunk_size):
+            chunk = {k: v[start : start + self.chunk_size] for k, v in columns.items()}
+            self.backend.write(chunk)
+
+    def flush(self):
+        """
+        Write the rows added with :meth:`write` that are not written yet.
+
+        """
+        if not self.rows:
+            return
+
+        file, metal_index, metal, params, coord_octa = zip(*self.rows)
+        self.rows = []
+
+        columns = {
+            "file": np.asarray(file, dtype=str),
+            "metal_index": np.asarray(metal_index, dtype=np.int64),
+            "metal": np.asarray(metal, dtype=str),
+        }
+        for p in self.params:
+            columns[p] = np.array([d.get(p, np.nan) for d in params], dtype=np.float64)
+        columns["non_octa"] = np.array(
+            [d.get("non_octa", False) for d in params], dtype=np.bool_
+        )
+        columns["coord"] = np.asarray(coord_octa, dtype=np.float64).reshape(-1, 7, 3)
+
+        self.backend.write(columns)
+
+    def close(self):
+        """
+        Write the remaining rows and close the output file.
+
+        """
+        self.flush()
+        self.backend.close()
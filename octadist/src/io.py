@@ -14,11 +14,249 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import contextlib
+import itertools
+import mmap
+import os
+import re
+from fractions import Fraction
 from operator import itemgetter
 
 import numpy as np
 
-from octadist.src import elements, popup
+from octadist.src import elements
+
+# CIF tokens: quoted strings end at a quote followed by whitespace
+_CIF_TOKEN = re.compile(r"""'(.*?)'(?=\s|$)|"(.*?)"(?=\s|$)|(#.*)|(\S+)""")
+
+# CIF data names used by get_coord_cif, in DDL1 form
+_CIF_CELL = [
+    "_cell_length_a",
+    "_cell_length_b",
+    "_cell_length_c",
+    "_cell_angle_alpha",
+    "_cell_angle_beta",
+    "_cell_angle_gamma",
+]
+_CIF_SITE = [
+    "_atom_site_label",
+    "_atom_site_type_symbol",
+    "_atom_site_fract_x",
+    "_atom_site_fract_y",
+    "_atom_site_fract_z",
+]
+_CIF_SYMOP = [
+    "_symmetry_equiv_pos_as_xyz",
+    "_space_group_symop_operation_xyz",
+]
+
+
+def _cif_tokens(lines):
+    """
+    Split CIF lines into tokens, yielding (value, bare), where bare is False for
+    quoted strings and semicolon text fields, which are never data names.
+
+    """
+    text = None
+    for line in lines:
+        if text is not None:
+            if line.startswith(";"):
+                yield "".join(text).strip(), False
+                text = None
+            else:
+                text.append(line)
+            continue
+
+        if line.startswith(";"):
+            text = [line[1:]]
+            continue
+
+        for m in _CIF_TOKEN.finditer(line):
+            single, double, comment, bare = m.groups()
+            if comment is not None:
+                break
+            elif bare is not None:
+                yield bare, True
+            else:
+                yield single if single is not None else double, False
+
+
+def _read_cif(f, names):
+    """
+    Stream the first data block of a CIF file and keep only the given data names,
+    either as single items or as columns of loops. DDL2 names such as
+    ``_cell.length_a`` are stored in DDL1 form, ``_cell_length_a``.
+
+    Returns
+    -------
+    items : dict
+        Data name -> value of the single items found.
+    loops : dict
+        Data name -> list of values of the loop columns found.
+
+    """
+    names = set(names)
+    items = {}
+    loops = {}
+
+    with open(f, "r") as cif_file:
+        tokens = _cif_tokens(cif_file)
+        seen_block = False
+        token = next(tokens, None)
+
+        while token is not None:
+            value, bare = token
+            key = value.lower().replace(".", "_") if bare else None
+
+            if bare and key.startswith("data_"):
+                if seen_block:
+                    break
+                seen_block = True
+                token = next(tokens, None)
+
+            elif bare and key == "loop_":
+                tags = []
+                token = next(tokens, None)
+                while token is not None and token[1] and token[0].startswith("_"):
+                    tags.append(token[0].lower().replace(".", "_"))
+                    token = next(tokens, None)
+
+                columns = [
+                    loops.setdefault(t, []) if t in names else None for t in tags
+                ]
+                i = 0
+                while token is not None:
+                    value, bare = token
+                    if bare and (
+                        value.startswith("_")
+                        or value.lower() == "loop_"
+                        or value.lower().startswith("data_")
+                    ):
+                        break
+                    column = columns[i % len(columns)] if columns else None
+                    if column is not None:
+                        column.append(value)
+                    i += 1
+                    token = next(tokens, None)
+
+            elif bare and key.startswith("_"):
+                token = next(tokens, None)
+                if token is not None and key in names:
+                    items[key] = token[0]
+                token = next(tokens, None)
+
+            else:
+                token = next(tokens, None)
+
+    return items, loops
+
+
+def _cif_number(value):
+    """
+    Convert a CIF numeric value such as '16.0123(4)' to float.
+    Unknown ('?') and inapplicable ('.') values give NaN.
+
+    """
+    value = value.split("(")[0]
+    if value in ("?", "."):
+        return np.nan
+
+    return float(value)
+
+
+def _lattice_from_parameters(a, b, c, alpha, beta, gamma):
+    """
+    Lattice vectors as rows from cell lengths and angles in degrees, in the same
+    orientation as :meth:`pymatgen.core.Lattice.from_parameters`, with c along z.
+
+    """
+    alpha, beta, gamma = np.radians([alpha, beta, gamma])
+    cos_alpha, cos_beta, cos_gamma = np.cos([alpha, beta, gamma])
+    sin_alpha, sin_beta = np.sin([alpha, beta])
+
+    val = (cos_alpha * cos_beta - cos_gamma) / (sin_alpha * sin_beta)
+    gamma_star = np.arccos(np.clip(val, -1.0, 1.0))
+
+    return np.array(
+        [
+            [a * sin_beta, 0.0, a * cos_beta],
+            [
+                -b * sin_alpha * np.cos(gamma_star),
+                b * sin_alpha * np.sin(gamma_star),
+                b * cos_alpha,
+            ],
+            [0.0, 0.0, c],
+        ]
+    )
+
+
+def _parse_symop(op):
+    """
+    Convert a symmetry operation such as '-x+1/2, y, -z' to a rotation matrix and
+    a translation vector acting on fractional coordinates.
+
+    """
+    rot = np.zeros((3, 3))
+    trans = np.zeros(3)
+
+    for i, expr in enumerate(op.replace(" ", "").lower().split(",")):
+        for sign, number, axis in re.findall(r"([+-]?)([\d./]*)\*?([xyz]?)", expr):
+            if not number and not axis:
+                continue
+            value = float(Fraction(number)) if number else 1.0
+            if sign == "-":
+                value = -value
+            if axis:
+                rot[i, "xyz".index(axis)] += value
+            else:
+                trans[i] += value
+
+    return rot, trans
+
+
+def _expand_symmetry(frac, rot, trans, tol=1e-4):
+    """
+    Apply all symmetry operations to all sites at once, wrap the images into the
+    unit cell and merge images closer than tol in fractional coordinates.
+
+    Returns
+    -------
+    frac : ndarray
+        Fractional coordinates of the unique sites, grouped by asymmetric site.
+    site : ndarray
+        Index of the asymmetric site of each unique site.
+
+    """
+    from scipy.spatial import cKDTree
+
+    # (n_site, n_op, 3), so that images of the same site stay together
+    images = np.einsum("oij,nj->noi", rot, frac) + trans
+    images -= np.floor(images)
+    images[images >= 1.0] = 0.0
+
+    n_site, n_op = images.shape[:2]
+    images = images.reshape(-1, 3)
+    site = np.repeat(np.arange(n_site), n_op)
+
+    # Periodic tree in fractional space, keep the first of each group of duplicates
+    pairs = cKDTree(images, boxsize=1.0).query_pairs(tol, output_type="ndarray")
+    keep = np.ones(len(images), dtype=bool)
+    keep[pairs.max(axis=1)] = False
+
+    return images[keep], site[keep]
+
+
+def _cif_symbol(label):
+    """
+    Atomic symbol from a CIF type symbol or site label, such as 'Fe2+' or 'Fe1'.
+
+    """
+    letters = re.match(r"[A-Za-z]*", label).group()
+    for symbol in (letters[:2].capitalize(), letters[:1].upper()):
+        if elements.SYMBOL_TO_NUMBER.get(symbol, 0) > 0:
+            return symbol
+
+    return letters.capitalize()
 
 
 def is_cif(f):
@@ -79,24 +317,32 @@ def is_cif(f):
     True
 
     """
-    cif_file = open(f, "r")
-    nline = cif_file.readlines()
-
-    for i in range(len(nline)):
-        if "loop_" in nline[i]:
-            return True
+    with open(f, "r") as cif_file:
+        for line in cif_file:
+            if "loop_" in line:
+                return True
 
     return False
 
 
-def get_coord_cif(f):
+def get_coord_cif(f, return_lattice=False):
     """
     Get coordinate from .cif file.
 
+    The file is read by a built-in streaming parser. Atomic sites of the first
+    data block are expanded by the symmetry operations of the file, wrapped into
+    the unit cell, and images that coincide within 1e-4 in fractional coordinates
+    are merged. Sites are listed in the order of the file, each followed by its
+    symmetry images. The lattice has the same orientation as in pymatgen.
+
     Parameters
     ----------
     f : str
         User input filename.
+    return_lattice : bool, optional
+        If True, also return the lattice vectors, which are needed to search
+        octahedra across the cell faces, see :func:`extract_all_octa`.
+        Default is False.
 
     Returns
     -------
@@ -104,6 +350,14 @@ def get_coord_cif(f):
         Full atomic labels of complex.
     coord : array_like
         Full atomic coordinates of complex.
+    lattice : ndarray
+        Lattice vectors of the unit cell as rows, shape (3, 3).
+        Only returned if return_lattice is True.
+
+    Raises
+    ------
+    ValueError
+        If the cell parameters or the fractional coordinates of atomic sites are missing.
 
     Examples
     --------
@@ -121,22 +375,41 @@ def get_coord_cif(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    import warnings
+    items, loops = _read_cif(f, _CIF_CELL + _CIF_SITE + _CIF_SYMOP)
 
-    warnings.filterwarnings("ignore")
+    missing = [k for k in _CIF_CELL if k not in items]
+    if missing:
+        raise ValueError(
+            f"Cell parameters are missing in CIF file: {', '.join(missing)}"
+        )
+    lattice = _lattice_from_parameters(*(_cif_number(items[k]) for k in _CIF_CELL))
 
-    # Lazy import to avoid requiring pymatgen unless CIF parsing is used
-    try:
-        from pymatgen.core import Structure
-    except ImportError as e:
-        raise ImportError(
-            "pymatgen is required to read CIF files. Install it or use a different input format."
-        ) from e
+    fract = [loops.get(k, []) for k in _CIF_SITE[2:]]
+    if not fract[0] or not len(fract[0]) == len(fract[1]) == len(fract[2]):
+        raise ValueError(
+            f"Fractional coordinates of atomic sites are missing in CIF file: {f}"
+        )
+    frac = np.array([[_cif_number(v) for v in column] for column in fract]).T
+
+    labels = loops.get("_atom_site_type_symbol") or loops.get("_atom_site_label")
+    if labels is None or len(labels) != len(frac):
+        labels = ["X"] * len(frac)
+    symbols = np.array([_cif_symbol(label) for label in labels])
+
+    # Sites with unknown coordinates are left out
+    known = ~np.isnan(frac).any(axis=1)
+    frac = frac[known]
+    symbols = symbols[known]
+
+    ops = loops.get(_CIF_SYMOP[0]) or loops.get(_CIF_SYMOP[1]) or ["x, y, z"]
+    rot, trans = zip(*map(_parse_symop, ops))
+    frac, site = _expand_symmetry(frac, np.array(rot), np.array(trans))
 
-    # works only with pymatgen <= v2021.3.3
-    structure = Structure.from_file(f)
-    atom = list(map(lambda x: elements.number_to_symbol(x), structure.atomic_numbers))
-    coord = structure.cart_coords
+    atom = symbols[site].tolist()
+    coord = frac @ lattice
+
+    if return_lattice:
+        return atom, coord, lattice
 
     return atom, coord
 
@@ -177,9 +450,8 @@ def is_xyz(f):
     True
 
     """
-    file = open(f, "r")
-
-    first_line = file.readline()
+    with open(f, "r") as file:
+        first_line = file.readline()
 
     # Check if the first line is integer
     try:
@@ -225,28 +497,326 @@ def get_coord_xyz(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    file = open(f, "r")
-    # read file from 3rd line
-    line = file.readlines()[2:]
-    file.close()
+    for atom, coord in iter_coord_xyz(f, stop=1):
+        return atom, coord
 
-    atom = []
-    for l in line:
-        # read atom symbol on 1st column using arbitrary whitespace splitter
-        # handles spaces and tabs in XYZ files
-        l_strip = l.strip()
-        if not l_strip:
+    raise ValueError(f"no structure found in XYZ file: {f}")
+
+
+def iter_coord_xyz(f, start=0, stop=None, step=1):
+    """
+    Iterate over the frames of a multi-frame .xyz file, such as an MD trajectory.
+
+    The file is read line by line and only one frame is held in memory at a time,
+    so arbitrarily large trajectories can be processed. Frames that are not selected
+    are skipped without parsing their coordinates.
+
+    Parameters
+    ----------
+    f : str
+        User input filename.
+    start : int, optional
+        Index of the first frame to read. Default is 0.
+    stop : int, optional
+        Index of the frame to stop before. If None, read to the end of file.
+        Default is None.
+    step : int, optional
+        Read every step-th frame. Default is 1.
+
+    Yields
+    ------
+    atom : list
+        Full atomic labels of complex in the frame.
+    coord : array_like
+        Full atomic coordinates of complex in the frame.
+
+    Raises
+    ------
+    ValueError
+        If a frame is truncated or its atom count is not an integer.
+
+    See Also
+    --------
+    get_coord_xyz :
+        Get coordinate of the first frame.
+
+    Examples
+    --------
+    >>> for atom, coord in iter_coord_xyz("trajectory.xyz", start=100, step=10):
+    ...     index_octa, coord_octa = extract_all_octa(atom, coord)
+    ...     dist = CalcDistortionBatch(coord_octa)
+    ...     print(dist.zeta, dist.sigma, dist.theta)
+
+    """
+    if start < 0 or step < 1:
+        raise ValueError("start must be non-negative and step must be positive")
+
+    with open(f, "r") as file:
+        frame = 0
+        while stop is None or frame < stop:
+            first_line = file.readline()
+            if not first_line:
+                break
+            # skip blank lines between frames
+            if not first_line.strip():
+                continue
+
+            try:
+                n_atom = int(first_line)
+            except ValueError:
+                raise ValueError(
+                    f"invalid number of atoms in frame {frame} of {f}: {first_line.strip()}"
+                ) from None
+
+            # comment line followed by atoms, blank rows inside the block are skipped
+            file.readline()
+            lines = []
+            while len(lines) < n_atom:
+                line = file.readline()
+                if not line:
+                    raise ValueError(f"frame {frame} of {f} is truncated")
+                if line.strip():
+                    lines.append(line)
+
+            if frame >= start and (frame - start) % step == 0:
+                # read atom symbol and coordinate using arbitrary whitespace splitter
+                # handles spaces and tabs in XYZ files
+                data = [line.split() for line in lines]
+                if any(len(d) < 4 for d in data):
+                    raise ValueError(
+                        f"frame {frame} of {f} has an atom without three coordinates"
+                    )
+                atom = [d[0] for d in data]
+                coord = np.array([d[1:4] for d in data], dtype=np.float64)
+                yield atom, coord
+
+            frame += 1
+
+
+# Program banners printed in the header of each output file.
+_BANNERS = (
+    ("gaussian", ("Entering Gaussian System", "Gaussian, Inc.")),
+    ("nwchem", ("Northwest Computational Chemistry Package",)),
+    ("orca", ("O   R   C   A",)),
+    ("qchem", ("Welcome to Q-Chem", "Q-Chem, Inc.")),
+)
+
+# Geometry markers used by is_gaussian, is_nwchem, is_orca and is_qchem,
+# in the order the formats were historically tried.
+_MARKERS = (
+    ("gaussian", "Standard orientation:"),
+    ("nwchem", "Optimization converged"),
+    ("orca", "CARTESIAN COORDINATES (ANGSTROEM)"),
+    ("qchem", "OPTIMIZATION CONVERGED"),
+)
+
+
+def _iter_blocks(lines, marker, skip, terminator=None, nrow=None, trim=0):
+    """
+    Yield the raw lines of every table that follows a marker line.
+
+    Parameters
+    ----------
+    lines : iterator
+        Lines of an open file.
+    marker : str
+        Text of the line that heads the table.
+    skip : int
+        Number of header lines between the marker and the first table row.
+    terminator : str, optional
+        Text of the line that closes the table.
+    nrow : int, optional
+        Number of rows in the table. Used instead of ``terminator`` if given.
+    trim : int, optional
+        Number of lines to drop from the end of the table.
+        Default is 0.
+
+    Yields
+    ------
+    block : list
+        Lines of a complete table. A table cut off by the end of file is skipped.
+
+    """
+    for line in lines:
+        if marker not in line:
+            continue
+        for _ in itertools.islice(lines, skip):
+            pass
+        if nrow is not None:
+            block = list(itertools.islice(lines, nrow))
+            if len(block) == nrow:
+                yield block
             continue
-        lst = l_strip.split()[0]
-        atom.append(lst)
+        block = []
+        for row in lines:
+            if terminator in row:
+                break
+            block.append(row)
+        else:
+            continue
+        yield block[: max(len(block) - trim, 0)]
 
-    file = open(f, "r")
-    coord = np.loadtxt(file, skiprows=2, usecols=[1, 2, 3])
-    file.close()
 
-    coord = np.asarray(coord, dtype=np.float64)
+@contextlib.contextmanager
+def _mapped(f):
+    """
+    Memory-map a file read-only. An empty file is mapped to empty bytes.
 
-    return atom, coord
+    Parameters
+    ----------
+    f : str
+        User input filename.
+
+    Yields
+    ------
+    mm : mmap.mmap or bytes
+        Read-only view of the file.
+
+    """
+    with open(f, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _tail(mm, marker):
+    """
+    Iterate over the lines of a mapped file from the last line that contains a marker.
+
+    The marker is searched backwards from the end of file, so only the tail of
+    the file is ever decoded.
+
+    Parameters
+    ----------
+    mm : mmap.mmap or bytes
+        Mapped file, see :func:`_mapped`.
+    marker : str
+        Text to search for.
+
+    Returns
+    -------
+    lines : iterator
+        Decoded lines, starting with the line that contains the marker.
+        Empty if the marker is not found.
+
+    """
+    pos = mm.rfind(marker.encode())
+    if pos < 0:
+        return iter(())
+    mm.seek(mm.rfind(b"\n", 0, pos) + 1)
+    return (line.decode(errors="replace") for line in iter(mm.readline, b""))
+
+
+def _read_blocks(f, marker, skip, terminator, trim=0, all_steps=False):
+    """
+    Read the last table, or every table, that follows a marker line.
+
+    Parameters
+    ----------
+    f : str
+        User input filename.
+    marker : str
+        Text of the line that heads the table.
+    skip : int
+        Number of header lines between the marker and the first table row.
+    terminator : str
+        Text of the line that closes the table.
+    trim : int, optional
+        Number of lines to drop from the end of the table.
+        Default is 0.
+    all_steps : bool, optional
+        If True, read every table in the file. Otherwise only the last one is read.
+        Default is False.
+
+    Returns
+    -------
+    blocks : list
+        Lines of each table found.
+
+    """
+    if all_steps:
+        with open(f, "r") as file:
+            return list(_iter_blocks(file, marker, skip, terminator, trim=trim))
+
+    with _mapped(f) as mm:
+        lines = _tail(mm, marker)
+        return list(
+            itertools.islice(
+                _iter_blocks(lines, marker, skip, terminator, trim=trim), 1
+            )
+        )
+
+
+def detect_format(f, head=200):
+    """
+    Detect the program that wrote a computational chemistry output file.
+
+    The header of the file is checked for the program banner, and the file is scanned
+    for the geometry markers of each format. A banner is trusted only once the marker
+    of its format is found, which ends the scan early. Otherwise, the first format in
+    :data:`_MARKERS` whose marker was found is returned. The file is read at most once.
+
+    Parameters
+    ----------
+    f : str
+        User input filename.
+    head : int, optional
+        Number of lines at the top of the file searched for a program banner.
+        Default is 200.
+
+    Returns
+    -------
+    ftype : str or None
+        ``"gaussian"``, ``"nwchem"``, ``"orca"`` or ``"qchem"``,
+        or None if the format is not recognized.
+
+    See Also
+    --------
+    extract_coord :
+        Extract atomic symbols and coordinates from input file.
+
+    Examples
+    --------
+    >>> detect_format("Gaussian-Fe-distorted-complex.out")
+    'gaussian'
+
+    """
+    program = None
+    found = set()
+    has_atoms = True
+    with open(f, "r") as file:
+        for i, line in enumerate(file):
+            if program is None and i < head:
+                for ftype, banners in _BANNERS:
+                    if any(banner in line for banner in banners):
+                        program = ftype
+                        break
+            for ftype, marker in _MARKERS:
+                if marker in line:
+                    found.add(ftype)
+            # NWChem also needs a non-empty geometry, which is known only at the end
+            if program in found and program != "nwchem":
+                return program
+            if "No. of atoms" in line:
+                try:
+                    if not int(line.split()[4]):
+                        has_atoms = False
+                except (IndexError, ValueError):
+                    pass
+
+    if not has_atoms:
+        found.discard("nwchem")
+
+    if program in found:
+        return program
+
+    for ftype, _ in _MARKERS:
+        if ftype in found:
+            return ftype
+
+    return None
 
 
 def is_gaussian(f):
@@ -286,17 +856,16 @@ def is_gaussian(f):
     True
 
     """
-    gaussian_file = open(f, "r")
-    nline = gaussian_file.readlines()
 
-    for i in range(len(nline)):
-        if "Standard orientation:" in nline[i]:
-            return True
+    with open(f, "r") as gaussian_file:
+        for line in gaussian_file:
+            if "Standard orientation:" in line:
+                return True
 
     return False
 
 
-def get_coord_gaussian(f):
+def get_coord_gaussian(f, all_steps=False):
     """
     Extract XYZ coordinate from Gaussian output file.
 
@@ -305,12 +874,18 @@ def get_coord_gaussian(f):
     f : str
         User input filename.
 
+    all_steps : bool, optional
+        If True, read the geometry of every optimization step.
+        Otherwise only the final geometry is read.
+        Default is False.
+
     Returns
     -------
     atom : list
         Full atomic labels of complex.
     coord : array_like
-        Full atomic coordinates of complex.
+        Full atomic coordinates of complex, or an array of shape
+        (n_step, n_atom, 3) holding every optimization step if ``all_steps`` is True.
 
     Examples
     --------
@@ -328,34 +903,29 @@ def get_coord_gaussian(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    gaussian_file = open(f, "r")
-    nline = gaussian_file.readlines()
+    # Coordinate table starts 5 lines below 'Standard orientation:'
+    blocks = _read_blocks(f, "Standard orientation:", 4, "---", all_steps=all_steps)
 
-    start = 0
-    end = 0
     atom, coord = [], []
-    for i in range(len(nline)):
-        if "Standard orientation:" in nline[i]:
-            start = i
-
-    for i in range(start + 5, len(nline)):
-        if "---" in nline[i]:
-            end = i
-            break
-
-    for line in nline[start + 5 : end]:
-        data = line.split()
-        data1 = int(data[1])
-        coord_x = float(data[3])
-        coord_y = float(data[4])
-        coord_z = float(data[5])
-        data1 = elements.number_to_symbol(data1)
-        atom.append(data1)
-        coord.append([coord_x, coord_y, coord_z])
-
-    gaussian_file.close()
-
-    coord = np.asarray(coord, dtype=np.float64)
+    for block in blocks:
+        atom, xyz = [], []
+        for line in block:
+            data = line.split()
+            data1 = int(data[1])
+            coord_x = float(data[3])
+            coord_y = float(data[4])
+            coord_z = float(data[5])
+            data1 = elements.number_to_symbol(data1)
+            atom.append(data1)
+            xyz.append([coord_x, coord_y, coord_z])
+        coord.append(xyz)
+
+    if all_steps:
+        coord = np.asarray(coord, dtype=np.float64)
+    elif coord:
+        coord = np.asarray(coord[-1], dtype=np.float64)
+    else:
+        coord = np.asarray(coord, dtype=np.float64)
 
     return atom, coord
 
@@ -399,22 +969,20 @@ def is_nwchem(f):
     True
 
     """
-    nwchem_file = open(f, "r")
-    nline = nwchem_file.readlines()
 
-    for i in range(len(nline)):
-        if "No. of atoms" in nline[i]:
-            if not int(nline[i].split()[4]):
-                return False
+    is_converged = False
+    with open(f, "r") as nwchem_file:
+        for line in nwchem_file:
+            if "No. of atoms" in line:
+                if not int(line.split()[4]):
+                    return False
+            elif "Optimization converged" in line:
+                is_converged = True
 
-    for j in range(len(nline)):
-        if "Optimization converged" in nline[j]:
-            return True
-
-    return False
+    return is_converged
 
 
-def get_coord_nwchem(f):
+def get_coord_nwchem(f, all_steps=False):
     """
     Extract XYZ coordinate from NWChem output file.
 
@@ -423,12 +991,18 @@ def get_coord_nwchem(f):
     f : str
         User input filename.
 
+    all_steps : bool, optional
+        If True, read the geometry of every optimization step.
+        Otherwise only the final geometry is read.
+        Default is False.
+
     Returns
     -------
     atom : list
         Full atomic labels of complex.
     coord : array_like
-        Full atomic coordinates of complex.
+        Full atomic coordinates of complex, or an array of shape
+        (n_step, n_atom, 3) holding every optimization step if ``all_steps`` is True.
 
     Examples
     --------
@@ -446,36 +1020,48 @@ def get_coord_nwchem(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    nwchem_file = open(f, "r")
-    nline = nwchem_file.readlines()
+    with _mapped(f) as mm:
+        line = next(_tail(mm, "No. of atoms"), None)
+        natom = int(line.split()[4]) if line else 0
+
+        if not all_steps:
+            # The 1st line of coordinate is at 18 lines next to 'Optimization converged'
+            lines = _tail(mm, "Optimization converged")
+            blocks = list(
+                itertools.islice(
+                    _iter_blocks(lines, "Optimization converged", 17, nrow=natom), 1
+                )
+            )
+
+    if all_steps:
+        # Every step prints its geometry 4 lines below 'Output coordinates in angstroms'
+        with open(f, "r") as nwchem_file:
+            blocks = list(
+                _iter_blocks(
+                    nwchem_file, "Output coordinates in angstroms", 3, nrow=natom
+                )
+            )
 
-    start = 0
-    end = 0
     atom, coord = [], []
-    for i in range(len(nline)):
-        if "Optimization converged" in nline[i]:
-            start = i
-
-    for i in range(len(nline)):
-        if "No. of atoms" in nline[i]:
-            end = int(nline[i].split()[4])
-
-    start = start + 18
-    end = start + end
-    # The 1st line of coordinate is at 18 lines next to 'Optimization converged'
-    for line in nline[start:end]:
-        dat = line.split()
-        dat1 = int(float(dat[2]))
-        coord_x = float(dat[3])
-        coord_y = float(dat[4])
-        coord_z = float(dat[5])
-        dat1 = elements.number_to_symbol(dat1)
-        atom.append(dat1)
-        coord.append([coord_x, coord_y, coord_z])
-
-    nwchem_file.close()
-
-    coord = np.asarray(coord, dtype=np.float64)
+    for block in blocks:
+        atom, xyz = [], []
+        for line in block:
+            dat = line.split()
+            dat1 = int(float(dat[2]))
+            coord_x = float(dat[3])
+            coord_y = float(dat[4])
+            coord_z = float(dat[5])
+            dat1 = elements.number_to_symbol(dat1)
+            atom.append(dat1)
+            xyz.append([coord_x, coord_y, coord_z])
+        coord.append(xyz)
+
+    if all_steps:
+        coord = np.asarray(coord, dtype=np.float64)
+    elif coord:
+        coord = np.asarray(coord[-1], dtype=np.float64)
+    else:
+        coord = np.asarray(coord, dtype=np.float64)
 
     return atom, coord
 
@@ -515,16 +1101,16 @@ def is_orca(f):
     True
 
     """
-    orca_file = open(f, "r")
-    nline = orca_file.readlines()
-    for i in range(len(nline)):
-        if "CARTESIAN COORDINATES (ANGSTROEM)" in nline[i]:
-            return True
+
+    with open(f, "r") as orca_file:
+        for line in orca_file:
+            if "CARTESIAN COORDINATES (ANGSTROEM)" in line:
+                return True
 
     return False
 
 
-def get_coord_orca(f):
+def get_coord_orca(f, all_steps=False):
     """
     Extract XYZ coordinate from ORCA output file.
 
@@ -533,12 +1119,18 @@ def get_coord_orca(f):
     f : str
         User input filename.
 
+    all_steps : bool, optional
+        If True, read the geometry of every optimization step.
+        Otherwise only the final geometry is read.
+        Default is False.
+
     Returns
     -------
     atom : list
         Full atomic labels of complex.
     coord : array_like
-        Full atomic coordinates of complex.
+        Full atomic coordinates of complex, or an array of shape
+        (n_step, n_atom, 3) holding every optimization step if ``all_steps`` is True.
 
     Examples
     --------
@@ -556,33 +1148,30 @@ def get_coord_orca(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    orca_file = open(f, "r")
-    nline = orca_file.readlines()
+    # Coordinate table is closed by a blank line and the next '---' rule
+    blocks = _read_blocks(
+        f, "CARTESIAN COORDINATES (ANGSTROEM)", 1, "---", trim=1, all_steps=all_steps
+    )
 
-    start = 0
-    end = 0
     atom, coord = [], []
-    for i in range(len(nline)):
-        if "CARTESIAN COORDINATES (ANGSTROEM)" in nline[i]:
-            start = i
-
-    for i in range(start + 2, len(nline)):
-        if "---" in nline[i]:
-            end = i - 1
-            break
-
-    for line in nline[start + 2 : end]:
-        dat = line.split()
-        dat1 = dat[0]
-        coord_x = float(dat[1])
-        coord_y = float(dat[2])
-        coord_z = float(dat[3])
-        atom.append(dat1)
-        coord.append([coord_x, coord_y, coord_z])
-
-    orca_file.close()
-
-    coord = np.asarray(coord, dtype=np.float64)
+    for block in blocks:
+        atom, xyz = [], []
+        for line in block:
+            dat = line.split()
+            dat1 = dat[0]
+            coord_x = float(dat[1])
+            coord_y = float(dat[2])
+            coord_z = float(dat[3])
+            atom.append(dat1)
+            xyz.append([coord_x, coord_y, coord_z])
+        coord.append(xyz)
+
+    if all_steps:
+        coord = np.asarray(coord, dtype=np.float64)
+    elif coord:
+        coord = np.asarray(coord[-1], dtype=np.float64)
+    else:
+        coord = np.asarray(coord, dtype=np.float64)
 
     return atom, coord
 
@@ -624,17 +1213,16 @@ def is_qchem(f):
     True
 
     """
-    qchem_file = open(f, "r")
-    nline = qchem_file.readlines()
 
-    for i in range(len(nline)):
-        if "OPTIMIZATION CONVERGED" in nline[i]:
-            return True
+    with open(f, "r") as qchem_file:
+        for line in qchem_file:
+            if "OPTIMIZATION CONVERGED" in line:
+                return True
 
     return False
 
 
-def get_coord_qchem(f):
+def get_coord_qchem(f, all_steps=False):
     """
     Extract XYZ coordinate from Q-Chem output file.
 
@@ -643,12 +1231,18 @@ def get_coord_qchem(f):
     f : str
         User input filename.
 
+    all_steps : bool, optional
+        If True, read the geometry of every optimization step.
+        Otherwise only the final geometry is read.
+        Default is False.
+
     Returns
     -------
     atom : list
         Full atomic labels of complex.
     coord : array_like
-        Full atomic coordinates of complex.
+        Full atomic coordinates of complex, or an array of shape
+        (n_step, n_atom, 3) holding every optimization step if ``all_steps`` is True.
 
     Examples
     --------
@@ -666,33 +1260,33 @@ def get_coord_qchem(f):
            [18.364987, 13.407634,  2.249608]])
 
     """
-    orca_file = open(f, "r")
-    nline = orca_file.readlines()
+    if all_steps:
+        # Every step prints the same columns under 'Standard Nuclear Orientation'
+        blocks = _read_blocks(
+            f, "Standard Nuclear Orientation (Angstroms)", 2, "---", all_steps=True
+        )
+    else:
+        blocks = _read_blocks(f, "OPTIMIZATION CONVERGED", 4, "Z-matrix Print:", trim=1)
 
-    start = 0
-    end = 0
     atom, coord = [], []
-    for i in range(len(nline)):
-        if "OPTIMIZATION CONVERGED" in nline[i]:
-            start = i
-
-    for i in range(start + 5, len(nline)):
-        if "Z-matrix Print:" in nline[i]:
-            end = i - 1
-            break
-
-    for line in nline[start + 5 : end]:
-        dat = line.split()
-        dat1 = dat[1]
-        coord_x = float(dat[2])
-        coord_y = float(dat[3])
-        coord_z = float(dat[4])
-        atom.append(dat1)
-        coord.append([coord_x, coord_y, coord_z])
-
-    orca_file.close()
-
-    coord = np.asarray(coord, dtype=np.float64)
+    for block in blocks:
+        atom, xyz = [], []
+        for line in block:
+            dat = line.split()
+            dat1 = dat[1]
+            coord_x = float(dat[2])
+            coord_y = float(dat[3])
+            coord_z = float(dat[4])
+            atom.append(dat1)
+            xyz.append([coord_x, coord_y, coord_z])
+        coord.append(xyz)
+
+    if all_steps:
+        coord = np.asarray(coord, dtype=np.float64)
+    elif coord:
+        coord = np.asarray(coord[-1], dtype=np.float64)
+    else:
+        coord = np.asarray(coord, dtype=np.float64)
 
     return atom, coord
 
@@ -809,17 +1403,18 @@ def extract_coord(file=None):
             is_coord_correct = False
     # --- Other formats ---
     elif file.endswith(".out") or file.endswith(".log"):
+        ftype = detect_format(file)
         # Gaussian
-        if is_gaussian(file):
+        if ftype == "gaussian":
             atom, coord = get_coord_gaussian(file)
         # NWChem
-        elif is_nwchem(file):
+        elif ftype == "nwchem":
             atom, coord = get_coord_nwchem(file)
         # ORCA
-        elif is_orca(file):
+        elif ftype == "orca":
             atom, coord = get_coord_orca(file)
         # Q-Chem
-        elif is_qchem(file):
+        elif ftype == "qchem":
             atom, coord = get_coord_qchem(file)
         else:
             is_coord_correct = False
@@ -827,6 +1422,10 @@ def extract_coord(file=None):
         is_format_correct = False
         is_coord_correct = False
 
+    if not (is_ftype_correct and is_format_correct):
+        # popup imports tkinter, keep it out of headless use
+        from octadist.src import popup
+
     if not is_ftype_correct:
         popup.err_invalid_ftype()
 
@@ -842,18 +1441,22 @@ def extract_coord(file=None):
         return atom, coord
 
 
-def find_metal(atom=None, coord=None):
+def find_metal(atom=None, coord=None, metals=None):
     """
     Count the number of metal center atom in complex.
 
     Parameters
     ----------
     atom : list or None
-        Full atomic labels of complex.
+        Full atomic labels of complex, or atomic numbers.
         Default is None.
     coord : array_like or None
         Full atomic coordinates of complex.
         Default is None.
+    metals : str, int, or list of str and int, optional
+        Metals to look for, as atomic symbols, atomic numbers, or group names
+        such as "3d", see :func:`octadist.src.elements.metal_numbers`.
+        If None, look for all d- and f-block metals. Default is None.
 
     Returns
     -------
@@ -861,13 +1464,13 @@ def find_metal(atom=None, coord=None):
         Atomic labels of metal center atom.
     coord_metal : array_like
         Atomic coordinates of metal center atom.
-    index_metal : list
+    index_metal : ndarray
         Indices of metal atoms found.
 
     See Also
     --------
-    octadist.src.elements.check_atom :
-        Convert atomic number to atomic symbol and vice versa.
+    octadist.src.elements.metal_numbers :
+        Convert a set of metals to atomic numbers.
 
     Examples
     --------
@@ -879,33 +1482,29 @@ def find_metal(atom=None, coord=None):
                  [-2.18698286e+00,  4.34540478e+00,  1.69060811e+01],
                  [-1.17538286e+00,  6.38340478e+00,  1.56457811e+01],
                  [-2.75078286e+00,  2.50260478e+00,  1.51806811e+01]]
-    >>> atom_metal, coord_metal = find_metal(atom, coord)
+    >>> atom_metal, coord_metal, index_metal = find_metal(atom, coord)
     >>> atom_metal
     ['Fe']
     >>> coord_metal
     array([[-1.95348286,  4.51770478, 14.7855811 ]])
+    >>> index_metal
+    array([0])
+    >>> find_metal(atom, coord, metals="4d")[2]
+    array([], dtype=int64)
 
     """
     if atom is None or coord is None:
         raise TypeError("find_metal needs two arguments: atom, coord")
 
-    atom_metal = []
-    coord_metal = []
-    index_metal = []
+    numbers = np.asarray(atom)
+    if numbers.dtype.kind not in "iu":
+        numbers = elements.symbols_to_numbers(numbers)
 
-    for i in range(len(atom)):
-        number = elements.number_to_symbol(atom[i])
-        if (
-            21 <= number <= 30
-            or 39 <= number <= 48
-            or 57 <= number <= 80
-            or 89 <= number <= 109
-        ):
-            atom_metal.append(atom[i])
-            coord_metal.append(coord[i])
-            index_metal.append(i)
+    mask = np.isin(numbers, elements.metal_numbers(metals))
+    index_metal = np.flatnonzero(mask)
 
-    coord_metal = np.asarray(coord_metal, dtype=np.float64)
+    atom_metal = [atom[i] for i in index_metal]
+    coord_metal = np.asarray(coord, dtype=np.float64).reshape(-1, 3)[index_metal]
 
     return atom_metal, coord_metal, index_metal
 
@@ -995,3 +1594,173 @@ def extract_octa(atom, coord, ref_index=0, cutoff_ref_ligand=2.8):
     coord_octa = np.asarray(coord_octa, dtype=np.float64)
 
     return atom_octa, coord_octa
+
+
+def _periodic_halo(coord, lattice, cutoff):
+    """
+    Atoms of the unit cell wrapped into it, followed by the periodic images that lie
+    within cutoff of the cell faces, so that a neighbor search around any atom in the
+    cell finds all its neighbors under periodic boundary conditions.
+
+    Only images near the faces are generated, so the number of atoms grows with the
+    cell surface rather than with a full supercell.
+
+    Returns
+    -------
+    coord_halo : ndarray
+        Coordinates of the wrapped atoms and their images, shape (K, 3).
+        The first len(coord) rows are the wrapped atoms in input order.
+    index_halo : ndarray
+        Index of the atom of which each row is an image, shape (K,).
+    shift_halo : ndarray
+        Integer lattice translation of each row from the input coordinates, shape (K, 3).
+
+    """
+    frac = coord @ np.linalg.inv(lattice)
+    wrap = np.floor(frac)
+    frac -= wrap
+
+    # Perpendicular widths of the cell give the halo thickness in fractional units
+    cross = np.cross(lattice[[1, 2, 0]], lattice[[2, 0, 1]])
+    width = abs(np.linalg.det(lattice)) / np.linalg.norm(cross, axis=1)
+    margin = cutoff / width
+    n_image = np.ceil(margin).astype(int)
+
+    shifts = np.array(list(itertools.product(*(range(-n, n + 1) for n in n_image))))
+    # The zero shift, which keeps every atom, comes first
+    shifts = shifts[np.argsort(np.abs(shifts).sum(axis=1), kind="stable")]
+
+    index_halo = []
+    shift_halo = []
+    for shift in shifts:
+        image = frac + shift
+        keep = np.flatnonzero(np.all((image >= -margin) & (image < 1 + margin), axis=1))
+        index_halo.append(keep)
+        shift_halo.append(shift - wrap[keep])
+
+    index_halo = np.concatenate(index_halo)
+    shift_halo = np.concatenate(shift_halo)
+    coord_halo = coord[index_halo] + shift_halo @ lattice
+
+    return coord_halo, index_halo, shift_halo
+
+
+def extract_all_octa(
+    atom, coord, ref_index=None, cutoff_ref_ligand=2.8, metals=None, lattice=None
+):
+    """
+    Search the octahedral structures around many center atoms in one pass.
+
+    One KD-tree (:class:`scipy.spatial.cKDTree`) is built for the complex and the
+    seven nearest atoms within cutoff of every center atom are found with a single
+    query, which is much faster than calling :func:`extract_octa` once per metal.
+
+    If the lattice of a crystal is given, neighbors are searched under periodic
+    boundary conditions: the tree also holds the periodic images of atoms within
+    cutoff of the cell faces, so that center atoms near a face get complete octahedra
+    without building a supercell.
+
+    Parameters
+    ----------
+    atom : list
+        Full atomic labels of complex.
+    coord : array_like
+        Full atomic coordinates of complex.
+    ref_index : array_like of int, optional
+        Indices of the center atoms, Python-based index.
+        If None, use all metal atoms found by :func:`find_metal`.
+        Default is None.
+    cutoff_ref_ligand : float, optional
+        Cutoff distance for screening bond distance between reference and ligand atoms.
+        Default is 2.8.
+    metals : str, int, or list of str and int, optional
+        Metals used as center atoms if ref_index is None, see :func:`find_metal`.
+        Other atoms are skipped before the neighbor search. Default is None.
+    lattice : array_like, optional
+        Lattice vectors of the unit cell as rows, shape (3, 3), for example
+        from :func:`get_coord_cif`. If None, the complex is not periodic.
+        Default is None.
+
+    Returns
+    -------
+    index_octa : array_like
+        Atom indices of octahedral structures sorted by distance from the center atom,
+        shape (M, 7). The first index is the center atom. If fewer than six ligands are
+        found within cutoff, the missing entries are -1.
+    coord_octa : array_like
+        Atomic coordinates of octahedral structures, shape (M, 7, 3).
+        Coordinates of missing ligands are NaN. With a lattice, ligands are the
+        periodic images closest to the center atom, which keeps its input coordinates.
+
+    See Also
+    --------
+    extract_octa :
+        Extract the octahedral structure around one center atom.
+
+    Examples
+    --------
+    >>> atom, coord = extract_coord("Multiple-metals.xyz")
+    >>> index_octa, coord_octa = extract_all_octa(atom, coord)
+    >>> index_octa
+    array([[ 0,  6,  4,  1,  5,  7,  3],
+           [ 8, 10, 13, 11, 14, 12,  9],
+           [25, 27, 26, 31, 29, 28, 30]])
+    >>> coord_octa.shape
+    (3, 7, 3)
+
+    """
+    coord = np.asarray(coord, dtype=np.float64).reshape(-1, 3)
+
+    if ref_index is None:
+        _, _, ref_index = find_metal(atom, coord, metals)
+
+    ref_index = np.asarray(ref_index, dtype=np.intp).reshape(-1)
+
+    if np.any(ref_index < 0):
+        raise ValueError(
+            "index of the reference center atom must be equal or greater than zero"
+        )
+    elif np.any(ref_index >= len(atom)):
+        raise ValueError(
+            "index of the reference center atom is greater than the total number of atoms in the complex."
+        )
+
+    if len(ref_index) == 0:
+        return np.empty((0, 7), dtype=np.intp), np.empty((0, 7, 3))
+
+    # Lazy import to avoid requiring scipy unless octa extraction is used
+    from scipy.spatial import cKDTree
+
+    if lattice is None:
+        coord_halo = coord
+    else:
+        lattice = np.asarray(lattice, dtype=np.float64).reshape(3, 3)
+        coord_halo, index_halo, shift_halo = _periodic_halo(
+            coord, lattice, cutoff_ref_ligand
+        )
+
+    tree = cKDTree(coord_halo)
+    dist, index_octa = tree.query(
+        coord_halo[ref_index], k=7, distance_upper_bound=cutoff_ref_ligand
+    )
+
+    # Break ties by atom index, as the stable sort in extract_octa does
+    order = np.lexsort((index_octa, dist), axis=1)
+    dist = np.take_along_axis(dist, order, axis=1)
+    index_octa = np.take_along_axis(index_octa, order, axis=1)
+
+    missing = np.isinf(dist)
+    index_octa[missing] = 0
+
+    if lattice is None:
+        coord_octa = coord[index_octa]
+    else:
+        # Translate each octahedron back so that the center atom is where it was given
+        shift = shift_halo[index_octa] - shift_halo[ref_index][:, None]
+        index_octa = index_halo[index_octa]
+        coord_octa = coord[index_octa] + shift @ lattice
+
+    index_octa[missing] = -1
+    coord_octa[missing] = np.nan
+
+    return index_octa, coord_octa
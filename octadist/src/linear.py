@@ -15,7 +15,48 @@
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 import numpy as np
-from math import sqrt, pow, degrees, acos
+from math import sqrt, degrees, acos
+
+
+def dot_product(v1, v2):
+    """
+    Compute dot product of two vectors, or of two stacks of vectors along the last axis.
+
+    For stacks, the products are computed by the same kernel as :func:`numpy.dot`
+    on single vectors, so each element is bit-for-bit the scalar result.
+
+    Parameters
+    ----------
+    v1 : array_like
+        Vector in 3D space, or stack of vectors of shape (..., 3).
+    v2 : array_like
+        Vector in 3D space, or stack of vectors of shape (..., 3).
+
+    Returns
+    -------
+    product : float64 or array_like
+        Dot product, with the broadcast leading shape of ``v1`` and ``v2``.
+
+    Examples
+    --------
+    >>> dot_product([1, 2, 3], [4, 5, 6])
+    32.0
+    >>> dot_product([[1, 0, 0], [0, 2, 0]], [0, 1, 0])
+    array([0., 2.])
+
+    """
+    v1 = np.asarray(v1, dtype=np.float64)
+    v2 = np.asarray(v2, dtype=np.float64)
+
+    return (v1[..., np.newaxis, :] @ v2[..., :, np.newaxis])[..., 0, 0][()]
+
+
+def _unit(v):
+    """
+    Normalize vectors along the last axis.
+
+    """
+    return v / np.sqrt(dot_product(v, v))[..., np.newaxis]
 
 
 def angle_sign(v1, v2, direct):
@@ -25,16 +66,18 @@ def angle_sign(v1, v2, direct):
     Parameters
     ----------
     v1 : array_like
-        Vector in 3D space.
+        Vector in 3D space, or stack of vectors of shape (..., 3).
     v2 : array_like
-        Vector in 3D space.
+        Vector in 3D space, or stack of vectors of shape (..., 3).
     direct : array
-        Vector that refers to orientation of the plane.
+        Vector that refers to orientation of the plane, or stack of vectors
+        of shape (..., 3).
 
     Returns
     -------
-    angle : float64
+    angle : float64 or array_like
         Angle between two vectors in degree unit with sign.
+        For stacks, an array with the broadcast leading shape of the inputs.
 
     See Also
     --------
@@ -50,21 +93,19 @@ def angle_sign(v1, v2, direct):
     60.38697927455357
 
     """
-    v1 = np.asarray(v1, dtype=np.float64)
-    v2 = np.asarray(v2, dtype=np.float64)
+    v1 = _unit(np.asarray(v1, dtype=np.float64))
+    v2 = _unit(np.asarray(v2, dtype=np.float64))
+    v1, v2 = np.broadcast_arrays(v1, v2)
 
-    v1 = v1 / np.linalg.norm(v1)
-    v2 = v2 / np.linalg.norm(v2)
+    angle = np.degrees(np.arccos(np.clip(dot_product(v1, v2), -1.0, 1.0)))
 
-    angle = np.degrees(np.arccos(np.clip(np.dot(v1, v2), -1.0, 1.0)))
+    direct = np.broadcast_to(np.asarray(direct, dtype=np.float64), v1.shape)
+    matrix = np.stack([v1, v2, direct], axis=-2)
+    det = np.linalg.det(matrix)
 
-    matrix = np.array([v1, v2, direct], dtype=np.float64)
-    det = np.float64(np.linalg.det(matrix))
+    angle = np.where(det < 0, -angle, angle)
 
-    if det < 0:
-        angle = angle * -1
-
-    return angle
+    return angle[()]
 
 
 def angle_btw_vectors(v1, v2):
@@ -74,14 +115,15 @@ def angle_btw_vectors(v1, v2):
     Parameters
     ----------
     v1 : array_like
-        Vector in 3D space.
+        Vector in 3D space, or stack of vectors of shape (..., 3).
     v2 : array_like
-        Vector in 3D space.
+        Vector in 3D space, or stack of vectors of shape (..., 3).
 
     Returns
     -------
-    angle : float64
+    angle : float64 or array_like
         Angle between two vectors in degree unit.
+        For stacks, an array with the broadcast leading shape of the inputs.
 
     Examples
     --------
@@ -91,13 +133,10 @@ def angle_btw_vectors(v1, v2):
     95.62773246517462
 
     """
-    v1 = np.asarray(v1, dtype=np.float64)
-    v2 = np.asarray(v2, dtype=np.float64)
-
-    v1 = v1 / np.linalg.norm(v1)
-    v2 = v2 / np.linalg.norm(v2)
+    v1 = _unit(np.asarray(v1, dtype=np.float64))
+    v2 = _unit(np.asarray(v2, dtype=np.float64))
 
-    angle = np.degrees(np.arccos(np.clip(np.dot(v1, v2), -1.0, 1.0)), dtype=np.float64)
+    angle = np.degrees(np.arccos(np.clip(dot_product(v1, v2), -1.0, 1.0)))
 
     return angle
 
@@ -161,16 +200,17 @@ def triangle_area(a, b, c):
     Parameters
     ----------
     a : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
     b : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
     c : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
 
     Returns
     -------
-    area : float64
+    area : float64 or array_like
         The triangle area.
+        For stacks, an array with the broadcast leading shape of the inputs.
 
     Examples
     --------
@@ -188,12 +228,8 @@ def triangle_area(a, b, c):
 
     ab = b - a
     ac = c - a
-    value = (
-        pow(np.dot(ab[1], ac[2]) - np.dot(ab[2], ac[1]), 2)
-        + pow(np.dot(ab[2], ac[0]) - np.dot(ab[0], ac[2]), 2)
-        + pow(np.dot(ab[0], ac[1]) - np.dot(ab[1], ac[0]), 2)
-    )
+    value = np.sum(np.cross(ab, ac) ** 2, axis=-1)
 
-    area = np.float64(sqrt(value) / 2)
+    area = np.sqrt(value) / 2
 
     return area
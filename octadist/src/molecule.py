@@ -0,0 +1,306 @@
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import numpy as np
+
+from octadist.src import elements, io
+
+
+def _labels_to_numbers(labels):
+    """
+    Convert atomic labels such as 'Fe', 'FE' or 'Fe1' to atomic numbers.
+    Labels that are not an element give 0.
+
+    """
+    numbers = elements.symbols_to_numbers(labels)
+
+    # Only labels that are not plain symbols are cleaned up one by one
+    for i in np.flatnonzero(numbers == 0):
+        symbol = "".join(c for c in str(labels[i]) if c.isalpha()).capitalize()
+        numbers[i] = elements.SYMBOL_TO_NUMBER.get(symbol, 0)
+
+    return numbers
+
+
+class Structure:
+    """
+    Compact container of a complex: atomic numbers as int8 and atomic coordinates
+    as one contiguous float64 array of shape (N, 3).
+
+    A structure unpacks to atomic labels and coordinates like the
+    ``[atom, coord]`` pairs it replaces, so ``atom, coord = structure``,
+    ``structure[0]`` and ``structure[1]`` keep working.
+
+    Labels that are not plain element symbols, such as 'Fe1', 'FE', or dummy
+    atoms 'X' and 'Bq', are kept as given next to the atomic numbers, and are
+    returned unchanged by :attr:`atom`. Their atomic number is that of the element
+    they name, or 0 if they name none.
+
+    Parameters
+    ----------
+    atom : list of str or array_like of int
+        Atomic labels or atomic numbers.
+    coord : array_like
+        Atomic coordinates.
+    name : str, optional
+        Name of the structure, for example the input file name. Default is None.
+    lattice : array_like, optional
+        Lattice vectors as rows, shape (3, 3), if the structure is a periodic crystal.
+        Default is None.
+
+    Examples
+    --------
+    >>> complex = Structure(['Fe', 'O', 'O', 'N', 'N', 'N', 'N', 'C'], coord)
+    >>> complex.numbers
+    array([26,  8,  8,  7,  7,  7,  7,  6], dtype=int8)
+    >>> atom, coord = complex
+    >>> octa = complex.octahedra()[0]
+    >>> octa.atom
+    ['Fe', 'O', 'O', 'N', 'N', 'N', 'N']
+
+    """
+
+    __slots__ = ("numbers", "coord", "name", "lattice", "labels")
+
+    def __init__(self, atom, coord, name=None, lattice=None):
+        atom = np.asarray(atom)
+        self.labels = None
+        if atom.dtype.kind not in "iu":
+            labels = atom.astype(str).reshape(-1)
+            atom = _labels_to_numbers(labels)
+            # Only keep the labels if they cannot be recovered from the numbers
+            if np.any(elements.numbers_to_symbols(atom) != labels):
+                self.labels = labels
+
+        self.numbers = np.asarray(atom, dtype=np.int8).reshape(-1)
+        self.coord = np.ascontiguousarray(coord, dtype=np.float64).reshape(-1, 3)
+        self.name = name
+        self.lattice = lattice
+        if lattice is not None:
+            self.lattice = np.asarray(lattice, dtype=np.float64).reshape(3, 3)
+
+        if len(self.numbers) != len(self.coord):
+            raise ValueError(
+                "number of atomic labels and number of atomic coordinates must be equal"
+            )
+
+    @classmethod
+    def from_file(cls, file):
+        """
+        Read a structure from input file, see :func:`octadist.src.io.extract_coord`.
+        The lattice of CIF files is kept, so that octahedra are searched under
+        periodic boundary conditions.
+
+        Parameters
+        ----------
+        file : str
+            Input file name.
+
+        Returns
+        -------
+        structure : Structure
+            Structure named after the input file.
+
+        """
+        lattice = None
+        if file.endswith(".cif") and io.is_cif(file):
+            atom, coord, lattice = io.get_coord_cif(file, return_lattice=True)
+        else:
+            atom, coord = io.extract_coord(file)
+        if len(atom) == 0:
+            coord = np.empty((0, 3))
+
+        return cls(atom, coord, name=file, lattice=lattice)
+
+    @property
+    def atom(self):
+        """
+        Atomic labels as given, or atomic symbols, as a list of str.
+
+        """
+        if self.labels is not None:
+            return self.labels.tolist()
+
+        return elements.numbers_to_symbols(self.numbers).tolist()
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __iter__(self):
+        yield self.atom
+        yield self.coord
+
+    def __getitem__(self, i):
+        return (self.atom, self.coord)[i]
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r}, n_atom={len(self)})"
+
+    def octahedra(self, ref_index=None, cutoff_ref_ligand=2.8, metals=None):
+        """
+        Find the octahedra around center atoms, see :func:`octadist.src.io.extract_all_octa`.
+
+        Parameters
+        ----------
+        ref_index : array_like of int, optional
+            Indices of the center atoms. If None, use all metal atoms.
+            Default is None.
+        cutoff_ref_ligand : float, optional
+            Cutoff distance for screening bond distance between reference and ligand atoms.
+            Default is 2.8.
+        metals : str, int, or list of str and int, optional
+            Metals used as center atoms if ref_index is None,
+            see :func:`octadist.src.io.find_metal`. Default is None.
+
+        Returns
+        -------
+        octahedra : list of Octahedron
+            Octahedra with six ligands found within cutoff.
+            Incomplete octahedra are left out.
+
+        """
+        if ref_index is None:
+            _, _, ref_index = io.find_metal(self.numbers, self.coord, metals)
+
+        index_octa, coord_octa = io.extract_all_octa(
+            self.numbers, self.coord, ref_index, cutoff_ref_ligand, lattice=self.lattice
+        )
+
+        return [
+            Octahedron.from_coord(self, index, coord)
+            for index, coord in zip(index_octa, coord_octa)
+            if np.all(index >= 0)
+        ]
+
+
+class Octahedron:
+    """
+    Octahedron in a :class:`Structure`, stored as indices of its seven atoms into
+    the parent structure instead of a copy of their coordinates. In a periodic
+    structure, ligands may be periodic images, stored as lattice translations.
+
+    Like :class:`Structure`, it unpacks to atomic symbols and coordinates:
+    ``atom_octa, coord_octa = octahedron``.
+
+    Parameters
+    ----------
+    structure : Structure
+        Parent structure.
+    index : array_like of int
+        Indices of the metal center atom and its six ligands in the parent structure.
+    image : array_like of int, optional
+        Lattice translation of each atom, shape (7, 3), if the parent structure is
+        periodic. Default is None.
+
+    """
+
+    __slots__ = ("structure", "index", "image")
+
+    def __init__(self, structure, index, image=None):
+        self.structure = structure
+        self.index = np.asarray(index, dtype=np.intp).reshape(-1)
+        self.image = image
+        if image is not None:
+            self.image = np.asarray(image, dtype=np.int8).reshape(-1, 3)
+
+    @classmethod
+    def from_coord(cls, structure, index, coord):
+        """
+        Create an octahedron from atom indices and coordinates, for example
+        from :func:`octadist.src.io.extract_all_octa`, storing the lattice
+        translations of periodic images instead of the coordinates.
+
+        Parameters
+        ----------
+        structure : Structure
+            Parent structure.
+        index : array_like of int
+            Indices of the metal center atom and its six ligands in the parent structure.
+        coord : array_like
+            Atomic coordinates of octahedral structure, shape (7, 3).
+
+        Returns
+        -------
+        octahedron : Octahedron
+
+        """
+        if structure.lattice is None:
+            return cls(structure, index)
+
+        shift = np.asarray(coord) - structure.coord[index]
+        image = np.rint(shift @ np.linalg.inv(structure.lattice))
+
+        return cls(structure, index, image if np.any(image) else None)
+
+    @property
+    def numbers(self):
+        """
+        Atomic numbers, gathered from the parent structure.
+
+        """
+        return self.structure.numbers[self.index]
+
+    @property
+    def coord(self):
+        """
+        Atomic coordinates of shape (7, 3), gathered from the parent structure.
+
+        """
+        if self.image is None:
+            return self.structure.coord[self.index]
+
+        return self.structure.coord[self.index] + self.image @ self.structure.lattice
+
+    @property
+    def atom(self):
+        """
+        Atomic labels as given to the parent structure, or atomic symbols,
+        as a list of str.
+
+        """
+        if self.structure.labels is not None:
+            return self.structure.labels[self.index].tolist()
+
+        return elements.numbers_to_symbols(self.numbers).tolist()
+
+    @property
+    def metal_index(self):
+        """
+        Index of the metal center atom in the parent structure.
+
+        """
+        return int(self.index[0])
+
+    @property
+    def metal(self):
+        """
+        Atomic symbol of the metal center atom.
+
+        """
+        return elements.number_to_symbol(self.structure.numbers[self.index[0]])
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        yield self.atom
+        yield self.coord
+
+    def __getitem__(self, i):
+        return (self.atom, self.coord)[i]
+
+    def __repr__(self):
+        return f"{type(self).__name__}(metal={self.metal!r}, metal_index={self.metal_index})"
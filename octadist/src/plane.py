@@ -14,11 +14,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-import functools
-import scipy.optimize
-
 import numpy as np
 
+from octadist.src import linear
+
 
 def find_eq_of_plane(x, y, z):
     """
@@ -39,22 +38,24 @@ def find_eq_of_plane(x, y, z):
     Parameters
     ----------
     x : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
     y : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
     z : array_like
-        3D Coordinate of point.
+        3D Coordinate of point, or stack of points of shape (..., 3).
 
     Returns
     -------
-    a : float64
+    a : float64 or array_like
         Coefficient of the equation of the plane.
-    b : float64
+    b : float64 or array_like
         Coefficient of the equation of the plane.
-    c : float64
+    c : float64 or array_like
         Coefficient of the equation of the plane.
-    d : float64
+    d : float64 or array_like
         Coefficient of the equation of the plane.
+        For stacks, each coefficient is an array with the broadcast leading shape
+        of the inputs.
 
     Examples
     --------
@@ -80,13 +81,68 @@ def find_eq_of_plane(x, y, z):
     xy = y - x
 
     cross_vector = np.cross(xz, xy)
-    a, b, c = cross_vector
+    a, b, c = np.moveaxis(cross_vector, -1, 0)
 
-    d = np.dot(cross_vector, z)
+    d = linear.dot_product(cross_vector, z)
 
     return a, b, c, d
 
 
+def fit_plane(coord):
+    """
+    Find the least-squares plane through a set of points, or through each set of a stack.
+
+    The plane passes through the centroid of the points and its normal is the
+    right singular vector of the centered points with the smallest singular value,
+    which minimizes the sum of squared orthogonal distances of the points to the plane.
+    This is exact (no iterative solver) and works for planes of any orientation.
+
+    Parameters
+    ----------
+    coord : array_like
+        Coordinates of points, shape (n, 3) with n >= 3,
+        or a stack of point sets, shape (..., n, 3).
+
+    Returns
+    -------
+    normal : ndarray
+        Unit normal of the plane, shape (3,) or (..., 3).
+        The sign is chosen so that its largest component is positive.
+    centroid : ndarray
+        Centroid of the points, a point on the plane, shape (3,) or (..., 3).
+
+    See Also
+    --------
+    find_fit_plane :
+        Find best fit plane and a surface patch to draw it.
+
+    Examples
+    --------
+    >>> points = [(1.1, 2.1, 8.1),
+                  (3.2, 4.2, 8.0),
+                  (5.3, 1.3, 8.2),
+                  (3.4, 2.4, 8.3),
+                  (1.5, 4.5, 8.0),
+                  (5.5, 6.7, 4.5)
+                  ]
+    >>> normal, centroid = fit_plane(points)
+    >>> normal
+    array([0.27776387, 0.48709341, 0.82800196])
+
+    """
+    coord = np.asarray(coord, dtype=np.float64)
+
+    centroid = np.mean(coord, axis=-2)
+    _, _, vh = np.linalg.svd(coord - centroid[..., np.newaxis, :])
+    normal = vh[..., -1, :]
+    largest = np.take_along_axis(
+        normal, np.argmax(np.abs(normal), axis=-1)[..., np.newaxis], axis=-1
+    )
+    normal = np.where(largest < 0, -normal, normal)
+
+    return normal, centroid
+
+
 def find_fit_plane(coord):
     """
     Find best fit plane to the given data points (atoms).
@@ -98,19 +154,20 @@ def find_fit_plane(coord):
 
     Returns
     -------
-    xx : float
-        Coefficient of the surface.
-    yy : float
-        Coefficient of the surface.
-    z : float
-        Coefficient of the surface.
+    xx : array_like
+        X coordinates of the corners of a square patch of the plane, shape (2, 2).
+    yy : array_like
+        Y coordinates of the corners of the patch, shape (2, 2).
+    z : array_like
+        Z coordinates of the corners of the patch, shape (2, 2).
     abcd : tuple
-        Coefficient of the equation of the plane.
+        Coefficient of the equation of the plane, ``a*x + b*y + c*z + d = 0``,
+        where (a, b, c) is the unit normal of the plane.
 
     See Also
     --------
-    scipy.optimize.minimize :
-        Used to find the least-square plane.
+    fit_plane :
+        Least-squares plane of a set of points, or of a stack of sets.
 
     Examples
     --------
@@ -121,52 +178,29 @@ def find_fit_plane(coord):
                   (1.5, 4.5, 8.0),
                   (5.5, 6.7, 4.5)
                   ]
+    >>> xx, yy, z, abcd = find_fit_plane(points)
     >>> # To plot the plane, run following commands:
     >>> import matplotlib.pyplot as plt
-    >>> # map coordinates for scattering plot
+    >>> ax = plt.figure().add_subplot(projection="3d")
+    >>> ax.plot_surface(xx, yy, z, alpha=0.2)
     >>> xs, ys, zs = zip(*points)
-    >>> plt.scatter(xs, ys, zs)
+    >>> ax.scatter(xs, ys, zs)
     >>> plt.show()
 
     """
-
-    def plane(x, y, params):
-        a = params[0]
-        b = params[1]
-        c = params[2]
-        z = a * x + b * y + c
-        return z
-
-    def error(params, points):
-        result = 0
-        for x, y, z in points:
-            plane_z = plane(x, y, params)
-            diff = abs(plane_z - z)
-            result += diff**2
-        return result
-
-    def cross(a, b):
-        return [
-            a[1] * b[2] - a[2] * b[1],
-            a[2] * b[0] - a[0] * b[2],
-            a[0] * b[1] - a[1] * b[0],
-        ]
-
-    points = coord
-
-    fun = functools.partial(error, points=points)
-    params0 = [0, 0, 0]
-    res = scipy.optimize.minimize(fun, params0)
-
-    a = res.x[0]
-    b = res.x[1]
-    c = res.x[2]
-
-    point = np.array([0.0, 0.0, c])
-    normal = np.array(cross([1, 0, a], [0, 1, b]))
-    d = -point.dot(normal)
-    xx, yy = np.meshgrid([-5, 10], [-5, 10])
-    z = (-normal[0] * xx - normal[1] * yy - d) * 1.0 / normal[2]
+    coord = np.asarray(coord, dtype=np.float64)
+    normal, centroid = fit_plane(coord)
+
+    a, b, c = normal
+    d = 0.0 - np.dot(normal, centroid)
+
+    # Square patch of the plane around the centroid that covers the points,
+    # spanned by the two in-plane singular vectors
+    _, _, vh = np.linalg.svd(coord - centroid)
+    half = np.max(np.linalg.norm(coord - centroid, axis=1)) + 1.0
+    s, t = np.meshgrid([-half, half], [-half, half])
+    patch = centroid + s[..., np.newaxis] * vh[0] + t[..., np.newaxis] * vh[1]
+    xx, yy, z = patch[..., 0], patch[..., 1], patch[..., 2]
 
     abcd = (a, b, c, d)
 
@@ -191,3 +191,26 @@ def warn_no_metal(i):
 def warn_not_octa():
     """Show this warning popup if the complex is non-octahedral structure."""
     showwarning("Warning", "Non-octahedral structure detected!")
+
+
+def warn_task_messages(task, messages, n_show=10):
+    """Show one warning popup summarizing the warnings of a finished task.
+
+    Parameters
+    ----------
+    task : str
+        Name of the task.
+    messages : list of str
+        Warnings, one line each.
+    n_show : int, optional
+        Maximum number of warnings listed in the popup. Default is 10.
+
+    """
+    text = "\n".join(messages[:n_show])
+    if len(messages) > n_show:
+        text += f"\n... and {len(messages) - n_show} more."
+    showwarning(
+        "Warning",
+        f"{task}: {len(messages)} warning(s).\n\n{text}\n\n"
+        "All warnings are listed in the result box.",
+    )
@@ -16,6 +16,8 @@
 
 import numpy as np
 
+from octadist.src import linear
+
 
 def project_atom_onto_line(p, a, b):
     """
@@ -79,20 +81,22 @@ def project_atom_onto_plane(p, a, b, c, d):
     Parameters
     ----------
     p : array_like
-        Point to project.
-    a : int or float
+        Point to project, or stack of points of shape (..., 3).
+    a : int or float or array_like
         Coefficient of the equation of the plane.
-    b : int or float
+    b : int or float or array_like
         Coefficient of the equation of the plane.
-    c : int or float
+    c : int or float or array_like
         Coefficient of the equation of the plane.
-    d : int or float
+    d : int or float or array_like
         Coefficient of the equation of the plane.
+        For a stack of planes, the coefficients have the leading shape of ``p``
+        (or broadcast to it).
 
     Returns
     -------
     projected_point: array_like
-        The projected point on the orthogonal plane.
+        The projected point on the orthogonal plane, shape of ``p``.
 
     Examples
     --------
@@ -108,10 +112,13 @@ def project_atom_onto_plane(p, a, b, c, d):
 
     """
     p = np.asarray(p, dtype=np.float64)
-    plane = np.array([a, b, c], dtype=np.float64)
+    a, b, c, d = (np.asarray(x, dtype=np.float64) for x in (a, b, c, d))
+    plane = np.stack(np.broadcast_arrays(a, b, c), axis=-1)
 
-    lambda_plane = (d - (a * p[0] + b * p[1] + c * p[2])) / np.dot(plane, plane)
+    lambda_plane = (
+        d - (a * p[..., 0] + b * p[..., 1] + c * p[..., 2])
+    ) / linear.dot_product(plane, plane)
 
-    projected_point = p + lambda_plane * plane
+    projected_point = p + lambda_plane[..., np.newaxis] * plane
 
     return projected_point
@@ -17,6 +17,7 @@
 import tkinter as tk
 from tkinter import scrolledtext as tkscrolled
 
+import numpy as np
 from scipy.spatial import distance
 
 from octadist.src import linear, util
@@ -237,22 +238,28 @@ class StructParam:
 
         self.box.insert(tk.END, "\n\nBond angle (°)")
 
-        # Bond angle.
-        for i in range(len(coord)):
-            for j in range(i + 1, len(coord)):
-                for k in range(j + 1, 7):
-                    vec1 = coord[i] - coord[j]
-                    vec2 = coord[k] - coord[j]
-                    angle = linear.angle_btw_vectors(vec1, vec2)
+        # Bond angle, all triples at once
+        coord = np.asarray(coord, dtype=np.float64)
+        triples = np.array(
+            [
+                (i, j, k)
+                for i in range(len(coord))
+                for j in range(i + 1, len(coord))
+                for k in range(j + 1, 7)
+            ]
+        )
+        first, second, third = triples.T
+        all_angle = linear.angle_btw_vectors(
+            coord[first] - coord[second], coord[third] - coord[second]
+        )
 
-                    if i == 0:
-                        texts = f"{atom[k]}{k}-{atom[i]}-{atom[j]}{j}\t\t{angle:10.6f}"
-                    else:
-                        texts = (
-                            f"{atom[k]}{k}-{atom[i]}{i}-{atom[j]}{j}\t\t{angle:10.6f}"
-                        )
+        for (i, j, k), angle in zip(triples, all_angle):
+            if i == 0:
+                texts = f"{atom[k]}{k}-{atom[i]}-{atom[j]}{j}\t\t{angle:10.6f}"
+            else:
+                texts = f"{atom[k]}{k}-{atom[i]}{i}-{atom[j]}{j}\t\t{angle:10.6f}"
 
-                    self.box.insert(tk.END, "\n" + texts)
+            self.box.insert(tk.END, "\n" + texts)
 
         self.box.insert(tk.END, "\n\n=================================\n\n")
 
@@ -361,9 +368,11 @@ class SurfaceArea:
 
         self.box.insert(tk.END, "\t\tAtoms*\t\tArea (Å³)\n")
 
+        c_ref = np.asarray(c_ref, dtype=np.float64)
+        all_area = linear.triangle_area(c_ref[:, 0], c_ref[:, 1], c_ref[:, 2])
+
         total_area = 0
-        for i in range(8):
-            area = linear.triangle_area(c_ref[i][0], c_ref[i][1], c_ref[i][2])
+        for i, area in enumerate(all_area):
             self.box.insert(
                 tk.END, f"Face no. {i + 1}:\t\t{a_ref[i]}\t\t{area:10.6f}\n"
             )
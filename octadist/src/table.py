@@ -0,0 +1,336 @@
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+
+class TableModel:
+    """
+    Rows of a results table, stored column by column, with sorting and paging.
+
+    The model holds the data and the display order only. A view renders one page
+    of rows at a time, so the cost of showing the table does not grow with the
+    number of rows.
+
+    Parameters
+    ----------
+    columns : list of str
+        Column names.
+    page_size : int, optional
+        Number of rows per page. Default is 200.
+
+    Examples
+    --------
+    >>> model = TableModel(["metal", "zeta"], page_size=2)
+    >>> model.append(metal="Fe", zeta=0.23)
+    >>> model.append(metal="Co", zeta=0.11)
+    >>> model.append(metal="Fe", zeta=0.55)
+    >>> model.sort("zeta")
+    >>> model.page_rows(0)
+    array([1, 0])
+    >>> model.n_page
+    2
+
+    """
+
+    def __init__(self, columns, page_size=200):
+        self.columns = list(columns)
+        self.page_size = page_size
+        self.data = {c: [] for c in self.columns}
+        self.sort_column = None
+        self.descending = False
+        self.version = 0
+        self._order = None
+
+    def __len__(self):
+        return len(self.data[self.columns[0]])
+
+    def _changed(self):
+        self.version += 1
+        self._order = None
+
+    def clear(self):
+        """
+        Remove all rows.
+
+        """
+        self.data = {c: [] for c in self.columns}
+        self._changed()
+
+    def append(self, **values):
+        """
+        Add a row. Columns that are not given are left empty (None).
+
+        """
+        for c in self.columns:
+            self.data[c].append(values.get(c))
+        self._changed()
+
+    def update(self, row, **values):
+        """
+        Set values of an existing row.
+
+        Parameters
+        ----------
+        row : int
+            Row index, in the order the rows were added.
+        values
+            New values, by column name.
+
+        """
+        for c, value in values.items():
+            self.data[c][row] = value
+        self.version += 1
+        if self.sort_column in values:
+            self._order = None
+
+    def sort(self, column, descending=None):
+        """
+        Sort the rows by a column. Empty values are always put last.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        descending : bool, optional
+            Sort order. If None, sort ascending, or toggle the order if the table
+            is already sorted by this column. Default is None.
+
+        """
+        if descending is None:
+            descending = column == self.sort_column and not self.descending
+
+        self.sort_column = column
+        self.descending = descending
+        self._changed()
+
+    def order(self):
+        """
+        Row indices in display order.
+
+        Returns
+        -------
+        order : ndarray
+            Indices of all rows, sorted by the sort column if set.
+
+        """
+        n = len(self)
+        if self._order is not None and len(self._order) == n:
+            return self._order
+
+        if self.sort_column is None:
+            self._order = np.arange(n)
+            return self._order
+
+        values = self.data[self.sort_column]
+        empty = np.array([v is None for v in values], dtype=bool)
+        try:
+            key = np.array([np.nan if v is None else v for v in values], dtype=float)
+            # NaN is sorted last, also in descending order
+            order = np.argsort(-key if self.descending else key, kind="stable")
+        except (TypeError, ValueError):
+            key = np.array(["" if v is None else str(v) for v in values])
+            order = np.argsort(key, kind="stable")
+            if self.descending:
+                order = order[::-1]
+            order = np.concatenate([order[~empty[order]], order[empty[order]]])
+
+        self._order = order
+        return order
+
+    @property
+    def n_page(self):
+        """
+        Number of pages, at least one.
+
+        """
+        return max(1, -(-len(self) // self.page_size))
+
+    def page_rows(self, page):
+        """
+        Row indices shown on a page.
+
+        Parameters
+        ----------
+        page : int
+            Page number, starting from 0.
+
+        Returns
+        -------
+        rows : ndarray
+            Indices of the rows on the page, in display order.
+
+        """
+        start = page * self.page_size
+        return self.order()[start : start + self.page_size]
+
+
+class ResultTable(tk.Frame):
+    """
+    Paged table of results, rendered with a ttk.Treeview.
+
+    Only the rows of the current page are inserted into the Treeview and they are
+    formatted when the page is shown, so tens of thousands of results are kept as
+    plain values in a :class:`TableModel` instead of as widget items. Clicking a
+    column heading sorts the table by that column.
+
+    Parameters
+    ----------
+    master : tkinter widget
+        Parent widget.
+    columns : list of tuple
+        Column definitions as (name, heading, width, format). Format is a
+        format string such as ``"{:9.4f}"``, or None to show values with str.
+    page_size : int, optional
+        Number of rows per page. Default is 200.
+    height : int, optional
+        Number of visible rows. Default is 10.
+    on_select : callable, optional
+        Called with the row index when a row is selected. Default is None.
+
+    """
+
+    def __init__(self, master, columns, page_size=200, height=10, on_select=None):
+        super().__init__(master)
+
+        names = [c[0] for c in columns]
+        self.headings = {c[0]: c[1] for c in columns}
+        self.formats = {c[0]: c[3] for c in columns}
+        self.model = TableModel(names, page_size)
+        self.on_select = on_select
+        self.page = 0
+        self._rendered = None
+
+        self.tree = ttk.Treeview(
+            self, columns=names, show="headings", height=height, selectmode="browse"
+        )
+        for name, heading, width, _ in columns:
+            self.tree.heading(name, text=heading, command=lambda c=name: self.sort(c))
+            anchor = tk.W if self.formats[name] is None else tk.E
+            self.tree.column(name, width=width, minwidth=30, anchor=anchor)
+        self.tree.grid(sticky=tk.NSEW, row=0, column=0)
+        self.tree.bind("<<TreeviewSelect>>", self._select)
+
+        scroll = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        scroll.grid(sticky=tk.NS, row=0, column=1)
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        # Paging controls
+        pager = tk.Frame(self)
+        pager.grid(pady="2", sticky=tk.EW, row=1, column=0, columnspan=2)
+
+        for text, command in (
+            ("<<", lambda: self.show_page(0)),
+            ("<", lambda: self.show_page(self.page - 1)),
+            (">", lambda: self.show_page(self.page + 1)),
+            (">>", lambda: self.show_page(self.model.n_page - 1)),
+        ):
+            btn = ttk.Button(pager, text=text, command=command, width=3)
+            btn.pack(side=tk.LEFT)
+
+        self.lbl_page = tk.Label(pager, text="")
+        self.lbl_page.pack(side=tk.LEFT, padx="10")
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+    def clear(self):
+        """
+        Remove all rows.
+
+        """
+        self.model.clear()
+        self.page = 0
+        self.refresh()
+
+    def append(self, **values):
+        """
+        Add a row, see :meth:`TableModel.append`. Call :meth:`refresh` to show it.
+
+        """
+        self.model.append(**values)
+
+    def update(self, row, **values):
+        """
+        Set values of a row, see :meth:`TableModel.update`.
+        Call :meth:`refresh` to show them.
+
+        """
+        self.model.update(row, **values)
+
+    def sort(self, column):
+        """
+        Sort by a column, or reverse the order if already sorted by it.
+
+        """
+        self.model.sort(column)
+
+        for name, heading in self.headings.items():
+            if name == column:
+                heading += " ▼" if self.model.descending else " ▲"
+            self.tree.heading(name, text=heading)
+
+        self.refresh()
+
+    def show_page(self, page):
+        """
+        Show a page, clamped to the existing pages.
+
+        """
+        self.page = min(max(page, 0), self.model.n_page - 1)
+        self._rendered = None
+        self.refresh()
+
+    def _format(self, name, value):
+        if value is None:
+            return ""
+        fmt = self.formats[name]
+        return str(value) if fmt is None else fmt.format(value)
+
+    def refresh(self):
+        """
+        Render the current page again if the data has changed since it was shown.
+        This is cheap enough to call after every batch of new results.
+
+        """
+        self.page = min(self.page, self.model.n_page - 1)
+        state = (self.model.version, self.page)
+        if state == self._rendered:
+            return
+        self._rendered = state
+
+        self.tree.delete(*self.tree.get_children())
+        data = self.model.data
+        names = self.model.columns
+        for row in self.model.page_rows(self.page):
+            values = [self._format(c, data[c][row]) for c in names]
+            self.tree.insert("", tk.END, iid=str(row), values=values)
+
+        n = len(self.model)
+        start = self.page * self.model.page_size
+        end = min(start + self.model.page_size, n)
+        self.lbl_page.configure(
+            text=f"Rows {start + 1 if n else 0}-{end} of {n}"
+            f"    Page {self.page + 1}/{self.model.n_page}"
+        )
+
+    def _select(self, event):
+        selection = self.tree.selection()
+        if selection and self.on_select is not None:
+            self.on_select(int(selection[0]))
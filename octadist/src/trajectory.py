@@ -0,0 +1,348 @@
+# OctaDist  Copyright (C) 2019-2026  Rangsiman Ketkaew et al.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import numpy as np
+
+from octadist.src import calc, io
+
+# Parameters computed for every frame by default, see calc.CalcDistortionBatch
+DEFAULT_PARAMS = ["zeta", "delta", "sigma", "theta", "oct_vol"]
+
+
+class RunningStats:
+    """
+    Running count, mean, variance, minimum, maximum and histogram of a stream of
+    values, updated one chunk at a time without keeping the values.
+
+    Chunks are merged with the pairwise update of Chan et al., which is the
+    chunked form of Welford's algorithm and is numerically stable. NaN values,
+    for example of octahedra that are incomplete in some frames, are skipped.
+
+    Parameters
+    ----------
+    shape : tuple of int, optional
+        Shape of one value, for example (M,) for one value per metal center.
+        Default is ().
+    bins : array_like, optional
+        Bin edges of the histogram. Values outside the edges are not counted.
+        If None, no histogram is kept. Default is None.
+
+    Examples
+    --------
+    >>> stats = RunningStats(shape=(2,), bins=np.linspace(0, 1, 11))
+    >>> stats.update(np.random.rand(100, 2))
+    >>> stats.update(np.random.rand(50, 2))
+    >>> stats.count
+    array([150, 150])
+    >>> stats.hist.shape
+    (2, 10)
+
+    """
+
+    def __init__(self, shape=(), bins=None):
+        self.count = np.zeros(shape, dtype=np.int64)
+        self._mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+        self.min = np.full(shape, np.nan)
+        self.max = np.full(shape, np.nan)
+
+        self.bins = None
+        self.hist = None
+        if bins is not None:
+            self.bins = np.asarray(bins, dtype=np.float64)
+            self.hist = np.zeros(tuple(shape) + (len(self.bins) - 1,), dtype=np.int64)
+
+    @property
+    def mean(self):
+        """
+        Mean, NaN where no value has been seen.
+
+        """
+        return np.where(self.count > 0, self._mean, np.nan)
+
+    @property
+    def var(self):
+        """
+        Population variance, NaN where no value has been seen.
+
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.m2 / self.count, np.nan)
+
+    @property
+    def std(self):
+        """
+        Population standard deviation.
+
+        """
+        return np.sqrt(self.var)
+
+    def update(self, values):
+        """
+        Add a chunk of values.
+
+        Parameters
+        ----------
+        values : array_like
+            Values of shape (n, \\*shape).
+
+        """
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, np.nansum(values, axis=0) / n, 0.0)
+            m2 = np.nansum((values - mean) ** 2, axis=0)
+
+            total = self.count + n
+            delta = mean - self._mean
+            weight = np.where(total > 0, n / total, 0.0)
+            self._mean = self._mean + delta * weight
+            self.m2 = self.m2 + m2 + delta**2 * self.count * weight
+
+        self.count = total
+        if len(values):
+            low = np.fmin(self.min, np.nanmin(values, axis=0, initial=np.inf))
+            high = np.fmax(self.max, np.nanmax(values, axis=0, initial=-np.inf))
+            self.min = np.where(np.isinf(low), np.nan, low)
+            self.max = np.where(np.isinf(high), np.nan, high)
+
+        if self.hist is not None:
+            self._update_hist(values, valid)
+
+    def _update_hist(self, values, valid):
+        """
+        Count a chunk of values into the histogram of each element at once.
+
+        """
+        n_bin = len(self.bins) - 1
+        index = np.searchsorted(self.bins, values, side="right") - 1
+        # The last bin includes its right edge, as in np.histogram
+        index[values == self.bins[-1]] = n_bin - 1
+        inside = valid & (index >= 0) & (index < n_bin)
+
+        element = np.broadcast_to(
+            np.arange(self.count.size).reshape(self.count.shape), values.shape
+        )
+        flat = element[inside] * n_bin + index[inside]
+        counts = np.bincount(flat, minlength=self.count.size * n_bin)
+        self.hist += counts.reshape(self.hist.shape)
+
+
+class DistortionTrajectory:
+    """
+    Distortion parameters of the same octahedra over the frames of a trajectory,
+    such as an MD run or a geometry optimization.
+
+    Metal centers and their ligands are found in the first frame and followed
+    through all frames. Frames are collected into chunks of ``chunk_size`` and each
+    chunk is computed at once with :class:`octadist.src.calc.CalcDistortionBatch`.
+    Iterating over the trajectory yields the time series chunk by chunk, while
+    :attr:`stats` keeps running statistics of every parameter, so that the whole
+    trajectory is never held in memory. Frames are consumed as they are read, so
+    a trajectory can be iterated only once; iterating it again raises RuntimeError
+    rather than adding the frames to the statistics twice.
+
+    Parameters
+    ----------
+    frames : iterable
+        Frames as (atom, coord) pairs, such as from :func:`octadist.src.io.iter_coord_xyz`,
+        or as coordinate arrays of shape (N, 3), such as the steps returned by
+        ``get_coord_gaussian(f, all_steps=True)``, in which case atom must be given.
+    atom : list, optional
+        Atomic labels, used if frames are coordinate arrays. Default is None.
+    ref_index : array_like of int, optional
+        Indices of the metal center atoms. If None, use the metals found in the
+        first frame, see :func:`octadist.src.io.find_metal`. Default is None.
+    cutoff_ref_ligand : float, optional
+        Cutoff distance for screening bond distance between reference and ligand atoms.
+        Default is 2.8.
+    metals : str, int, or list of str and int, optional
+        Metals used as center atoms if ref_index is None. Default is None.
+    params : list of str, optional
+        Parameters to compute. Default is zeta, delta, sigma, theta and oct_vol.
+    chunk_size : int, optional
+        Number of frames computed and yielded at a time. Default is 1000.
+    follow_ligands : bool, optional
+        If True, search the six nearest ligands again in every frame, which allows
+        ligand exchange. If False, keep the ligands of the first frame.
+        Default is False.
+    bins : dict, optional
+        Histogram bin edges of each parameter, for example
+        ``{"zeta": np.linspace(0, 1, 101)}``. Default is None.
+
+    Attributes
+    ----------
+    metal_index : ndarray
+        Indices of the metal center atoms, shape (M,).
+    index_octa : ndarray
+        Atom indices of the octahedra in the first frame, shape (M, 7).
+    stats : dict
+        :class:`RunningStats` of each parameter, with one value per metal center.
+    n_frame : int
+        Number of frames processed so far.
+
+    Examples
+    --------
+    >>> frames = iter_coord_xyz("trajectory.xyz")
+    >>> traj = DistortionTrajectory(frames, chunk_size=500)
+    >>> for chunk in traj:
+    ...     print(chunk["frame"][0], chunk["zeta"].mean(axis=0))
+    >>> traj.stats["zeta"].mean, traj.stats["zeta"].std
+    (array([0.22807257]), array([0.01204315]))
+
+    """
+
+    def __init__(
+        self,
+        frames,
+        atom=None,
+        ref_index=None,
+        cutoff_ref_ligand=2.8,
+        metals=None,
+        params=None,
+        chunk_size=1000,
+        follow_ligands=False,
+        bins=None,
+    ):
+        self.frames = frames
+        self.atom = atom
+        self.ref_index = ref_index
+        self.cutoff_ref_ligand = cutoff_ref_ligand
+        self.metals = metals
+        self.params = list(DEFAULT_PARAMS if params is None else params)
+        self.chunk_size = chunk_size
+        self.follow_ligands = follow_ligands
+        self.bins = bins or {}
+
+        self.metal_index = None
+        self.index_octa = None
+        self.stats = {}
+        self.n_frame = 0
+
+    def _setup(self, atom, coord):
+        """
+        Find the metal centers and their octahedra in the first frame.
+
+        """
+        self.atom = atom
+        if self.ref_index is None:
+            _, _, self.metal_index = io.find_metal(atom, coord, self.metals)
+        else:
+            self.metal_index = np.asarray(self.ref_index, dtype=np.intp).reshape(-1)
+
+        self.index_octa, _ = io.extract_all_octa(
+            atom, coord, self.metal_index, self.cutoff_ref_ligand
+        )
+
+        shape = (len(self.metal_index),)
+        self.stats = {p: RunningStats(shape, self.bins.get(p)) for p in self.params}
+
+    def _octahedra(self, coord):
+        """
+        Coordinates of the followed octahedra in one frame, NaN for missing ligands.
+
+        """
+        if self.follow_ligands:
+            _, coord_octa = io.extract_all_octa(
+                self.atom, coord, self.metal_index, self.cutoff_ref_ligand
+            )
+            return coord_octa
+
+        coord_octa = coord[self.index_octa]
+        coord_octa[self.index_octa < 0] = np.nan
+
+        return coord_octa
+
+    def _compute(self, frame, coord_octa):
+        """
+        Compute one chunk of frames and update the running statistics.
+
+        """
+        n = len(frame)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dist = calc.CalcDistortionBatch(coord_octa.reshape(-1, 7, 3))
+            chunk = {"frame": np.array(frame)}
+            for p in self.params:
+                chunk[p] = np.asarray(getattr(dist, p), dtype=np.float64).reshape(n, -1)
+
+        # Octahedra with missing ligands have no parameters
+        missing = np.isnan(coord_octa).any(axis=(2, 3))
+        for p in self.params:
+            chunk[p][missing] = np.nan
+            self.stats[p].update(chunk[p])
+
+        return chunk
+
+    def __iter__(self):
+        """
+        Yield the time series chunk by chunk.
+
+        Yields
+        ------
+        chunk : dict
+            ``"frame"``: frame indices, shape (n,), and for each parameter
+            an array of shape (n, M), where n is at most chunk_size.
+
+        """
+        if self.n_frame:
+            raise RuntimeError("trajectory has already been iterated")
+
+        frame = []
+        buffer = None
+
+        for item in self.frames:
+            if isinstance(item, tuple):
+                atom, coord = item
+            else:
+                atom, coord = self.atom, item
+            coord = np.asarray(coord, dtype=np.float64).reshape(-1, 3)
+
+            if self.metal_index is None:
+                if atom is None:
+                    raise TypeError(
+                        "atom must be given if frames are coordinate arrays"
+                    )
+                self._setup(atom, coord)
+            if buffer is None:
+                buffer = np.empty((self.chunk_size, len(self.metal_index), 7, 3))
+
+            buffer[len(frame)] = self._octahedra(coord)
+            frame.append(self.n_frame)
+            self.n_frame += 1
+
+            if len(frame) == self.chunk_size:
+                yield self._compute(frame, buffer)
+                frame = []
+
+        if frame:
+            yield self._compute(frame, buffer[: len(frame)])
+
+    def run(self):
+        """
+        Process all frames, keeping only the running statistics.
+
+        Returns
+        -------
+        stats : dict
+            :class:`RunningStats` of each parameter.
+
+        """
+        for _ in self:
+            pass
+
+        return self.stats
@@ -14,19 +14,30 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 # ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+import itertools
+
 import numpy as np
-from scipy.spatial import distance
+from scipy.spatial import cKDTree
 
 from octadist.src import plane, projection
 
+# All 20 triangles of ligand atoms (indices 1 to 6 of the octahedron),
+# in lexicographic order, and for each of them the 3 ligands not in it
+_TRIANGLES = np.array(list(itertools.combinations(range(1, 7), 3)))
+_TRIANGLE_OTHERS = np.array(
+    [[i for i in range(1, 7) if i not in triangle] for triangle in _TRIANGLES]
+)
+
 
 def find_bonds(atom, coord, cutoff_global=2.0, cutoff_hydrogen=1.2):
     """
     Find all bond distance and filter the possible bonds.
 
-    - Compute distance of all bonds
-    - Screen bonds out based on global cutoff distance
-    - Screen H bonds out based on local cutoff distance
+    - Find pairs of non-hydrogen atoms within global cutoff distance
+    - Find pairs involving hydrogen atoms within hydrogen cutoff distance
+
+    Neighbor pairs are found with a KD-tree (:class:`scipy.spatial.cKDTree`),
+    which scales with the number of bonds instead of the number of all atom pairs.
 
     Parameters
     ----------
@@ -43,10 +54,11 @@ def find_bonds(atom, coord, cutoff_global=2.0, cutoff_hydrogen=1.2):
 
     Returns
     -------
-    filtered_pair_2 : list
+    filtered_pair : list
         List of pair of atoms of selected bonds in molecule after screening
-    filtered_bond_2 : array_like
-        Array of bond distances of selected bonds in molecule after screening.
+    filtered_bond : array_like
+        Array of coordinates of the two atoms of selected bonds in molecule
+        after screening, shape (M, 2, 3).
 
     Examples
     --------
@@ -76,41 +88,36 @@ def find_bonds(atom, coord, cutoff_global=2.0, cutoff_hydrogen=1.2):
       [2.886404 5.392925 9.848966]]]
 
     """
-    all_pair = []
-    all_bond = []
+    coord = np.asarray(coord, dtype=np.float64).reshape(-1, 3)
 
-    for i in range(len(coord)):
-        for j in range(i + 1, len(coord)):
-            if i == 0:
-                dist = distance.euclidean(coord[i], coord[j])
-            else:
-                dist = distance.euclidean(coord[i], coord[j])
+    is_hydrogen = np.array([a == "H" for a in atom], dtype=bool)
+    heavy = np.flatnonzero(~is_hydrogen)
+    hydrogen = np.flatnonzero(is_hydrogen)
 
-            all_pair.append([atom[i], atom[j]])
-            all_bond.append([coord[i], coord[j], dist])
+    # Bonds with hydrogen must pass both cutoffs
+    cutoff_hydrogen = min(cutoff_hydrogen, cutoff_global)
 
-    filtered_pair_1 = []
-    filtered_bond_1 = []
+    tree_heavy = cKDTree(coord[heavy])
+    pairs = [heavy[tree_heavy.query_pairs(cutoff_global, output_type="ndarray")]]
 
-    for i in range(len(all_bond)):
-        if all_bond[i][2] <= cutoff_global:
-            filtered_pair_1.append([all_pair[i][0], all_pair[i][1]])
+    if len(hydrogen) > 0:
+        tree_hydrogen = cKDTree(coord[hydrogen])
+        pairs.append(
+            hydrogen[tree_hydrogen.query_pairs(cutoff_hydrogen, output_type="ndarray")]
+        )
+        dist = tree_hydrogen.sparse_distance_matrix(
+            tree_heavy, cutoff_hydrogen, output_type="ndarray"
+        )
+        pairs.append(np.column_stack((hydrogen[dist["i"]], heavy[dist["j"]])))
 
-            filtered_bond_1.append([all_bond[i][0], all_bond[i][1], all_bond[i][2]])
+    # Sort pairs in the same order as looping over i < j
+    pairs = np.sort(np.concatenate(pairs).reshape(-1, 2), axis=1)
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
 
-    filtered_pair_2 = []
-    filtered_bond_2 = []
+    filtered_pair = [[atom[i], atom[j]] for i, j in pairs]
+    filtered_bond = coord[pairs]
 
-    for i in range(len(filtered_bond_1)):
-        if filtered_pair_1[i][0] == "H" or filtered_pair_1[i][1] == "H":
-            if filtered_bond_1[i][2] <= cutoff_hydrogen:
-                filtered_pair_2.append([filtered_pair_1[i][0], filtered_pair_1[i][1]])
-                filtered_bond_2.append([filtered_bond_1[i][0], filtered_bond_1[i][1]])
-        else:
-            filtered_pair_2.append([filtered_pair_1[i][0], filtered_pair_1[i][1]])
-            filtered_bond_2.append([filtered_bond_1[i][0], filtered_bond_1[i][1]])
-
-    return filtered_pair_2, np.array(filtered_bond_2)
+    return filtered_pair, filtered_bond
 
 
 def find_faces_octa(c_octa):
@@ -151,6 +158,8 @@ def find_faces_octa(c_octa):
 
     See Also
     --------
+    find_faces_octa_batch :
+        Find the faces of a stack of octahedral structures.
     octadist.src.plane.find_eq_of_plane :
         Find the equation of the plane.
     octadist.src.projection.project_atom_onto_plane :
@@ -192,69 +201,83 @@ def find_faces_octa(c_octa):
       [13.04897 19.25464  7.93122]]]
 
     """
-    ########################
-    # Find reference faces #
-    ########################
-
-    c_octa = np.asarray(c_octa, dtype=np.float64)
-
-    # Find the shortest distance from metal center to each triangle
-    dist = []
-    a_ref_f = []
-    c_ref_f = []
-
-    for i in range(1, 5):
-        for j in range(i + 1, 6):
-            for k in range(j + 1, 7):
-                a, b, c, d = plane.find_eq_of_plane(c_octa[i], c_octa[j], c_octa[k])
-                m = projection.project_atom_onto_plane(c_octa[0], a, b, c, d)
-                d_btw = distance.euclidean(m, c_octa[0])
-                dist.append(d_btw)
-
-                a_ref_f.append([i, j, k])
-                c_ref_f.append([c_octa[i], c_octa[j], c_octa[k]])
-
-    # Sort faces by distance in ascending order
-    dist_a_c = sorted(zip(dist, a_ref_f, c_ref_f))
-    dist, a_ref_f, c_ref_f = list(zip(*dist_a_c))
-    c_ref_f = np.asarray(c_ref_f, dtype=np.float64)
-
-    # Remove first 12 triangles, the rest of triangles is 8 faces of octahedron
-    a_ref_f = a_ref_f[12:]
-    c_ref_f = c_ref_f[12:]
-
-    #######################
-    # Find opposite faces #
-    #######################
-
-    all_atom = [1, 2, 3, 4, 5, 6]
-    a_oppo_f = []
-
-    for i in range(len(a_ref_f)):
-        new_a_ref_f = []
-        for j in all_atom:
-            if j not in (a_ref_f[i][0], a_ref_f[i][1], a_ref_f[i][2]):
-                new_a_ref_f.append(j)
-        a_oppo_f.append(new_a_ref_f)
-
-    c_oppo_f = []
-
-    for i in range(len(a_oppo_f)):
-        coord_oppo = []
-        for j in range(3):
-            coord_oppo.append(
-                [
-                    c_octa[int(a_oppo_f[i][j])][0],
-                    c_octa[int(a_oppo_f[i][j])][1],
-                    c_octa[int(a_oppo_f[i][j])],
-                ][2]
-            )
-        c_oppo_f.append(coord_oppo)
-
-    a_ref_f = list(a_ref_f)
-    c_ref_f = list(c_ref_f)
-
-    c_ref_f = np.asarray(c_ref_f, dtype=np.float64)
-    c_oppo_f = np.asarray(c_oppo_f, dtype=np.float64)
+    index_ref, coord_ref, index_oppo, coord_oppo = find_faces_octa_batch(c_octa)
+
+    a_ref_f = index_ref[0].tolist()
+    c_ref_f = coord_ref[0]
+    a_oppo_f = index_oppo[0].tolist()
+    c_oppo_f = coord_oppo[0]
 
     return a_ref_f, c_ref_f, a_oppo_f, c_oppo_f
+
+
+def find_faces_octa_batch(coord):
+    """
+    Find the eight faces and their opposite faces of a stack of octahedral structures.
+
+    This is the array version of :func:`find_faces_octa`: the distance from the metal
+    center to the plane of each of the 20 ligand triangles is computed for all
+    octahedra at once, and the 8 triangles farthest from the metal center are the faces.
+    Faces are ordered as in :func:`find_faces_octa`.
+
+    Parameters
+    ----------
+    coord : array_like
+        Atomic coordinates of octahedral structure, shape (7, 3),
+        or a stack of octahedral structures, shape (N, 7, 3).
+
+    Returns
+    -------
+    index_ref : ndarray
+        Atom indices (1 to 6) of reference faces, shape (N, 8, 3).
+    coord_ref : ndarray
+        Atomic coordinates of reference faces, shape (N, 8, 3, 3).
+    index_oppo : ndarray
+        Atom indices (1 to 6) of opposite faces, shape (N, 8, 3).
+    coord_oppo : ndarray
+        Atomic coordinates of opposite faces, shape (N, 8, 3, 3).
+
+    See Also
+    --------
+    find_faces_octa :
+        Find the eight faces of one octahedral structure.
+
+    Examples
+    --------
+    >>> coords.shape
+    (100, 7, 3)
+    >>> index_ref, coord_ref, index_oppo, coord_oppo = find_faces_octa_batch(coords)
+    >>> index_ref.shape, coord_ref.shape
+    ((100, 8, 3), (100, 8, 3, 3))
+
+    """
+    coord = np.asarray(coord, dtype=np.float64)
+    if coord.ndim == 2:
+        coord = coord[np.newaxis]
+
+    if coord.ndim != 3 or coord.shape[1:] != (7, 3):
+        raise ValueError(
+            "coordinates of octahedral structures must have shape (N, 7, 3)"
+        )
+
+    # Shortest distance from metal center to the plane of each triangle, shape (N, 20)
+    vertex = coord[:, _TRIANGLES]
+    a, b, c, d = plane.find_eq_of_plane(
+        vertex[:, :, 0], vertex[:, :, 1], vertex[:, :, 2]
+    )
+    metal = coord[:, np.newaxis, 0]
+    projected = projection.project_atom_onto_plane(metal, a, b, c, d)
+    dist = np.linalg.norm(projected - metal, axis=2)
+
+    # Sort triangles by distance in ascending order, ties in lexicographic order,
+    # and remove first 12 triangles, the rest of triangles is 8 faces of octahedron
+    faces = np.argsort(dist, axis=1, kind="stable")[:, 12:]
+
+    index_ref = _TRIANGLES[faces]
+    index_oppo = _TRIANGLE_OTHERS[faces]
+
+    octa = np.arange(len(coord))[:, np.newaxis, np.newaxis]
+    coord_ref = coord[octa, index_ref]
+    coord_oppo = coord[octa, index_oppo]
+
+    return index_ref, coord_ref, index_oppo, coord_oppo
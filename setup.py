@@ -45,7 +45,8 @@ setuptools.setup(
         "Tracker": "https://github.com/OctaDist/OctaDist/issues",
     },
     packages=setuptools.find_packages(),
-    install_requires=["numpy", "scipy", "matplotlib", "rmsd", "pymatgen", "plotly"],
+    install_requires=["numpy", "scipy", "matplotlib", "rmsd", "plotly"],
+    extras_require={"export": ["pyarrow", "h5py"]},
     classifiers=[
         "Environment :: Console",
         "Programming Language :: Python",
@@ -1,3 +1,9 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
 import octadist as oc
 
 # Prepare list of atomic coordinates of octahedral structure:
@@ -33,3 +39,496 @@ def test_results():
 	assert sigma - sigma_ref < cutoff
 	assert theta - theta_ref < cutoff
 
+
+def test_batch_results():
+	# Stack the reference octahedron with randomly distorted copies of it
+	rng = np.random.default_rng(0)
+	coords = np.asarray(coord) + rng.normal(scale=0.2, size=(50, 7, 3))
+	coords[0] = coord
+
+	batch = oc.CalcDistortionBatch(coords)
+	for i in range(len(coords)):
+		ref = oc.CalcDistortion(coords[i].copy())
+		for key in ["d_mean", "zeta", "delta", "sigma", "theta", "theta_min", "theta_max", "oct_vol", "non_octa"]:
+			assert np.allclose(getattr(batch, key)[i], getattr(ref, key), rtol=0, atol=cutoff)
+
+
+def test_eight_theta():
+	# Values of the face-by-face loop this kernel replaced, compared bit for bit
+	eight_theta_ref = [
+		36.6258731726121, 28.85054807796849, 21.79843492531478, 28.57216604448481,
+		41.29268106475331, 42.44409486638638, 22.37891089058867, 23.415236506983582,
+	]
+	dist = oc.CalcDistortion(coord)
+	assert dist.eight_theta == eight_theta_ref
+	assert dist.theta_min == 96.16474836737186
+	assert dist.theta_max == 149.21319718172026
+
+	batch = oc.CalcDistortionBatch(np.stack([coord, coord]))
+	assert batch.eight_theta.tolist() == [eight_theta_ref] * 2
+
+
+def test_lazy_params():
+	dist = oc.CalcDistortion(coord)
+	assert abs(dist.zeta - zeta_ref) < cutoff
+	assert "theta" not in vars(dist)
+	assert "oct_vol" not in vars(dist)
+	assert abs(dist.theta - theta_ref) < cutoff
+
+
+def test_find_bonds():
+	rng = np.random.default_rng(0)
+	xyz = rng.uniform(0, 8, size=(200, 3))
+	labels = list(rng.choice(["H", "C", "N", "Fe"], 200))
+	pair, bond = oc.find_bonds(labels, xyz)
+
+	# Brute force over all pairs i < j
+	ref = []
+	for i in range(200):
+		for j in range(i + 1, 200):
+			d = np.linalg.norm(xyz[i] - xyz[j])
+			if d <= 2.0 and ("H" not in (labels[i], labels[j]) or d <= 1.2):
+				ref.append([xyz[i], xyz[j]])
+	assert len(pair) == len(ref)
+	assert np.array_equal(bond, np.array(ref))
+
+
+def test_iter_coord_xyz(tmp_path):
+	traj = tmp_path / "traj.xyz"
+	with open(traj, "w") as f:
+		for k in range(10):
+			f.write(f"{len(atom)}\nframe {k}\n")
+			for a, xyz in zip(atom, np.asarray(coord) + k):
+				f.write(f"{a} {xyz[0]} {xyz[1]} {xyz[2]}\n")
+
+	frames = list(oc.iter_coord_xyz(str(traj), start=1, stop=8, step=3))
+	assert len(frames) == 3
+	assert frames[0][0] == atom
+	assert np.allclose(frames[2][1], np.asarray(coord) + 7)
+
+	# A blank row inside an atom block is skipped, as get_coord_xyz does
+	blank = tmp_path / "blank.xyz"
+	blank.write_text("3\ncomment\nFe 0 0 0\n\nO 0 0 2\nO 0 0 -2\n3\n\nFe 1 0 0\nO 1 0 2\nO 1 0 -2\n")
+	frames = list(oc.iter_coord_xyz(str(blank)))
+	assert [a for a, _ in frames] == [['Fe', 'O', 'O']] * 2
+	assert np.allclose(frames[1][1][:, 0], 1.0)
+
+	truncated = tmp_path / "truncated.xyz"
+	truncated.write_text("3\ncomment\nFe 0 0 0\n\nO 0 0 2\n")
+	with pytest.raises(ValueError, match="frame 0"):
+		list(oc.iter_coord_xyz(str(truncated)))
+
+
+def test_detect_format(tmp_path):
+	out = tmp_path / "orca.out"
+	rows = [f"  {a} {x} {y} {z}\n" for a, (x, y, z) in zip(atom, coord)]
+	with open(out, "w") as f:
+		f.write("* O   R   C   A *\n---\nCARTESIAN COORDINATES (ANGSTROEM)\n---\n")
+		f.writelines(rows)
+		f.write("\n---\nCARTESIAN COORDINATES (A.U.)\n")
+
+	assert oc.detect_format(str(out)) == "orca"
+	atom_out, coord_out = oc.extract_coord(str(out))
+	assert atom_out == atom
+	assert np.allclose(coord_out, coord)
+
+	# Lines that only look like NWChem headers do not break detection
+	other = tmp_path / "other.out"
+	other.write_text(" No. of atoms\n No. of atoms : many\n")
+	assert oc.detect_format(str(other)) is None
+
+	# A banner counts only if its geometry marker is also present
+	other.write_text("* O   R   C   A *\n Standard orientation:\n")
+	assert oc.detect_format(str(other)) == "gaussian"
+	other.write_text("* O   R   C   A *\n")
+	assert oc.detect_format(str(other)) is None
+
+
+def test_gaussian_all_steps(tmp_path):
+	out = tmp_path / "gaussian.log"
+	number = {"Fe": 26, "N": 7, "O": 8}
+	with open(out, "w") as f:
+		f.write(" Entering Gaussian System\n")
+		for k in range(3):
+			f.write(" Standard orientation:\n ---\n Center\n Number\n ---\n")
+			for i, (a, (x, y, z)) in enumerate(zip(atom, np.asarray(coord) + k)):
+				f.write(f" {i + 1} {number[a]} 0 {x} {y} {z}\n")
+			f.write(" ---\n")
+
+	atom_last, coord_last = oc.get_coord_gaussian(str(out))
+	assert atom_last == atom
+	assert np.allclose(coord_last, np.asarray(coord) + 2)
+
+	_, steps = oc.get_coord_gaussian(str(out), all_steps=True)
+	assert steps.shape == (3, 7, 3)
+	assert np.allclose(steps[1], np.asarray(coord) + 1)
+
+
+# Budget for "import octadist" measured by python -X importtime, in microseconds
+IMPORT_BUDGET_US = 100000
+
+# Budget for all imports of "import octadist; octadist.CalcDistortion", in microseconds
+ACCESS_BUDGET_US = 1000000
+
+
+# Run code in a fresh interpreter, return cumulative import times and loaded modules
+def import_times(code):
+	cmd = [sys.executable, "-X", "importtime", "-c", code + "; import sys; print(*sys.modules)"]
+	result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+	cumulative = {}
+	for line in result.stderr.splitlines():
+		if line.startswith("import time:") and "cumulative" not in line:
+			_, total, name = line[len("import time:"):].split("|")
+			# Top-level imports only, nested ones are included in their parent
+			if not name.startswith("  "):
+				cumulative[name.strip()] = int(total)
+
+	return cumulative, set(result.stdout.split())
+
+
+def test_import_budget():
+	# A bare import loads neither the calculation modules nor numpy
+	cumulative, modules = import_times("import octadist")
+	assert not {"octadist.src.calc", "numpy", "scipy"} & modules
+	assert cumulative["octadist"] < IMPORT_BUDGET_US
+
+	# Everything loaded for the first calculation counts against its own budget
+	cumulative, modules = import_times("import octadist; octadist.CalcDistortion")
+	assert "octadist.src.calc" in modules
+	assert sum(cumulative.values()) < ACCESS_BUDGET_US
+
+	# GUI and plotting packages must not load for headless use
+	assert not {"tkinter", "matplotlib", "plotly", "rmsd"} & modules
+
+
+def test_stacked_primitives():
+	rng = np.random.default_rng(0)
+	v1, v2, v3 = rng.normal(size=(3, 20, 3))
+
+	angle = oc.angle_btw_vectors(v1, v2)
+	sign = oc.angle_sign(v1, v2, v3)
+	area = oc.triangle_area(v1, v2, v3)
+	a, b, c, d = oc.find_eq_of_plane(v1, v2, v3)
+	proj = oc.project_atom_onto_plane(v3, a, b, c, d)
+	for i in range(20):
+		assert angle[i] == oc.angle_btw_vectors(v1[i], v2[i])
+		assert sign[i] == oc.angle_sign(v1[i], v2[i], v3[i])
+		assert np.isclose(area[i], oc.triangle_area(v1[i], v2[i], v3[i]))
+		assert [a[i], b[i], c[i], d[i]] == list(oc.find_eq_of_plane(v1[i], v2[i], v3[i]))
+		assert np.array_equal(proj[i], oc.project_atom_onto_plane(v3[i], a[i], b[i], c[i], d[i]))
+
+
+# Reference faces of coord, from find_faces_octa of the baseline per-octahedron loop
+FACES_REF = [[1, 2, 4], [1, 2, 3], [2, 4, 6], [1, 3, 5], [3, 5, 6], [4, 5, 6], [2, 3, 6], [1, 4, 5]]
+FACES_OPPO = [[3, 5, 6], [4, 5, 6], [1, 3, 5], [2, 4, 6], [1, 2, 4], [1, 2, 3], [1, 4, 5], [2, 3, 6]]
+
+
+# Copy of the baseline loop: the 8 of the 20 ligand triangles farthest from the metal,
+# sorted by the distance of the metal to the plane of the triangle
+def faces_reference(c_octa):
+	faces = []
+	for i in range(1, 5):
+		for j in range(i + 1, 6):
+			for k in range(j + 1, 7):
+				normal = np.cross(c_octa[k] - c_octa[i], c_octa[j] - c_octa[i])
+				dist = abs(np.dot(normal, c_octa[0] - c_octa[i])) / np.linalg.norm(normal)
+				faces.append((dist, [i, j, k]))
+	return [f for _, f in sorted(faces)[12:]]
+
+
+def test_find_faces_octa_batch():
+	a_ref, c_ref, a_oppo, c_oppo = oc.find_faces_octa(coord)
+	assert a_ref == FACES_REF
+	assert a_oppo == FACES_OPPO
+	assert np.array_equal(c_oppo, np.asarray(coord)[FACES_OPPO])
+
+	rng = np.random.default_rng(0)
+	coords = np.asarray(coord) + rng.normal(scale=0.2, size=(20, 7, 3))
+
+	index_ref, coord_ref, index_oppo, coord_oppo = oc.find_faces_octa_batch(coords)
+	assert index_ref.shape == (20, 8, 3)
+	assert coord_oppo.shape == (20, 8, 3, 3)
+	for i in range(20):
+		assert index_ref[i].tolist() == faces_reference(coords[i])
+		assert np.array_equal(coord_ref[i], coords[i][index_ref[i]])
+		# each face and its opposite face use all six ligands
+		for face, oppo in zip(index_ref[i].tolist(), index_oppo[i].tolist()):
+			assert sorted(face + oppo) == [1, 2, 3, 4, 5, 6]
+
+
+def test_fit_plane():
+	rng = np.random.default_rng(0)
+	# Points on the vertical plane x = 2 with a little noise
+	points = np.column_stack([2 + 1e-3 * rng.normal(size=10), rng.uniform(-3, 3, (10, 2))])
+	xx, yy, z, (a, b, c, d) = oc.find_fit_plane(points)
+	assert np.allclose([a, b, c, d], [1, 0, 0, -2], atol=1e-2)
+	assert np.allclose(a * xx + b * yy + c * z + d, 0)
+
+	stack = rng.normal(size=(5, 6, 3))
+	normal, centroid = oc.fit_plane(stack)
+	assert normal.shape == centroid.shape == (5, 3)
+	assert np.allclose(normal[3], oc.fit_plane(stack[3])[0])
+
+
+def test_result_cache(tmp_path):
+	from octadist.src.cache import ResultCache, cache_key, calc_octa_cached, calc_params_cached, octa_key
+
+	with ResultCache(str(tmp_path / "cache.sqlite")) as cache:
+		atom_octa, coord_octa, params = calc_octa_cached(atom, coord, cache=cache)
+		assert len(cache) == 1
+		assert abs(params["zeta"] - zeta_ref) < cutoff
+
+		# Second run is served from the cache and returns the same result
+		atom_hit, coord_hit, params_hit = calc_octa_cached(atom, coord, cache=cache)
+		assert atom_hit == atom_octa
+		assert np.array_equal(coord_hit, coord_octa)
+		assert params_hit == params
+
+		# Any change of input gives another key
+		assert cache_key(atom, coord) != cache_key(atom, coord, cutoff_ref_ligand=2.9)
+
+		# Least recently used entries are evicted once the cache is full
+		cache.max_size = cache.size
+		cache.get(cache_key(atom, coord))
+		calc_octa_cached(atom, coord, cutoff_ref_ligand=2.9, cache=cache)
+		assert len(cache) == 1
+		assert cache_key(atom, coord) not in cache
+
+		# Extracted octahedra are keyed by their coordinates and not searched again
+		cache.max_size = 2**20
+		params_octa = calc_params_cached(coord_octa, cache)
+		assert octa_key(coord_octa) in cache
+		assert calc_params_cached(coord_octa, cache) == params_octa == calc_params_cached(coord_octa)
+		assert abs(params_octa["zeta"] - zeta_ref) < cutoff
+
+
+def test_result_writer(tmp_path):
+	params = {k: getattr(dist, k) for k in oc.export.DEFAULT_PARAMS}
+	params["non_octa"] = dist.non_octa
+	batch = oc.CalcDistortionBatch(np.stack([coord] * 3))
+	batch_params = {k: getattr(batch, k) for k in oc.export.DEFAULT_PARAMS}
+
+	for ext in [".npz", ".csv", ".jsonl"]:
+		path = str(tmp_path / ("results" + ext))
+		with oc.ResultWriter(path, chunk_size=2) as writer:
+			for i in range(3):
+				writer.write(f"{i}.xyz", 0, "Fe", params, coord)
+			writer.write_batch(["batch.xyz"] * 3, 0, "Fe", batch_params, np.stack([coord] * 3))
+
+		if ext == ".npz":
+			data = np.load(path)
+			assert data["file"].tolist() == ["0.xyz", "1.xyz", "2.xyz"] + ["batch.xyz"] * 3
+			assert data["coord"].shape == (6, 7, 3)
+			assert np.array_equal(data["coord"][5], coord)
+			assert np.array_equal(data["zeta"], [dist.zeta] * 6)
+		else:
+			with open(path) as f:
+				assert len(f.readlines()) == 6 + (ext == ".csv")
+
+
+def test_structure_container():
+	mol = oc.Structure(atom + ['C', 'Fe1'], coord + [[9.0, 9.0, 9.0], [20.0, 20.0, 20.0]], name="complex")
+	assert mol.numbers.dtype == np.int8
+	assert mol.numbers.tolist() == [26, 8, 8, 7, 7, 7, 7, 6, 26]
+	assert mol.coord.shape == (9, 3) and mol.coord.flags.c_contiguous
+
+	atom_full, coord_full = mol
+	assert atom_full == atom + ['C', 'Fe1']
+	assert np.array_equal(mol[1], coord_full)
+
+	# Only the first Fe has a complete octahedron
+	octa, = mol.octahedra()
+	assert octa.structure is mol
+	assert octa.metal == 'Fe' and octa.metal_index == 0
+	atom_octa, coord_octa = octa
+	ref_atom, ref_coord = oc.extract_octa(atom, coord)
+	assert atom_octa == ref_atom
+	assert np.array_equal(coord_octa, ref_coord)
+
+	# Labels that are not element symbols are kept, and name no element
+	mol = oc.Structure(['Fe', 'X', 'Bq', 'O', 'O', 'N', 'N'], coord)
+	assert mol.numbers.tolist() == [26, 0, 0, 8, 8, 7, 7]
+	assert mol.atom == ['Fe', 'X', 'Bq', 'O', 'O', 'N', 'N']
+	assert mol.octahedra()[0].atom[0] == 'Fe'
+	assert sorted(mol.octahedra()[0].atom) == sorted(mol.atom)
+
+	# Plain symbols are not stored twice
+	assert oc.Structure(atom, coord).labels is None
+
+
+def test_element_tables():
+	assert oc.number_to_symbol('Fe') == 26
+	assert oc.number_to_symbol(np.int8(26)) == 'Fe'
+	assert oc.number_to_symbol('Xx') is None
+
+	numbers = oc.elements.symbols_to_numbers(['Fe', 'N', 'N', 'O', 'Xx'])
+	assert numbers.tolist() == [26, 7, 7, 8, 0]
+	assert oc.elements.numbers_to_symbols(numbers[:4]).tolist() == ['Fe', 'N', 'N', 'O']
+	assert np.array_equal(oc.elements.numbers_to_radii(numbers), [oc.number_to_radii(int(n)) for n in numbers])
+	assert oc.elements.numbers_to_colors([2]).tolist() == [oc.number_to_color(2)]
+
+
+def test_find_metal():
+	atom_full = ['Fe', 'N', 'Ru', 'C', 'Cu', 'Xx']
+	coord_full = np.arange(18.0).reshape(6, 3)
+
+	atom_metal, coord_metal, index_metal = oc.find_metal(atom_full, coord_full)
+	assert atom_metal == ['Fe', 'Ru', 'Cu']
+	assert index_metal.tolist() == [0, 2, 4]
+	assert np.array_equal(coord_metal, coord_full[[0, 2, 4]])
+
+	assert oc.find_metal(atom_full, coord_full, metals="3d")[2].tolist() == [0, 4]
+	assert oc.find_metal(atom_full, coord_full, metals=["Ru", 29])[2].tolist() == [2, 4]
+	assert oc.find_metal(oc.elements.symbols_to_numbers(atom_full), coord_full, "Fe")[2].tolist() == [0]
+
+
+def test_extract_all_octa_periodic():
+	# Corner-sharing FeO6 in a cubic cell: every Fe ligand is across a cell face
+	lattice = np.eye(3) * 4.0
+	frac = [[0, 0, 0], [0.5, 0, 0], [0, 0.5, 0], [0, 0, 0.5]]
+	atom_cell = ['Fe', 'O', 'O', 'O']
+	coord_cell = np.array(frac) @ lattice
+
+	assert np.all(oc.extract_all_octa(atom_cell, coord_cell, [0])[0][0, 4:] == -1)
+
+	index_octa, coord_octa = oc.extract_all_octa(atom_cell, coord_cell, [0], 2.1, lattice=lattice)
+	assert sorted(index_octa[0].tolist()) == [0, 1, 1, 2, 2, 3, 3]
+	assert np.array_equal(coord_octa[0, 0], coord_cell[0])
+	assert np.allclose(np.linalg.norm(coord_octa[0, 1:] - coord_cell[0], axis=1), 2.0)
+
+	# Distances in a skewed cell agree with a brute-force supercell search
+	rng = np.random.default_rng(0)
+	lattice = np.array([[5.0, 0, 0], [1.5, 4.5, 0], [-1.0, 0.8, 4.2]])
+	coord_cell = rng.uniform(-0.5, 1.5, size=(40, 3)) @ lattice
+	index_octa, coord_octa = oc.extract_all_octa(['C'] * 40, coord_cell, np.arange(40), 2.5, lattice=lattice)
+
+	shifts = np.array(list(np.ndindex(5, 5, 5))) - 2
+	supercell = (coord_cell[None] + (shifts @ lattice)[:, None]).reshape(-1, 3)
+	for i in range(40):
+		dist = np.sort(np.linalg.norm(supercell - coord_cell[i], axis=1))
+		dist = dist[dist <= 2.5][:7]
+		found = np.linalg.norm(coord_octa[i] - coord_cell[i], axis=1)[: len(dist)]
+		assert np.allclose(found, dist)
+		assert np.all(index_octa[i, len(dist):] == -1)
+
+	mol = oc.Structure(['Fe', 'O', 'O', 'O'], np.array(frac) * 4.0, lattice=np.eye(3) * 4.0)
+	octa, = mol.octahedra(cutoff_ref_ligand=2.1)
+	assert octa.image.dtype == np.int8
+	assert np.allclose(np.linalg.norm(octa.coord[1:] - octa.coord[0], axis=1), 2.0)
+
+
+CIF = """\
+data_test
+_audit_creation_method 'hand written; for tests'
+_publ_section_comment
+;
+A text field with loop_ and _cell_length_a inside.
+;
+_cell_length_a 10.0(2)
+_cell_length_b 10.0
+_cell_length_c 12.0
+_cell_angle_alpha 90
+_cell_angle_beta 90
+_cell_angle_gamma 120.00(3)
+loop_
+_space_group_symop_operation_xyz
+'x, y, z'
+'-x, -y, -z'
+'-y, x-y, z+1/2'
+loop_
+_atom_site_label
+_atom_site_type_symbol
+_atom_site_fract_x
+_atom_site_fract_y
+_atom_site_fract_z
+Fe1 Fe2+ 0.0 0.0 0.0
+O1 O2- 0.2000(1) 0.1 0.25  # comment
+data_second
+_cell_length_a 1.0
+"""
+
+
+def test_get_coord_cif(tmp_path):
+	path = str(tmp_path / "test.cif")
+	with open(path, "w") as f:
+		f.write(CIF)
+
+	assert oc.is_cif(path)
+	atom_cif, coord_cif, lattice = oc.get_coord_cif(path, return_lattice=True)
+
+	# pymatgen Lattice.from_parameters(10, 10, 12, 90, 90, 120).matrix
+	assert np.allclose(lattice, [[10.0, 0.0, 0.0], [-5.0, 8.660254037844387, 0.0], [0.0, 0.0, 12.0]])
+
+	# Fe on the inversion center is not duplicated, Fe and O images are wrapped
+	assert atom_cif == ['Fe', 'Fe', 'O', 'O', 'O']
+	frac = coord_cif @ np.linalg.inv(lattice)
+	assert np.allclose(frac[:2], [[0, 0, 0], [0, 0, 0.5]])
+	assert np.allclose(frac[2:], [[0.2, 0.1, 0.25], [0.8, 0.9, 0.75], [0.9, 0.1, 0.75]])
+
+
+def test_distortion_trajectory():
+	rng = np.random.default_rng(0)
+	frames = [(atom, np.array(coord) + rng.normal(0, 0.02, (7, 3))) for _ in range(23)]
+	bins = {"zeta": np.linspace(0, 1, 11)}
+
+	traj = oc.DistortionTrajectory(iter(frames), chunk_size=5, bins=bins)
+	chunks = list(traj)
+	assert [len(c["frame"]) for c in chunks] == [5, 5, 5, 5, 3]
+	assert traj.metal_index.tolist() == [0]
+
+	zeta_series = np.concatenate([c["zeta"] for c in chunks])
+	assert zeta_series.shape == (23, 1)
+	batch = oc.CalcDistortionBatch(np.stack([c for _, c in frames]))
+	assert np.allclose(zeta_series[:, 0], batch.zeta)
+
+	stats = traj.stats["zeta"]
+	assert stats.count.tolist() == [23]
+	assert np.allclose(stats.mean, zeta_series.mean(axis=0))
+	assert np.allclose(stats.var, zeta_series.var(axis=0))
+	assert np.allclose(stats.min, zeta_series.min(axis=0))
+	assert np.allclose(stats.max, zeta_series.max(axis=0))
+	assert np.array_equal(stats.hist[0], np.histogram(zeta_series, bins["zeta"])[0])
+
+	# A center without six ligands gives NaN and is left out of the statistics
+	stats = oc.DistortionTrajectory([c for _, c in frames], atom=atom, ref_index=[0, 1]).run()
+	assert stats["theta"].count.tolist() == [23, 0]
+	assert np.isnan(stats["theta"].mean[1])
+
+	# Frames are consumed once, statistics are not counted twice
+	with pytest.raises(RuntimeError):
+		list(traj)
+
+
+def test_running_stats_scalar():
+	values = np.array([1.0, np.nan, 2.0, 4.0, 3.0])
+	stats = oc.RunningStats(bins=[0, 2, 5])
+	stats.update(values[:2])
+	stats.update(values[2:])
+	assert stats.count == 4
+	assert np.isclose(stats.mean, 2.5) and np.isclose(stats.var, 1.25)
+	assert stats.min == 1.0 and stats.max == 4.0
+	assert stats.hist.tolist() == [1, 3]
+	assert np.isnan(oc.RunningStats().mean)
+
+
+def test_table_model():
+	model = oc.table.TableModel(["no", "metal", "zeta"], page_size=2)
+	for i, (metal, zeta) in enumerate([("Fe", 0.23), ("Co", None), ("Fe", 0.55), ("Ni", 0.11)]):
+		model.append(no=i + 1, metal=metal, zeta=zeta)
+	assert len(model) == 4 and model.n_page == 2
+	assert model.page_rows(1).tolist() == [2, 3]
+
+	# Empty values are last in both orders
+	model.sort("zeta")
+	assert model.order().tolist() == [3, 0, 2, 1]
+	model.sort("zeta")
+	assert model.descending and model.order().tolist() == [2, 0, 3, 1]
+
+	model.update(1, zeta=0.9)
+	assert model.page_rows(0).tolist() == [1, 2]
+
+	model.sort("metal", descending=False)
+	assert model.order().tolist() == [1, 0, 2, 3]
+	model.clear()
+	assert len(model) == 0 and model.n_page == 1